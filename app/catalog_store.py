@@ -0,0 +1,287 @@
+"""
+Catalog store
+The movie catalog is a base snapshot (the JSON array in MOVIES_FILE) plus an
+append-only change log of upserts and deletes keyed by imdbID. Small changes
+append a line instead of rewriting the whole file; once the log grows past a
+share of the base it is compacted into a fresh compact snapshot.
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+from .config import MOVIES_FILE
+from .json_codec import dumps, loads
+from .posters import normalize_poster
+
+# Serializes writers across processes (e.g. an import script and the web app).
+# Windows has no fcntl; appends are still single writes there.
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+DELTA_SUFFIX = ".delta.jsonl"
+# Compact once the log is bigger than this share of the base (and at least COMPACT_MIN_BYTES)
+COMPACT_BASE_FRACTION = 0.25
+COMPACT_MIN_BYTES = 1 << 20
+
+def _stat_key(path: str) -> str:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return ""
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+def catalog_version(path: str = MOVIES_FILE) -> str:
+    """Changes whenever the catalog does: base snapshot identity plus change-log length"""
+    base = _stat_key(path)
+    return f"{base}+{_file_size(path + DELTA_SUFFIX)}" if base else ""
+
+class CatalogStore:
+    """Reads the catalog as base + change log and writes changes as log entries"""
+
+    def __init__(self, path: str = MOVIES_FILE):
+        self.path = str(path)
+        self.delta_path = self.path + DELTA_SUFFIX
+        self.lock_path = self.path + ".lock"
+        self._lock = threading.RLock()
+        self._base_key = None
+        # Merged catalog with None where a movie was deleted, and where each id sits in it
+        self._movies: List[Optional[Dict]] = []
+        self._positions: Dict[str, List[int]] = {}
+        self._delta_offset = 0
+        self._snapshot: Optional[List[Dict]] = None
+
+    # -- reading ------------------------------------------------------------------
+
+    def load(self) -> List[Dict]:
+        """The current catalog. Cached and shared between callers, so treat it as read-only.
+
+        Only log entries appended since the last call are parsed; the base is
+        re-read only when it is replaced (by a compaction or a full save).
+        """
+        with self._lock:
+            self._catch_up()
+            if self._snapshot is None:
+                self._snapshot = [movie for movie in self._movies if movie is not None]
+            return self._snapshot
+
+    def get(self, imdb_id: str) -> Optional[Dict]:
+        """One movie by imdbID (the first, if the base holds duplicates), without a catalog scan"""
+        with self._lock:
+            self._catch_up()
+            positions = self._positions.get(imdb_id)
+            return self._movies[positions[0]] if positions else None
+
+    def _catch_up(self):
+        for _ in range(3):
+            if _stat_key(self.path) != self._base_key:
+                self._load_base()
+            self._apply_log()
+            # A compaction between reading the base and the log would pair the
+            # old base with an emptied log; go round again if the base moved
+            if _stat_key(self.path) == self._base_key:
+                break
+
+    @property
+    def loaded_delta_bytes(self) -> int:
+        """How much of the change log the last ``load()`` applied"""
+        return self._delta_offset
+
+    def _load_base(self):
+        with open(self.path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            movies = loads(f.read())
+        self._adopt(movies)
+        self._base_key = f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    def _apply_log(self):
+        size = _file_size(self.delta_path)
+        if size < self._delta_offset:
+            # The log was cut without the base changing (e.g. deleted by hand): start over
+            self._load_base()
+        if size == self._delta_offset:
+            return
+        with open(self.delta_path, 'rb') as f:
+            f.seek(self._delta_offset)
+            data = f.read(size - self._delta_offset)
+        # A line without its newline is still being written (or was torn by a crash)
+        complete = data.rfind(b'\n') + 1
+        for line in data[:complete].splitlines():
+            if not line.strip():
+                continue
+            try:
+                entry = loads(line)
+            except ValueError:
+                print(f"⚠️ Skipping unreadable catalog change: {line[:80]!r}")
+                continue
+            self._apply(entry)
+        self._delta_offset += complete
+        self._snapshot = None
+
+    def _apply(self, entry: Dict):
+        if entry.get("op") == "upsert":
+            movie = entry["movie"]
+            if "PosterSource" not in movie:
+                normalize_poster(movie)
+            positions = self._positions.get(movie["imdbID"])
+            if positions:
+                for position in positions:
+                    self._movies[position] = movie
+            else:
+                self._positions[movie["imdbID"]] = [len(self._movies)]
+                self._movies.append(movie)
+        elif entry.get("op") == "delete":
+            for position in self._positions.pop(entry["id"], []):
+                self._movies[position] = None
+
+    # -- writing ------------------------------------------------------------------
+
+    @contextmanager
+    def _write_lock(self):
+        # flock is per open file, so this must never be nested within one process
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_path, 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def append(self, upserts: Iterable[Dict] = (), deletes: Iterable[str] = ()) -> int:
+        """Record added/changed movies and deleted ids, returning how many entries were written.
+
+        Costs the size of the change, not of the catalog. Upserts replace any
+        movie with the same imdbID, so replaying an entry twice is harmless.
+        """
+        lines = []
+        for movie in upserts:
+            if not movie.get("imdbID") or movie["imdbID"] == "N/A":
+                raise ValueError(f"Catalog changes need an imdbID: {movie.get('Title', movie)!r}")
+            # Posters are resolved here, once, rather than by every reader
+            normalize_poster(movie)
+            lines.append(dumps({"op": "upsert", "movie": movie}))
+        for imdb_id in deletes:
+            lines.append(dumps({"op": "delete", "id": imdb_id}))
+        if not lines:
+            return 0
+
+        data = b"\n".join(lines) + b"\n"
+        with self._write_lock():
+            with open(self.delta_path, 'a+b') as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell():
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        # Never glue our first entry onto a line torn by a crash
+                        data = b'\n' + data
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+        self.maybe_compact()
+        return len(lines)
+
+    def append_log(self, path: str) -> int:
+        """Append a change log staged in another file (one entry per line) in one go"""
+        with self._write_lock():
+            with open(path, 'rb') as staged, open(self.delta_path, 'ab') as f:
+                copied = 0
+                for chunk in iter(lambda: staged.read(1 << 20), b''):
+                    f.write(chunk)
+                    copied += len(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+        self.maybe_compact()
+        return copied
+
+    def maybe_compact(self) -> bool:
+        """Compact when the log has grown past its share of the base"""
+        log_size = _file_size(self.delta_path)
+        if log_size < max(COMPACT_MIN_BYTES, _file_size(self.path) * COMPACT_BASE_FRACTION):
+            return False
+        self.compact()
+        return True
+
+    def compact(self):
+        """Fold the change log into a fresh compact base snapshot"""
+        with self._write_lock():
+            movies = self.load()
+            self._write_base(movies)
+            # A crash before the log is removed only means its entries get applied
+            # again on top of the new base, which changes nothing
+            if os.path.exists(self.delta_path):
+                os.remove(self.delta_path)
+            # Copy: callers may still hold the snapshot, and later changes must not show up in it
+            self._adopt(list(movies))
+
+    def replace(self, movies: List[Dict]):
+        """Make ``movies`` the whole catalog (a full save), discarding the change log"""
+        for movie in movies:
+            if "PosterSource" not in movie:
+                normalize_poster(movie)
+        with self._write_lock():
+            self._write_base(movies)
+            if os.path.exists(self.delta_path):
+                os.remove(self.delta_path)
+            self._adopt(list(movies))
+
+    def install_base(self, new_base: str, consumed_delta_bytes: int):
+        """Swap in a base written elsewhere (e.g. a streamed merge) that already includes the
+        first ``consumed_delta_bytes`` of the log; changes appended after that are kept"""
+        with self._write_lock():
+            remainder = b''
+            if os.path.exists(self.delta_path):
+                with open(self.delta_path, 'rb') as f:
+                    f.seek(consumed_delta_bytes)
+                    remainder = f.read()
+            os.replace(new_base, self.path)
+            if remainder:
+                tmp_path = self.delta_path + ".tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(remainder)
+                os.replace(tmp_path, self.delta_path)
+            elif os.path.exists(self.delta_path):
+                os.remove(self.delta_path)
+
+    def _adopt(self, movies: List[Dict]):
+        """Cache a base this process just wrote, sparing the next load() a re-parse"""
+        self._base_key = _stat_key(self.path)
+        self._movies = movies
+        self._positions = {}
+        for position, movie in enumerate(movies):
+            # Catalogs written before poster resolution get it on load; it is saved at the next compaction
+            if "PosterSource" not in movie:
+                normalize_poster(movie)
+            imdb_id = movie.get("imdbID")
+            if imdb_id:
+                self._positions.setdefault(imdb_id, []).append(position)
+        self._delta_offset = 0
+        self._snapshot = None
+
+    def _write_base(self, movies: List[Dict]):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(dumps(movies))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+_stores: Dict[str, CatalogStore] = {}
+
+def get_catalog_store(path: str = MOVIES_FILE) -> CatalogStore:
+    """Process-wide store for a catalog file, so its cache is shared"""
+    path = str(path)
+    if path not in _stores:
+        _stores[path] = CatalogStore(path)
+    return _stores[path]
@@ -0,0 +1,207 @@
+"""
+Item-item collaborative filtering
+Builds "people who saved this also saved" neighbors from the watch-later lists
+and serves them from a compact neighbor table stored next to the catalog.
+"""
+
+import heapq
+import math
+import os
+from collections import Counter, defaultdict
+from datetime import datetime
+from itertools import combinations
+from typing import Dict, Iterable, List, Tuple
+
+from .config import ITEM_NEIGHBORS_FILE
+from .json_codec import dump_file, load_file
+
+# NumPy makes the offline job finish in seconds on large stores, but the
+# web app only needs the stdlib to read the neighbor table.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_TOP_N = 20
+# Very long lists add quadratic work while saying little about any single pair
+MAX_ITEMS_PER_USER = 500
+
+_neighbors_cache = {"mtime": None, "neighbors": {}}
+
+def build_user_item_lists(watch_later: Dict, max_items_per_user: int = MAX_ITEMS_PER_USER) -> Dict[str, List[str]]:
+    """Turn the watch-later store into de-duplicated per-user item lists"""
+    user_items = {}
+    for username, saved in watch_later.items():
+        # Older files contain stray non-list entries, skip anything that isn't a list
+        if not isinstance(saved, list):
+            continue
+        items = list(dict.fromkeys(mid for mid in saved if mid))
+        if len(items) > 1:
+            # Keep the most recently saved titles
+            user_items[username] = items[-max_items_per_user:]
+    return user_items
+
+def compute_item_neighbors(
+    user_items: Dict[str, List[str]],
+    likes: Dict = None,
+    top_n: int = DEFAULT_TOP_N,
+    min_support: int = 1
+) -> Dict[str, List[Tuple[str, float]]]:
+    """Compute the top-N cosine neighbors of every item in a binary user x item matrix.
+
+    ``cosine(a, b) = co_saves(a, b) / sqrt(saves(a) * saves(b))``. Likes carry no
+    user, so they only break ties between equally similar neighbors.
+    """
+    likes = likes if isinstance(likes, dict) else {}
+    if np is not None:
+        return _compute_item_neighbors_numpy(user_items, likes, top_n, min_support)
+    
+    item_counts = Counter()
+    pair_counts = Counter()
+    for items in user_items.values():
+        item_counts.update(items)
+        # Counter.update over a generator runs the counting loop in C
+        pair_counts.update(combinations(sorted(items), 2))
+
+    candidates = defaultdict(list)
+    for (a, b), together in pair_counts.items():
+        if together < min_support:
+            continue
+        score = together / math.sqrt(item_counts[a] * item_counts[b])
+        candidates[a].append((score, likes.get(b, 0), b))
+        candidates[b].append((score, likes.get(a, 0), a))
+
+    neighbors = {}
+    for item, scored in candidates.items():
+        best = heapq.nlargest(top_n, scored) if len(scored) > top_n else sorted(scored, reverse=True)
+        neighbors[item] = [(other, round(score, 4)) for score, _, other in best]
+    return neighbors
+
+def _compute_item_neighbors_numpy(user_items, likes, top_n, min_support):
+    """Vectorized compute_item_neighbors: pair codes are counted with np.unique"""
+    # Number items by descending likes so a smaller id means a more liked title
+    seen = {item for items in user_items.values() for item in items}
+    ids = sorted(seen, key=lambda item: (-_like_count(likes, item), item))
+    n = len(ids)
+    if n < 2:
+        return {}
+    index = {item: i for i, item in enumerate(ids)}
+    by_length = defaultdict(list)
+    for items in user_items.values():
+        by_length[len(items)].append([index[item] for item in items])
+
+    # Users with the same list length share one matrix, so every
+    # (a, b) pair with a < b is produced by a single fancy-indexing step.
+    item_counts = np.zeros(n, dtype=np.int64)
+    codes = []
+    for length, rows in by_length.items():
+        matrix = np.sort(np.asarray(rows, dtype=np.int64), axis=1)
+        item_counts += np.bincount(matrix.ravel(), minlength=n)
+        first, second = np.triu_indices(length, k=1)
+        codes.append((matrix[:, first] * n + matrix[:, second]).ravel())
+    pairs, together = np.unique(np.concatenate(codes), return_counts=True)
+
+    keep = together >= min_support
+    pairs, together = pairs[keep], together[keep]
+    a, b = pairs // n, pairs % n
+    scores = together / np.sqrt(item_counts[a] * item_counts[b])
+
+    # Every pair contributes a neighbor in both directions. Packing
+    # (source, inverted score, neighbor) into one integer lets a single
+    # np.sort order each source's neighbors by score, then by likes.
+    id_bits = (n - 1).bit_length()
+    score_bits = 64 - 2 * id_bits
+    if score_bits < 16:
+        return _top_neighbors_lexsort(ids, a, b, scores, top_n)
+    score_max = (1 << score_bits) - 1
+    inverted = (score_max - np.round(scores * score_max)).astype(np.uint64)
+    a, b = a.astype(np.uint64), b.astype(np.uint64)
+    src_shift = np.uint64(score_bits + id_bits)
+    score_shift = np.uint64(id_bits)
+    keys = np.concatenate([
+        (a << src_shift) | (inverted << score_shift) | b,
+        (b << src_shift) | (inverted << score_shift) | a,
+    ])
+    keys.sort()
+    src = (keys >> src_shift).astype(np.int64)
+    dst = (keys & np.uint64((1 << id_bits) - 1)).astype(np.int64)
+    scores = (score_max - ((keys >> score_shift) & np.uint64(score_max)).astype(np.float64)) / score_max
+    return _first_per_source(ids, src, dst, scores, top_n)
+
+def _top_neighbors_lexsort(ids, a, b, scores, top_n):
+    """Slower ordering for catalogs too large to pack into a single sort key"""
+    src = np.concatenate([a, b])
+    dst = np.concatenate([b, a])
+    scores = np.concatenate([scores, scores])
+    order = np.lexsort((dst, -scores, src))
+    return _first_per_source(ids, src[order], dst[order], scores[order], top_n)
+
+def _first_per_source(ids, src, dst, scores, top_n):
+    """Keep the first top_n entries of every source run in sorted neighbor arrays"""
+    starts = np.flatnonzero(np.r_[True, src[1:] != src[:-1]])
+    run_lengths = np.diff(np.r_[starts, len(src)])
+    rank = np.arange(len(src)) - np.repeat(starts, run_lengths)
+    keep = rank < top_n
+    src, dst, scores = src[keep].tolist(), dst[keep].tolist(), np.round(scores[keep], 4).tolist()
+
+    neighbors = defaultdict(list)
+    for item, other, score in zip(src, dst, scores):
+        neighbors[ids[item]].append((ids[other], score))
+    return dict(neighbors)
+
+def _like_count(likes: Dict, imdb_id: str) -> float:
+    try:
+        return float(likes.get(imdb_id, 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+def save_item_neighbors(neighbors: Dict[str, List[Tuple[str, float]]], stats: Dict = None, path: str = ITEM_NEIGHBORS_FILE):
+    """Write the neighbor table as compact JSON, replacing the old file atomically"""
+    table = {
+        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "stats": stats or {},
+        "neighbors": {item: [[other, score] for other, score in nbrs] for item, nbrs in neighbors.items()}
+    }
+    dump_file(path, table)
+
+def load_item_neighbors(path: str = ITEM_NEIGHBORS_FILE) -> Dict[str, List[List]]:
+    """Load the neighbor table, re-reading it only when the file changes"""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+    if _neighbors_cache["mtime"] != mtime:
+        try:
+            _neighbors_cache["neighbors"] = load_file(path).get("neighbors", {})
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not load item neighbors: {e}")
+            _neighbors_cache["neighbors"] = {}
+        _neighbors_cache["mtime"] = mtime
+    return _neighbors_cache["neighbors"]
+
+def get_also_saved(imdb_id: str, movies_by_id: Dict[str, Dict], limit: int = 6) -> List[Dict]:
+    """Movies most often saved together with ``imdb_id``"""
+    also_saved = []
+    for other, _score in load_item_neighbors().get(imdb_id, []):
+        movie = movies_by_id.get(other)
+        if movie:
+            also_saved.append(movie)
+            if len(also_saved) >= limit:
+                break
+    return also_saved
+
+def get_neighbor_scores(seed_ids: Iterable[str]) -> Dict[str, float]:
+    """Aggregate neighbor similarity for a set of saved titles, scaled to 0-1"""
+    seeds = set(seed_ids)
+    if not seeds:
+        return {}
+    neighbors = load_item_neighbors()
+    scores = defaultdict(float)
+    for seed in seeds:
+        for other, score in neighbors.get(seed, []):
+            if other not in seeds:
+                scores[other] += score
+    if not scores:
+        return {}
+    top = max(scores.values())
+    return {item: score / top for item, score in scores.items()}
@@ -6,4 +6,16 @@ MOVIES_FILE = os.path.join(BASE_DIR, 'data', 'get movies', 'all_10000_movies.jso
 WATCH_LATER_FILE = os.path.join(BASE_DIR, 'data', 'get movies', 'watch_later.json')
 USERS_FILE = os.path.join(BASE_DIR, 'data', 'get movies', 'users.json')
 COMMENTS_FILE = os.path.join(BASE_DIR, 'data', 'get movies', 'comments.json')
-SECRET_KEY = "your-secret-key"  # Change this to a random string!
\ No newline at end of file
+ITEM_NEIGHBORS_FILE = os.path.join(BASE_DIR, 'data', 'get movies', 'item_neighbors.json')
+SIMILARITY_INDEX_FILE = os.path.join(BASE_DIR, 'data', 'get movies', 'similarity_index.npz')
+PRECOMPUTED_RECOMMENDATIONS_FILE = os.path.join(BASE_DIR, 'data', 'get movies', 'precomputed_recommendations.json')
+POSTER_CACHE_DIR = os.path.join(BASE_DIR, 'data', 'poster_cache')
+STATIC_DIR = os.path.join(BASE_DIR, 'static')
+# Set PAGE_CACHE_DIR to share rendered home/browse pages between workers on disk
+PAGE_CACHE_DIR = os.environ.get("PAGE_CACHE_DIR") or None
+TEMPLATE_CACHE_DIR = os.path.join(BASE_DIR, 'data', 'template_cache')
+SECRET_KEY = "your-secret-key"  # Change this to a random string!
+# Set LOG_LEVEL=DEBUG to see per-stage AI pipeline logging
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "WARNING").upper()
+# Set DEBUG_METRICS=1 to expose /debug/metrics; keep it off on public deployments
+DEBUG_METRICS = os.environ.get("DEBUG_METRICS", "") == "1"
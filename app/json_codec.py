@@ -0,0 +1,59 @@
+"""
+JSON codec
+One place for encoding and decoding JSON. Uses orjson when it is installed
+(several times faster for both directions) and the stdlib json module
+otherwise; both produce the same compact UTF-8 output.
+"""
+
+import json
+import os
+from typing import Any, Union
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # Non-string keys are stringified like stdlib json does; numpy scalars and arrays are encoded natively
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(obj: Any) -> bytes:
+        """Compact UTF-8 JSON"""
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+
+    def loads(data: Union[bytes, str]) -> Any:
+        """Parse JSON; malformed input raises ValueError (json.JSONDecodeError)"""
+        return orjson.loads(data)
+else:
+    def dumps(obj: Any) -> bytes:
+        """Compact UTF-8 JSON"""
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def loads(data: Union[bytes, str]) -> Any:
+        """Parse JSON; malformed input raises ValueError (json.JSONDecodeError)"""
+        return json.loads(data)
+
+def dumps_str(obj: Any) -> str:
+    """Compact JSON as text, for lines and payloads embedded in other text"""
+    return dumps(obj).decode('utf-8')
+
+def load_file(path: str) -> Any:
+    """Parse a JSON file (read as bytes, which is what orjson parses fastest)"""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+def dump_file(path: str, obj: Any):
+    """Write ``obj`` as compact JSON, replacing the old file atomically"""
+    tmp_path = str(path) + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(dumps(obj))
+    os.replace(tmp_path, path)
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse encoded through this codec (orjson when available)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
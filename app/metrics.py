@@ -0,0 +1,118 @@
+"""
+In-process latency metrics
+Timing spans are recorded into fixed-bucket histograms and rendered in the
+Prometheus text exposition format for the /debug/metrics endpoint.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+# Upper bounds in seconds, Prometheus style (+Inf is implicit)
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+REPORTED_QUANTILES = (0.5, 0.9, 0.99)
+
+class LatencyHistogram:
+    """Cumulative-bucket latency histogram, safe to update from several threads"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += seconds
+            self.count += 1
+
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        with self._lock:
+            return list(self.counts), self.total, self.count
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside its bucket, like histogram_quantile()"""
+        counts, _, count = self.snapshot()
+        if not count:
+            return 0.0
+        rank = q * count
+        seen = 0
+        for i, bucket_count in enumerate(counts):
+            if seen + bucket_count >= rank and bucket_count:
+                if i == len(self.buckets):
+                    # Observations above the last bound: report the bound itself
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+class StageMetrics:
+    """A family of histograms labelled by endpoint and pipeline stage"""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self.histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, endpoint: str, stage: str) -> LatencyHistogram:
+        key = (endpoint, stage)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def observe(self, endpoint: str, stage: str, seconds: float):
+        self.histogram(endpoint, stage).observe(seconds)
+
+    @contextmanager
+    def span(self, endpoint: str, stage: str):
+        """Time the enclosed block, recording it even when it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(endpoint, stage, time.perf_counter() - start)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} histogram",
+        ]
+        quantile_lines = [
+            f"# HELP {self.name}_quantile Estimated latency quantiles of {self.name}",
+            f"# TYPE {self.name}_quantile gauge",
+        ]
+        for (endpoint, stage), histogram in sorted(self.histograms.items()):
+            labels = f'endpoint="{endpoint}",stage="{stage}"'
+            counts, total, count = histogram.snapshot()
+            cumulative = 0
+            for bound, bucket_count in zip(histogram.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total:.6f}")
+            lines.append(f"{self.name}_count{{{labels}}} {count}")
+            for q in REPORTED_QUANTILES:
+                quantile_lines.append(f'{self.name}_quantile{{{labels},quantile="{q}"}} {histogram.quantile(q):.6f}')
+        return lines + quantile_lines
+
+AI_STAGE_LATENCY = StageMetrics(
+    "moviehub_ai_stage_seconds",
+    "Latency of each AI suggestion pipeline stage in seconds."
+)
+
+def render_prometheus() -> str:
+    """All registered metrics in Prometheus text exposition format"""
+    return "\n".join(AI_STAGE_LATENCY.render()) + "\n"
@@ -0,0 +1,254 @@
+"""
+Rendered page cache
+The home and browse pages look the same to every visitor for a given query,
+except for the signed-in user's corner of the navbar. They are rendered once
+for an anonymous visitor and kept, keyed by the canonical query and a
+version made of everything else the HTML depends on: the catalog, the static
+asset manifest and the templates. Any catalog write changes the version, so
+stale pages are simply never looked up again (and dropped).
+
+Signed-in visitors get the same cached page with their navbar fragment,
+the part of base.html between the ``navbar-user`` markers, rendered and
+spliced in.
+
+A page rendered as a stream (see templating.stream_template) is passed on as
+it arrives and stored once the last chunk has gone out.
+
+Pages are kept in memory per worker (least recently used first out), and,
+with PAGE_CACHE_DIR set, also on disk where all workers share them.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
+
+from .catalog_store import catalog_version
+from .config import BASE_DIR, PAGE_CACHE_DIR, STATIC_DIR
+from .static_assets import BUILD_DIRNAME, MANIFEST_NAME
+
+MAX_ENTRIES = 256
+MAX_BYTES = 64 << 20
+USER_START = b"<!-- navbar-user -->"
+USER_END = b"<!-- /navbar-user -->"
+TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
+
+Page = Tuple[bytes, int, int]
+
+def _stat_key(path: str) -> str:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return ""
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+def _templates_key(directory: str = TEMPLATES_DIR) -> str:
+    """Changes when any template does, so a deploy never serves pages from old markup"""
+    keys = []
+    for root, _, names in os.walk(directory):
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            keys.append(f"{path}={_stat_key(path)}")
+    return hashlib.sha1("\n".join(sorted(keys)).encode("utf-8")).hexdigest()
+
+class PageCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES, disk_dir: Optional[str] = PAGE_CACHE_DIR):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+        # key -> (anonymous page, start and end of its navbar fragment)
+        self._pages: "OrderedDict[str, Page]" = OrderedDict()
+        self._bytes = 0
+        self._version = None
+        self._templates = _templates_key()
+        self._lock = threading.Lock()
+
+    def version(self) -> str:
+        manifest = os.path.join(STATIC_DIR, BUILD_DIRNAME, MANIFEST_NAME)
+        key = f"{catalog_version()}|{_stat_key(manifest)}|{self._templates}"
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def page_key(request: Request, params: Iterable[str]) -> str:
+        """The path plus the parameters the page reads, sorted, without empty ones.
+
+        Values are kept as given: the page echoes them back into the filter form.
+        """
+        query = request.query_params
+        parts = [f"{name}={query[name]}" for name in sorted(params) if query.get(name)]
+        return request.url.path + "?" + "&".join(parts)
+
+    def get(self, key: str, version: str) -> Optional[Page]:
+        with self._lock:
+            if version != self._version:
+                # The catalog (or markup) changed: nothing cached so far can be served again
+                self._pages.clear()
+                self._bytes = 0
+                self._version = version
+                self._prune_disk(version)
+            page = self._pages.get(key)
+            if page is not None:
+                self._pages.move_to_end(key)
+                self.stats["hits"] += 1
+                return page
+        page = self._read_disk(key, version)
+        if page is not None:
+            self.stats["disk_hits"] += 1
+            self._remember(key, version, page)
+            return page
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, key: str, version: str, body: bytes) -> Optional[Page]:
+        """Keep a page rendered for an anonymous visitor; None if it has no navbar fragment to swap"""
+        page = _split(body)
+        if page is None:
+            return None
+        self._remember(key, version, page)
+        self._write_disk(key, version, body)
+        return page
+
+    def _remember(self, key: str, version: str, page: Page):
+        size = len(page[0])
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if version != self._version:
+                return
+            old = self._pages.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[0])
+            self._pages[key] = page
+            self._bytes += size
+            while len(self._pages) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._pages.popitem(last=False)
+                self._bytes -= len(evicted[0])
+
+    # -- shared disk copy ---------------------------------------------------------
+
+    def _disk_path(self, key: str, version: str) -> str:
+        return os.path.join(self.disk_dir, f"{version}_{hashlib.sha1(key.encode('utf-8')).hexdigest()}.html")
+
+    def _read_disk(self, key: str, version: str) -> Optional[Page]:
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key, version), 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None
+        return _split(body)
+
+    def _write_disk(self, key: str, version: str, body: bytes):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key, version)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Could not write page cache file {path}: {e}")
+
+    def _prune_disk(self, version: str):
+        if not self.disk_dir:
+            return
+        try:
+            names = os.listdir(self.disk_dir)
+        except OSError:
+            return
+        for name in names:
+            if not name.startswith(version + "_"):
+                try:
+                    os.remove(os.path.join(self.disk_dir, name))
+                except OSError:
+                    pass  # Another worker got there first
+
+def _split(body: bytes) -> Optional[Page]:
+    start, end = body.find(USER_START), body.find(USER_END)
+    return (body, start + len(USER_START), end) if 0 <= start < end else None
+
+page_cache = PageCache()
+
+def _etag(key: str, version: str) -> str:
+    return f'W/"{version}-{hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]}"'
+
+async def _pass_through(
+    chunks: AsyncIterator[bytes],
+    key: str,
+    version: str,
+    navbar_user: Optional[bytes]
+) -> AsyncIterator[bytes]:
+    """Send a streamed page on, splicing in the user's navbar, and cache it once complete"""
+    received = []
+    spliced = navbar_user is None
+    async for chunk in chunks:
+        received.append(chunk)
+        if spliced:
+            yield chunk
+            continue
+        # The navbar comes before the first flush, so this only ever buffers the head
+        head = _split(b"".join(received))
+        if head is not None:
+            body, start, end = head
+            yield body[:start] + navbar_user + body[end:]
+            spliced = True
+    body = b"".join(received)
+    if not spliced:
+        yield body
+    page_cache.put(key, version, body)
+
+def _stream_page(request: Request, response: StreamingResponse, key: str, version: str, render_user) -> Response:
+    if request.session.get("username"):
+        navbar_user = render_user(request).encode("utf-8")
+        headers = {"Cache-Control": "private, no-cache"}
+    else:
+        navbar_user = None
+        headers = {"ETag": _etag(key, version), "Cache-Control": "no-cache"}
+    return StreamingResponse(
+        _pass_through(response.body_iterator, key, version, navbar_user),
+        media_type="text/html",
+        headers=headers
+    )
+
+async def cached_page(
+    request: Request,
+    params: Iterable[str],
+    render: Callable[[], Response],
+    render_user: Callable[[Request], str]
+) -> Response:
+    """Serve a public page from the cache, rendering it (anonymously) on a miss.
+
+    ``render`` must produce the page as an anonymous visitor sees it;
+    ``render_user`` renders the navbar fragment for the current session.
+    """
+    version = page_cache.version()
+    key = page_cache.page_key(request, params)
+    page = page_cache.get(key, version)
+    if page is None:
+        response = render()
+        if response.status_code != 200:
+            return response
+        if isinstance(response, StreamingResponse):
+            return _stream_page(request, response, key, version, render_user)
+        page = page_cache.put(key, version, response.body)
+        if page is None:
+            return response
+
+    body, start, end = page
+    if request.session.get("username"):
+        # Personalized pages are never shared, so they get no ETag
+        personalized = body[:start] + render_user(request).encode("utf-8") + body[end:]
+        return HTMLResponse(personalized, headers={"Cache-Control": "private, no-cache"})
+    etag = _etag(key, version)
+    headers: Dict[str, str] = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(body, headers=headers)
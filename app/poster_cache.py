@@ -0,0 +1,203 @@
+"""
+Poster cache
+Posters are fetched from their origin (TMDB, Amazon) once and kept in a
+content-addressed store on disk, together with resized variants for grid
+views. The /poster route serves them with long-lived cache headers, so a page
+of cards no longer hotlinks full-size images from third parties.
+
+    blobs/<sha256>            original image bytes, shared by identical images
+    thumbs/<sha256>_<size>    JPEG resized to the width of a named size
+    refs/<sha1 of url>.json   which blob an origin URL resolved to (or that it failed)
+"""
+
+import asyncio
+import base64
+import hashlib
+import io
+import os
+import time
+from typing import Dict, Optional
+
+import httpx
+
+from .config import POSTER_CACHE_DIR
+from .json_codec import dump_file, load_file
+
+# Thumbnails need Pillow; without it every size is served as the original image
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = features = None
+
+# Named variants by width in pixels, following TMDB's size names
+POSTER_SIZES = {"w92": 92, "w185": 185, "w342": 342}
+THUMBNAIL_QUALITY = 82
+MAX_POSTER_BYTES = 10 << 20
+FETCH_TIMEOUT = 10.0
+# Origin requests in flight at once per worker
+MAX_CONCURRENT_FETCHES = 8
+# A poster that could not be fetched is tried again after this long
+MISS_RETRY_SECONDS = 6 * 3600
+# Inline placeholders are this wide; the browser's upscaling does the blurring
+PLACEHOLDER_WIDTH = 12
+
+class PosterFile:
+    """A cached poster (or variant) ready to serve"""
+    __slots__ = ("path", "media_type", "etag")
+
+    def __init__(self, path: str, media_type: str, etag: str):
+        self.path = path
+        self.media_type = media_type
+        self.etag = etag
+
+class PosterCache:
+    def __init__(self, root: str = POSTER_CACHE_DIR):
+        self.root = str(root)
+        self.stats = {"hits": 0, "fetches": 0, "misses": 0, "thumbnails": 0}
+        # One fetch per origin URL at a time, shared by every request waiting for it
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop = None
+        self._fetch_slots: Optional[asyncio.Semaphore] = None
+
+    # -- paths ------------------------------------------------------------------
+
+    def _ref_path(self, url: str) -> str:
+        return os.path.join(self.root, "refs", hashlib.sha1(url.encode('utf-8')).hexdigest() + ".json")
+
+    def _blob_path(self, sha: str) -> str:
+        return os.path.join(self.root, "blobs", sha)
+
+    def _thumb_path(self, sha: str, size: str) -> str:
+        return os.path.join(self.root, "thumbs", f"{sha}_{size}")
+
+    # -- lookups ----------------------------------------------------------------
+
+    async def get(self, url: str, size: Optional[str] = None) -> Optional[PosterFile]:
+        """The poster at ``url`` (resized to ``size`` if given), fetching it on first use.
+
+        Returns None when the origin does not have a usable image.
+        """
+        ref = self._read_ref(url)
+        if ref is None:
+            ref = await self._fetch_once(url)
+        else:
+            self.stats["hits"] += 1
+        if not ref or ref.get("missing"):
+            return None
+
+        sha = ref["sha"]
+        original = PosterFile(self._blob_path(sha), ref["type"], f'"{sha[:20]}"')
+        if not size or Image is None:
+            return original
+        thumb_path = self._thumb_path(sha, size)
+        if not os.path.exists(thumb_path):
+            try:
+                await asyncio.to_thread(self._make_thumbnail, original.path, thumb_path, POSTER_SIZES[size])
+            except (OSError, ValueError) as e:
+                # Not an image Pillow can read; the original still displays in the browser
+                print(f"⚠️ Could not resize poster {url}: {e}")
+                return original
+            self.stats["thumbnails"] += 1
+        return PosterFile(thumb_path, "image/jpeg", f'"{sha[:20]}-{size}"')
+
+    def cached_blob(self, url: str) -> Optional[str]:
+        """Path of the original already cached for ``url``, without fetching; the file name is its sha256"""
+        ref = self._read_ref(url)
+        return self._blob_path(ref["sha"]) if ref and not ref.get("missing") else None
+
+    def _read_ref(self, url: str) -> Optional[Dict]:
+        """The stored result for ``url``, or None if it has to be fetched (again)"""
+        try:
+            ref = load_file(self._ref_path(url))
+        except (OSError, ValueError):
+            return None
+        if ref.get("missing"):
+            return ref if time.time() - ref.get("checked", 0) < MISS_RETRY_SECONDS else None
+        return ref if os.path.exists(self._blob_path(ref["sha"])) else None
+
+    async def _fetch_once(self, url: str) -> Optional[Dict]:
+        # The fetch runs as its own task, so a client going away does not cancel it for the others
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(url))
+            self._inflight[url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(url, None))
+        return await asyncio.shield(task)
+
+    def _http(self):
+        """Shared client and fetch slots, recreated if the event loop changed (e.g. under tests)"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(timeout=FETCH_TIMEOUT, follow_redirects=True)
+            self._client_loop = loop
+            self._fetch_slots = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+        return self._client, self._fetch_slots
+
+    async def _fetch(self, url: str) -> Dict:
+        client, slots = self._http()
+        self.stats["fetches"] += 1
+        try:
+            async with slots:
+                response = await client.get(url)
+            media_type = response.headers.get("content-type", "").split(";")[0].strip()
+            if response.status_code != 200 or not media_type.startswith("image/"):
+                raise ValueError(f"HTTP {response.status_code} {media_type or 'without content type'}")
+            if len(response.content) > MAX_POSTER_BYTES:
+                raise ValueError(f"{len(response.content):,} bytes is too large for a poster")
+        except (httpx.HTTPError, ValueError) as e:
+            self.stats["misses"] += 1
+            print(f"⚠️ Poster unavailable, using the placeholder for now: {url} ({e})")
+            ref = {"url": url, "missing": True, "checked": time.time()}
+            self._write_ref(url, ref)
+            return ref
+
+        data = response.content
+        sha = hashlib.sha256(data).hexdigest()
+        blob_path = self._blob_path(sha)
+        if not os.path.exists(blob_path):
+            _write_atomic(blob_path, data)
+        ref = {"url": url, "sha": sha, "type": media_type, "bytes": len(data), "checked": time.time()}
+        self._write_ref(url, ref)
+        return ref
+
+    def _write_ref(self, url: str, ref: Dict):
+        path = self._ref_path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        dump_file(path, ref)
+
+    @staticmethod
+    def _make_thumbnail(source: str, target: str, width: int):
+        with Image.open(source) as image:
+            image = image.convert("RGB")
+            if image.width > width:
+                height = max(1, round(image.height * width / image.width))
+                image = image.resize((width, height), Image.LANCZOS)
+            buffer = io.BytesIO()
+            image.save(buffer, "JPEG", quality=THUMBNAIL_QUALITY, optimize=True, progressive=True)
+        _write_atomic(target, buffer.getvalue())
+
+def placeholder_data_uri(source: str, width: int = PLACEHOLDER_WIDTH) -> str:
+    """A few-pixel-wide copy of a poster as a data: URI, to show while the real image loads"""
+    with Image.open(source) as image:
+        image = image.convert("RGB")
+        height = max(1, round(image.height * width / image.width))
+        image = image.resize((width, height), Image.BOX)
+        buffer = io.BytesIO()
+        # WebP is a tenth of the size at this scale; PNG when Pillow was built without it
+        if features.check("webp"):
+            image.save(buffer, "WEBP", quality=40)
+            media_type = "image/webp"
+        else:
+            image.save(buffer, "PNG", optimize=True)
+            media_type = "image/png"
+    return f"data:{media_type};base64,{base64.b64encode(buffer.getvalue()).decode('ascii')}"
+
+def _write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+poster_cache = PosterCache()
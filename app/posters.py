@@ -0,0 +1,95 @@
+"""
+Poster references
+Catalog posters arrive in several shapes: TMDB file paths ("/abc.jpg"), TMDB
+and Amazon URLs at some size, other URLs, "N/A" or nothing. They are resolved
+once, when a movie enters the catalog, into canonical fields:
+
+    PosterSource   "tmdb", "amazon", "url" or "none"
+    PosterPath     TMDB file path, or the full URL for other hosts
+    PosterSizes    sizes the origin can serve ("original" for a fixed image)
+    PosterStatus   "dead" once scan_posters.py found the image gone (absent otherwise)
+    PosterPlaceholder, PosterPlaceholderKey
+                   tiny data: URI shown while the image loads, and the sha256 of
+                   the cached poster it was made from (build_poster_placeholders.py)
+
+Every view then picks its image with poster_src(), the one fallback policy.
+"""
+
+import os
+import re
+from typing import Dict, Optional
+from urllib.parse import quote
+
+from .static_assets import asset_url
+
+# Point at scripts/testing/poster_origin_stub.py to test without TMDB
+TMDB_IMAGE_BASE_URL = os.environ.get("TMDB_IMAGE_BASE_URL", "https://image.tmdb.org/t/p").rstrip("/")
+TMDB_SIZES = ["w92", "w154", "w185", "w342", "w500", "w780", "original"]
+# The size fetched from TMDB for the proxy, which resizes from it
+TMDB_ORIGIN_SIZE = "w500"
+PLACEHOLDER_ASSET = "no-poster.svg"
+POSTER_FIELDS = ("PosterSource", "PosterPath", "PosterSizes", "PosterStatus", "PosterPlaceholder", "PosterPlaceholderKey")
+# Facts about the image itself, which no longer hold once the poster changes
+IMAGE_FIELDS = ("PosterStatus", "PosterPlaceholder", "PosterPlaceholderKey")
+POSTER_DEAD = "dead"
+
+_TMDB_URL = re.compile(r"^https?://image\.tmdb\.org/t/p/[^/]+(/[^/?#]+)$")
+
+def resolve_poster(poster) -> Dict:
+    """Canonical poster fields for a raw ``Poster`` value"""
+    poster = str(poster or "").strip()
+    match = _TMDB_URL.match(poster)
+    if match:
+        return {"PosterSource": "tmdb", "PosterPath": match.group(1), "PosterSizes": TMDB_SIZES}
+    # Bare paths are TMDB's; our own placeholder may have been saved into old catalogs
+    if poster.startswith("/") and not poster.startswith("/static/"):
+        return {"PosterSource": "tmdb", "PosterPath": poster, "PosterSizes": TMDB_SIZES}
+    if poster.startswith(("http://", "https://")):
+        source = "amazon" if "media-amazon.com" in poster else "url"
+        return {"PosterSource": source, "PosterPath": poster, "PosterSizes": ["original"]}
+    return {"PosterSource": "none", "PosterPath": "", "PosterSizes": []}
+
+def normalize_poster(movie: Dict) -> Dict:
+    """Set the canonical poster fields of ``movie`` (in place) from its ``Poster``"""
+    resolved = resolve_poster(movie.get("Poster"))
+    if movie.get("PosterPath") != resolved["PosterPath"]:
+        for field in IMAGE_FIELDS:
+            movie.pop(field, None)
+    movie.update(resolved)
+    return movie
+
+def poster_origin_url(movie: Dict, include_dead: bool = False) -> Optional[str]:
+    """Where the poster image can be fetched from, or None if the movie has none.
+
+    Posters marked dead by the availability scan count as none, unless
+    ``include_dead`` is set (to check them again).
+    """
+    source = movie.get("PosterSource")
+    if source is None:
+        return poster_origin_url(resolve_poster(movie.get("Poster")))
+    if movie.get("PosterStatus") == POSTER_DEAD and not include_dead:
+        return None
+    if source == "tmdb":
+        return f"{TMDB_IMAGE_BASE_URL}/{TMDB_ORIGIN_SIZE}{movie['PosterPath']}"
+    if source == "none":
+        return None
+    return movie.get("PosterPath") or None
+
+def placeholder_url() -> str:
+    """The image shown for movies without a poster"""
+    return asset_url(PLACEHOLDER_ASSET)
+
+def poster_src(movie: Dict, size: Optional[str] = None) -> str:
+    """Image URL for a movie in any view: the caching /poster proxy, or the placeholder"""
+    imdb_id = movie.get("imdbID")
+    if not imdb_id or poster_origin_url(movie) is None:
+        return placeholder_url()
+    url = f"/poster/{quote(imdb_id, safe='')}"
+    return f"{url}?size={size}" if size else url
+
+def poster_background(movie: Dict) -> str:
+    """Inline CSS showing the movie's placeholder under its poster while the image loads"""
+    placeholder = movie.get("PosterPlaceholder")
+    if not placeholder or poster_origin_url(movie) is None:
+        return ""
+    return f"background: center / cover no-repeat url('{placeholder}');"
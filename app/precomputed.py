@@ -0,0 +1,257 @@
+"""
+Precomputed recommendation feeds
+Derives a preference profile for every user from their watch-later list,
+scores the whole catalog with the AI suggestion rules in vectorized form and
+stores per-user top-N lists the web tier can look up directly.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .config import PRECOMPUTED_RECOMMENDATIONS_FILE
+from .json_codec import dump_file, load_file
+from .routes_ai_suggestions import GENRE_KEYWORDS, MOOD_PLOT_WORDS, calculate_movie_match_score
+
+DEFAULT_TOP_N = 20
+# Share of a user's saved titles that must agree before a trait joins the profile
+GENRE_SHARE = 0.3
+MOOD_SHARE = 0.5
+ERA_SHARE = 0.5
+FAMILY_SHARE = 0.6
+MATURE_SHARE = 0.5
+
+FAMILY_RATINGS = ('g', 'pg', 'pg-13')
+MATURE_RATINGS = ('r', 'nc-17')
+
+_store_cache = {"mtime": None, "users": {}}
+# Catalog state inherited by pool workers (copy-on-write under fork)
+_shared = {}
+
+def _movie_year(movie: Dict) -> int:
+    year = str(movie.get('Year', '0'))
+    return int(year) if year.isdigit() else 0
+
+class CatalogFeatures:
+    """Column arrays holding everything calculate_movie_match_score looks at.
+
+    Scoring a profile against the catalog is then a handful of NumPy
+    operations instead of one Python call per movie.
+    """
+
+    def __init__(self, movies: List[Dict], likes: Dict = None):
+        likes = likes if isinstance(likes, dict) else {}
+        self.movies = movies
+        self.ids = [str(m.get('imdbID', '')) for m in movies]
+        self.positions = {}
+        for i, imdb_id in enumerate(self.ids):
+            self.positions.setdefault(imdb_id, i)
+
+        genres = [str(m.get('Genre', '')).lower() for m in movies]
+        plots = [str(m.get('Plot', '')).lower() for m in movies]
+        rated = [str(m.get('Rated', '')).lower() for m in movies]
+
+        self.genre = {
+            key: np.fromiter((key in g for g in genres), dtype=bool, count=len(movies))
+            for key in GENRE_KEYWORDS
+        }
+        self.mood = {
+            mood: np.fromiter((any(w in p for w in words) for p in plots), dtype=bool, count=len(movies))
+            for mood, words in MOOD_PLOT_WORDS.items()
+        }
+        self.year = np.fromiter((_movie_year(m) for m in movies), dtype=np.int32, count=len(movies))
+        self.family = np.fromiter((r in FAMILY_RATINGS for r in rated), dtype=bool, count=len(movies))
+        self.mature = np.fromiter((r in MATURE_RATINGS for r in rated), dtype=bool, count=len(movies))
+        self.imdb_rating = np.fromiter((self._rating(m) for m in movies), dtype=np.float64, count=len(movies))
+        self.bonus = np.fromiter((self._bonus(m) for m in movies), dtype=np.int32, count=len(movies))
+        self.likes = np.fromiter((self._likes(likes, i) for i in self.ids), dtype=np.float64, count=len(movies))
+
+        # Fallback order used when too few movies score above the threshold
+        popular = np.flatnonzero(self.imdb_rating >= 7.5)
+        self.popular = popular[np.argsort(-self.imdb_rating[popular], kind='stable')]
+
+    @staticmethod
+    def _rating(movie: Dict) -> float:
+        try:
+            return float(movie.get('imdbRating', '0'))
+        except (ValueError, TypeError):
+            return float('nan')
+
+    @staticmethod
+    def _bonus(movie: Dict) -> int:
+        """Rating and vote-count points, which don't depend on the profile"""
+        bonus = 0
+        try:
+            imdb_rating = float(movie.get('imdbRating', '0'))
+            if imdb_rating >= 8.0:
+                bonus += 10
+            elif imdb_rating >= 7.0:
+                bonus += 5
+        except (ValueError, TypeError):
+            pass
+        try:
+            if int(str(movie.get('imdbVotes', '0')).replace(',', '')) > 100000:
+                bonus += 5
+        except (ValueError, TypeError):
+            pass
+        return bonus
+
+    @staticmethod
+    def _likes(likes: Dict, imdb_id: str) -> float:
+        try:
+            return float(likes.get(imdb_id, 0))
+        except (TypeError, ValueError):
+            return 0.0
+
+    def score(self, preferences: Dict) -> np.ndarray:
+        """Vectorized calculate_movie_match_score for every movie in the catalog"""
+        score = self.bonus.copy()
+        for genre in preferences.get('genres', []):
+            if genre in self.genre:
+                score += 20 * self.genre[genre]
+        for mood in preferences.get('moods', []):
+            if mood in self.mood:
+                score += 15 * self.mood[mood]
+        year = self.year
+        for era in preferences.get('eras', []):
+            if era == 'classic':
+                score += 20 * (year < 1980)
+            elif era == '80s':
+                score += 20 * ((year >= 1980) & (year < 1990))
+            elif era == '90s':
+                score += 20 * ((year >= 1990) & (year < 2000))
+            elif era == 'modern':
+                score += 20 * (year > 2010)
+        for rating_pref in preferences.get('ratings', []):
+            if rating_pref == 'family':
+                score += 10 * self.family
+            elif rating_pref == 'mature':
+                score += 10 * self.mature
+        return np.minimum(score, 100)
+
+def build_user_profile(saved_movies: List[Dict]) -> Dict[str, List]:
+    """Preferences in analyze_user_preferences' shape, inferred from saved titles"""
+    profile = {'genres': [], 'moods': [], 'eras': [], 'ratings': [], 'specific_requests': []}
+    total = len(saved_movies)
+    if not total:
+        return profile
+
+    genres = [str(m.get('Genre', '')).lower() for m in saved_movies]
+    genre_counts = {key: sum(key in g for g in genres) for key in GENRE_KEYWORDS}
+    ranked = sorted(genre_counts.items(), key=lambda item: item[1], reverse=True)
+    profile['genres'] = [key for key, count in ranked if count / total >= GENRE_SHARE][:3]
+
+    plots = [str(m.get('Plot', '')).lower() for m in saved_movies]
+    for mood, words in MOOD_PLOT_WORDS.items():
+        if sum(any(w in p for w in words) for p in plots) / total >= MOOD_SHARE:
+            profile['moods'].append(mood)
+
+    years = [_movie_year(m) for m in saved_movies]
+    eras = {
+        'classic': sum(0 < y < 1980 for y in years),
+        '80s': sum(1980 <= y < 1990 for y in years),
+        '90s': sum(1990 <= y < 2000 for y in years),
+        'modern': sum(y > 2010 for y in years),
+    }
+    profile['eras'] = [era for era, count in eras.items() if count / total >= ERA_SHARE]
+
+    rated = [str(m.get('Rated', '')).lower() for m in saved_movies]
+    if sum(r in FAMILY_RATINGS for r in rated) / total >= FAMILY_SHARE:
+        profile['ratings'].append('family')
+    elif sum(r in MATURE_RATINGS for r in rated) / total >= MATURE_SHARE:
+        profile['ratings'].append('mature')
+    return profile
+
+def recommend_for_user(features: CatalogFeatures, saved_ids: List[str], top_n: int = DEFAULT_TOP_N) -> List[Tuple[str, int, str]]:
+    """Top-N ``(imdbID, score, why)`` for one user, skipping titles already saved"""
+    saved_positions = [features.positions[i] for i in saved_ids if i in features.positions]
+    if not saved_positions:
+        return []
+    profile = build_user_profile([features.movies[p] for p in saved_positions])
+
+    scores = features.score(profile)
+    scores[saved_positions] = -1
+    eligible = np.flatnonzero(scores > 20)
+    if len(eligible) > top_n:
+        # Keep everything tied with the N-th best so the final ordering stays exact
+        cutoff = np.partition(scores[eligible], len(eligible) - top_n)[len(eligible) - top_n]
+        eligible = eligible[scores[eligible] >= cutoff]
+    # Best score first, then most liked, then catalog order
+    eligible = eligible[np.lexsort((eligible, -features.likes[eligible], -scores[eligible]))][:top_n]
+
+    feed = []
+    for p in eligible.tolist():
+        _, why = calculate_movie_match_score(features.movies[p], profile)
+        feed.append((features.ids[p], int(scores[p]), why or "matches your preferences"))
+
+    if len(feed) < top_n:
+        taken = set(eligible.tolist()) | set(saved_positions)
+        for p in features.popular.tolist():
+            if len(feed) >= top_n:
+                break
+            if p not in taken:
+                feed.append((features.ids[p], 50, "is highly rated and popular"))
+    return feed
+
+def _init_worker(features: CatalogFeatures, top_n: int):
+    _shared["features"] = features
+    _shared["top_n"] = top_n
+
+def _recommend_batch(batch: List[Tuple[str, List[str]]]) -> List[Tuple[str, List]]:
+    features = _shared["features"]
+    return [(username, recommend_for_user(features, saved, _shared["top_n"])) for username, saved in batch]
+
+def precompute_all(
+    user_lists: Dict[str, List[str]],
+    features: CatalogFeatures,
+    top_n: int = DEFAULT_TOP_N,
+    workers: int = None,
+    batch_size: int = 64
+) -> Dict[str, List]:
+    """Score every user, fanning batches of users out across a process pool"""
+    users = [(name, saved) for name, saved in user_lists.items() if isinstance(saved, list) and saved]
+    batches = [users[i:i + batch_size] for i in range(0, len(users), batch_size)]
+    workers = workers or os.cpu_count() or 1
+
+    _init_worker(features, top_n)
+    if workers == 1 or len(batches) <= 1:
+        results = map(_recommend_batch, batches)
+        return {name: feed for batch in results for name, feed in batch}
+
+    # Under fork the workers inherit the catalog arrays without pickling them;
+    # spawn-only platforms (Windows) receive a copy through the initializer.
+    if "fork" in multiprocessing.get_all_start_methods():
+        pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork"))
+    else:
+        pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(features, top_n))
+    with pool:
+        results = pool.map(_recommend_batch, batches)
+        return {name: feed for batch in results for name, feed in batch}
+
+def save_precomputed(feeds: Dict[str, List], stats: Dict = None, path: str = PRECOMPUTED_RECOMMENDATIONS_FILE):
+    """Write the per-user feeds as compact JSON, replacing the old file atomically"""
+    store = {
+        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "stats": stats or {},
+        "users": {name: [list(entry) for entry in feed] for name, feed in feeds.items()}
+    }
+    dump_file(path, store)
+
+def get_precomputed_feed(username: str, path: str = PRECOMPUTED_RECOMMENDATIONS_FILE) -> List[List]:
+    """Stored ``[imdbID, score, why]`` entries for a user, reloading the store when it changes"""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return []
+    if _store_cache["mtime"] != mtime:
+        try:
+            _store_cache["users"] = load_file(path).get("users", {})
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not load precomputed recommendations: {e}")
+            _store_cache["users"] = {}
+        _store_cache["mtime"] = mtime
+    return _store_cache["users"].get(username, [])
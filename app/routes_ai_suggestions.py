@@ -3,17 +3,23 @@ AI Movie Recommendation Engine
 This module provides AI-powered movie suggestions based on user preferences.
 """
 
-import json
+import logging
 import random
-from typing import List, Dict, Any
+import time
+from typing import List, Dict, Any, Iterator
 from fastapi import APIRouter, Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 # Import movie utilities
-from .utils import load_movies, get_all_unique_movies_list
+from .utils import get_movie, load_movies, get_all_unique_movies_list, load_watch_later
+from .collaborative import get_neighbor_scores
+from .json_codec import ORJSONResponse, dumps_str
+from .posters import poster_src
+from .metrics import AI_STAGE_LATENCY
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 class MovieSuggestionRequest(BaseModel):
     user_message: str
@@ -30,24 +36,24 @@ class MovieRecommendation(BaseModel):
     why_recommended: str
     match_score: int  # 1-100
 
+# Genre preferences
+GENRE_KEYWORDS = {
+    'action': ['action', 'fight', 'battle', 'war', 'martial arts', 'superhero', 'adventure'],
+    'comedy': ['funny', 'comedy', 'laugh', 'humor', 'hilarious', 'amusing'],
+    'drama': ['drama', 'emotional', 'serious', 'deep', 'character', 'touching'],
+    'horror': ['scary', 'horror', 'frightening', 'terror', 'spooky', 'creepy'],
+    'romance': ['romantic', 'love', 'romance', 'relationship', 'dating'],
+    'sci-fi': ['sci-fi', 'science fiction', 'space', 'future', 'alien', 'robot'],
+    'thriller': ['thriller', 'suspense', 'mystery', 'crime', 'detective'],
+    'fantasy': ['fantasy', 'magic', 'wizard', 'dragon', 'supernatural'],
+    'animation': ['animated', 'cartoon', 'animation', 'pixar', 'disney'],
+    'documentary': ['documentary', 'real', 'true story', 'factual']
+}
+
 def analyze_user_preferences(user_message: str, conversation_history: List[Dict[str, str]]) -> Dict[str, Any]:
     """Analyze user message to extract movie preferences"""
     message_lower = user_message.lower()
     
-    # Genre preferences
-    genre_keywords = {
-        'action': ['action', 'fight', 'battle', 'war', 'martial arts', 'superhero', 'adventure'],
-        'comedy': ['funny', 'comedy', 'laugh', 'humor', 'hilarious', 'amusing'],
-        'drama': ['drama', 'emotional', 'serious', 'deep', 'character', 'touching'],
-        'horror': ['scary', 'horror', 'frightening', 'terror', 'spooky', 'creepy'],
-        'romance': ['romantic', 'love', 'romance', 'relationship', 'dating'],
-        'sci-fi': ['sci-fi', 'science fiction', 'space', 'future', 'alien', 'robot'],
-        'thriller': ['thriller', 'suspense', 'mystery', 'crime', 'detective'],
-        'fantasy': ['fantasy', 'magic', 'wizard', 'dragon', 'supernatural'],
-        'animation': ['animated', 'cartoon', 'animation', 'pixar', 'disney'],
-        'documentary': ['documentary', 'real', 'true story', 'factual']
-    }
-    
     # Mood preferences
     mood_keywords = {
         'feel-good': ['feel good', 'uplifting', 'positive', 'happy', 'cheerful'],
@@ -81,7 +87,7 @@ def analyze_user_preferences(user_message: str, conversation_history: List[Dict[
     }
     
     # Extract genre preferences
-    for genre, keywords in genre_keywords.items():
+    for genre, keywords in GENRE_KEYWORDS.items():
         if any(keyword in message_lower for keyword in keywords):
             preferences['genres'].append(genre)
     
@@ -112,6 +118,13 @@ def analyze_user_preferences(user_message: str, conversation_history: List[Dict[
     
     return preferences
 
+# Plot words that signal each scored mood
+MOOD_PLOT_WORDS = {
+    'feel-good': ['inspiring', 'uplifting', 'heartwarming'],
+    'dark': ['dark', 'crime', 'murder', 'death'],
+    'mind-bending': ['twist', 'mystery', 'complex']
+}
+
 def calculate_movie_match_score(movie: Dict, preferences: Dict[str, Any]) -> tuple:
     """Calculate how well a movie matches user preferences"""
     score = 0
@@ -132,13 +145,13 @@ def calculate_movie_match_score(movie: Dict, preferences: Dict[str, Any]) -> tup
     
     # Mood matching (30 points max)
     for mood in preferences.get('moods', []):
-        if mood == 'feel-good' and any(word in movie_plot for word in ['inspiring', 'uplifting', 'heartwarming']):
+        if mood == 'feel-good' and any(word in movie_plot for word in MOOD_PLOT_WORDS['feel-good']):
             score += 15
             reasons.append("has an uplifting story")
-        elif mood == 'dark' and any(word in movie_plot for word in ['dark', 'crime', 'murder', 'death']):
+        elif mood == 'dark' and any(word in movie_plot for word in MOOD_PLOT_WORDS['dark']):
             score += 15
             reasons.append("has a dark, intense atmosphere")
-        elif mood == 'mind-bending' and any(word in movie_plot for word in ['twist', 'mystery', 'complex']):
+        elif mood == 'mind-bending' and any(word in movie_plot for word in MOOD_PLOT_WORDS['mind-bending']):
             score += 15
             reasons.append("features complex storytelling")
     
@@ -190,14 +203,25 @@ def calculate_movie_match_score(movie: Dict, preferences: Dict[str, Any]) -> tup
     
     return min(score, 100), "; ".join(reasons[:3])  # Cap at 100 and limit reasons
 
-def get_movie_recommendations(preferences: Dict[str, Any], all_movies: List[Dict], limit: int = 5) -> List[MovieRecommendation]:
-    """Get movie recommendations based on user preferences"""
+# Maximum points added for titles saved by people with similar watch-later lists
+COLLABORATIVE_BOOST = 15
+# AI result cards are small thumbnails
+RECOMMENDATION_POSTER_SIZE = "w185"
+
+def iter_movie_recommendations(preferences: Dict[str, Any], all_movies: List[Dict], limit: int = 5, neighbor_scores: Dict[str, float] = None) -> Iterator[MovieRecommendation]:
+    """Yield movie recommendations one at a time as they are selected"""
     
     # Calculate match scores for all movies
     scored_movies = []
     for movie in all_movies:
         try:
             score, why = calculate_movie_match_score(movie, preferences)
+            if neighbor_scores:
+                affinity = neighbor_scores.get(movie.get('imdbID'))
+                if affinity:
+                    score = min(score + round(affinity * COLLABORATIVE_BOOST), 100)
+                    saved_reason = "is often saved by people who saved the same movies as you"
+                    why = f"{why}; {saved_reason}" if why else saved_reason
             if score > 20:  # Only include movies with decent match
                 scored_movies.append((movie, score, why))
         except (ValueError, KeyError, TypeError):
@@ -207,7 +231,7 @@ def get_movie_recommendations(preferences: Dict[str, Any], all_movies: List[Dict
     scored_movies.sort(key=lambda x: x[1], reverse=True)
     
     # Get top recommendations
-    recommendations = []
+    recommended_ids = set()
     for movie, score, why in scored_movies[:limit]:
         try:
             # Safely get movie data with defaults
@@ -216,13 +240,9 @@ def get_movie_recommendations(preferences: Dict[str, Any], all_movies: List[Dict
             rating = str(movie.get('imdbRating', 'N/A'))
             genre = str(movie.get('Genre', 'Unknown'))
             plot = str(movie.get('Plot', 'No plot available'))
-            poster = str(movie.get('Poster', '/static/no-image.png'))
+            poster = poster_src(movie, RECOMMENDATION_POSTER_SIZE)
             imdb_id = str(movie.get('imdbID', ''))
             
-            # Ensure poster URL is valid
-            if poster == 'N/A' or not poster or poster.strip() == '':
-                poster = '/static/no-image.png'
-            
             # Ensure why_recommended is a string
             why_recommended = str(why) if why else "matches your preferences"
             
@@ -240,15 +260,16 @@ def get_movie_recommendations(preferences: Dict[str, Any], all_movies: List[Dict
                 why_recommended=why_recommended,
                 match_score=match_score
             )
-            recommendations.append(rec)
+            recommended_ids.add(imdb_id)
+            yield rec
             
         except Exception as e:
             # Log the error but continue with other movies
-            print(f"Error creating recommendation for {movie.get('Title', 'Unknown')}: {e}")
+            logger.warning("Error creating recommendation for %s: %s", movie.get('Title', 'Unknown'), e)
             continue
     
     # If we don't have enough high-scoring matches, add some popular movies
-    if len(recommendations) < limit:
+    if len(recommended_ids) < limit:
         try:
             popular_movies = []
             for m in all_movies:
@@ -262,12 +283,12 @@ def get_movie_recommendations(preferences: Dict[str, Any], all_movies: List[Dict
             popular_movies.sort(key=lambda x: float(x.get('imdbRating', '0')) if x.get('imdbRating', '0') != 'N/A' else 0, reverse=True)
             
             for movie in popular_movies:
-                if len(recommendations) >= limit:
+                if len(recommended_ids) >= limit:
                     break
                 
                 # Check if already recommended
                 movie_id = str(movie.get('imdbID', ''))
-                if movie_id not in [r.imdb_id for r in recommendations]:
+                if movie_id not in recommended_ids:
                     try:
                         rec = MovieRecommendation(
                             title=str(movie.get('Title', 'Unknown')),
@@ -275,20 +296,31 @@ def get_movie_recommendations(preferences: Dict[str, Any], all_movies: List[Dict
                             rating=str(movie.get('imdbRating', 'N/A')),
                             genre=str(movie.get('Genre', 'Unknown')),
                             plot=str(movie.get('Plot', 'No plot available')),
-                            poster=str(movie.get('Poster', '/static/no-image.png')) if movie.get('Poster') != 'N/A' else '/static/no-image.png',
+                            poster=poster_src(movie, RECOMMENDATION_POSTER_SIZE),
                             imdb_id=movie_id,
                             why_recommended="is highly rated and popular",
                             match_score=50
                         )
-                        recommendations.append(rec)
+                        recommended_ids.add(movie_id)
+                        yield rec
                     except Exception as e:
-                        print(f"Error creating popular movie recommendation: {e}")
+                        logger.warning("Error creating popular movie recommendation: %s", e)
                         continue
                         
         except Exception as e:
-            print(f"Error adding popular movies: {e}")
-    
-    return recommendations
+            logger.warning("Error adding popular movies: %s", e)
+
+def get_movie_recommendations(preferences: Dict[str, Any], all_movies: List[Dict], limit: int = 5, neighbor_scores: Dict[str, float] = None) -> List[MovieRecommendation]:
+    """Get movie recommendations based on user preferences"""
+    return list(iter_movie_recommendations(preferences, all_movies, limit, neighbor_scores))
+
+def get_user_neighbor_scores(http_request: Request) -> Dict[str, float]:
+    """Collaborative filtering affinities for the logged-in user's watch-later list"""
+    username = http_request.session.get("username")
+    if not username:
+        return {}
+    saved = load_watch_later().get(username, [])
+    return get_neighbor_scores(saved) if isinstance(saved, list) else {}
 
 def generate_ai_response(user_message: str, recommendations: List[MovieRecommendation], preferences: Dict[str, Any]) -> str:
     """Generate a conversational AI response with movie recommendations"""
@@ -316,36 +348,36 @@ def generate_ai_response(user_message: str, recommendations: List[MovieRecommend
     return " ".join(response_parts)
 
 @router.post("/api/movie-suggestions")
-async def get_movie_suggestions(request: MovieSuggestionRequest):
+async def get_movie_suggestions(request: MovieSuggestionRequest, http_request: Request):
     """API endpoint for getting AI movie suggestions"""
-    print("🚀 AI API endpoint called")
+    logger.debug("🚀 AI API endpoint called")
+    request_start = time.perf_counter()
     
     try:
-        print(f"📝 User message: {request.user_message}")
+        logger.debug("📝 User message: %s", request.user_message)
         
-        # Test 1: Load movies
-        print("📚 Step 1: Loading movies...")
+        # Stage 1: Load movies
         try:
-            movies = load_movies()
-            print(f"✅ Raw movies loaded: {len(movies)}")
+            with AI_STAGE_LATENCY.span("suggestions", "load"):
+                movies = load_movies()
+            logger.debug("✅ Raw movies loaded: %d", len(movies))
         except Exception as e:
-            print(f"❌ Failed to load movies: {e}")
-            return JSONResponse({
+            logger.error("❌ Failed to load movies: %s", e)
+            return ORJSONResponse({
                 "ai_response": f"Sorry, I couldn't access the movie database. Error: {str(e)}",
                 "recommendations": [],
                 "preferences_detected": {},
                 "error": f"Movie loading failed: {str(e)}"
             })
         
-        # Test 2: Get unique movies
-        print("🎬 Step 2: Getting unique movies...")
+        # Stage 2: Get unique movies
         try:
-            all_movies = get_all_unique_movies_list(movies)
-            print(f"✅ Unique movies: {len(all_movies)}")
-            print(f"✅ Movies type: {type(all_movies)}")
+            with AI_STAGE_LATENCY.span("suggestions", "unique"):
+                all_movies = get_all_unique_movies_list(movies)
+            logger.debug("✅ Unique movies: %d", len(all_movies))
             
             if not all_movies:
-                return JSONResponse({
+                return ORJSONResponse({
                     "ai_response": "Sorry, no movies found in the database.",
                     "recommendations": [],
                     "preferences_detected": {},
@@ -355,84 +387,78 @@ async def get_movie_suggestions(request: MovieSuggestionRequest):
             # Ensure all_movies is a list
             if not isinstance(all_movies, list):
                 all_movies = list(all_movies)
-                print(f"🔄 Converted to list: {len(all_movies)} movies")
                 
         except Exception as e:
-            print(f"❌ Failed to get unique movies: {e}")
-            import traceback
-            traceback.print_exc()
-            return JSONResponse({
+            logger.exception("❌ Failed to get unique movies: %s", e)
+            return ORJSONResponse({
                 "ai_response": f"Sorry, I had trouble processing the movie database. Error: {str(e)}",
                 "recommendations": [],
                 "preferences_detected": {},
                 "error": f"Unique movies failed: {str(e)}"
             })
         
-        # Test 3: Analyze preferences
-        print("🔍 Step 3: Analyzing preferences...")
+        # Stage 3: Analyze preferences
         try:
-            preferences = analyze_user_preferences(request.user_message, request.conversation_history)
-            print(f"✅ Preferences detected: {preferences}")
+            with AI_STAGE_LATENCY.span("suggestions", "analyze"):
+                preferences = analyze_user_preferences(request.user_message, request.conversation_history)
+            logger.debug("✅ Preferences detected: %s", preferences)
         except Exception as e:
-            print(f"❌ Failed to analyze preferences: {e}")
-            return JSONResponse({
+            logger.error("❌ Failed to analyze preferences: %s", e)
+            return ORJSONResponse({
                 "ai_response": f"Sorry, I couldn't understand your preferences. Error: {str(e)}",
                 "recommendations": [],
                 "preferences_detected": {},
                 "error": f"Preference analysis failed: {str(e)}"
             })
         
-        # Test 4: Get recommendations
-        print("💡 Step 4: Getting recommendations...")
+        # Stage 4: Get recommendations
         try:
-            # Use a smaller subset for testing to avoid memory issues
-            if len(all_movies) > 1000:
-                test_movies = all_movies[:1000]
-                print(f"🔄 Using subset of {len(test_movies)} movies for faster processing")
-            else:
-                test_movies = all_movies
-                print(f"🔄 Using all {len(test_movies)} movies")
+            with AI_STAGE_LATENCY.span("suggestions", "recommend"):
+                # Use a smaller subset for testing to avoid memory issues
+                if len(all_movies) > 1000:
+                    test_movies = all_movies[:1000]
+                else:
+                    test_movies = all_movies
                 
-            recommendations = get_movie_recommendations(preferences, test_movies, limit=5)
-            print(f"✅ Generated {len(recommendations)} recommendations")
+                neighbor_scores = get_user_neighbor_scores(http_request)
+                recommendations = get_movie_recommendations(preferences, test_movies, limit=5, neighbor_scores=neighbor_scores)
+            logger.debug("✅ Generated %d recommendations from %d movies", len(recommendations), len(test_movies))
         except Exception as e:
-            print(f"❌ Failed to get recommendations: {e}")
-            return JSONResponse({
+            logger.error("❌ Failed to get recommendations: %s", e)
+            return ORJSONResponse({
                 "ai_response": f"Sorry, I couldn't generate movie recommendations. Error: {str(e)}",
                 "recommendations": [],
                 "preferences_detected": preferences,
                 "error": f"Recommendation generation failed: {str(e)}"
             })
         
-        # Test 5: Handle no recommendations
+        # Handle no recommendations
         if not recommendations:
-            print("⚠️ No recommendations found")
-            return JSONResponse({
+            logger.info("⚠️ No recommendations found")
+            return ORJSONResponse({
                 "ai_response": "I'm sorry, I couldn't find any movies matching your specific criteria. Could you try asking for a different genre or being more specific about what you're looking for?",
                 "recommendations": [],
                 "preferences_detected": preferences
             })
         
-        # Test 6: Generate AI response
-        print("🤖 Step 5: Generating AI response...")
+        # Stage 5: Generate AI response
         try:
-            ai_response = generate_ai_response(request.user_message, recommendations, preferences)
-            print(f"✅ AI response generated: {ai_response[:50]}...")
+            with AI_STAGE_LATENCY.span("suggestions", "respond"):
+                ai_response = generate_ai_response(request.user_message, recommendations, preferences)
         except Exception as e:
-            print(f"❌ Failed to generate AI response: {e}")
+            logger.error("❌ Failed to generate AI response: %s", e)
             ai_response = f"I found some great movies for you! Here are my recommendations:"
         
-        # Test 7: Convert to dict format
-        print("📄 Step 6: Converting to response format...")
+        # Stage 6: Convert to dict format
         try:
-            recommendations_dict = []
-            for rec in recommendations:
-                rec_dict = rec.dict()
-                recommendations_dict.append(rec_dict)
-            print(f"✅ Converted {len(recommendations_dict)} recommendations")
+            with AI_STAGE_LATENCY.span("suggestions", "convert"):
+                recommendations_dict = []
+                for rec in recommendations:
+                    rec_dict = rec.dict()
+                    recommendations_dict.append(rec_dict)
         except Exception as e:
-            print(f"❌ Failed to convert recommendations: {e}")
-            return JSONResponse({
+            logger.error("❌ Failed to convert recommendations: %s", e)
+            return ORJSONResponse({
                 "ai_response": f"Sorry, I had trouble formatting the recommendations. Error: {str(e)}",
                 "recommendations": [],
                 "preferences_detected": preferences,
@@ -446,18 +472,140 @@ async def get_movie_suggestions(request: MovieSuggestionRequest):
             "preferences_detected": preferences
         }
         
-        print(f"🎉 Success! Sending response with {len(recommendations_dict)} recommendations")
-        return JSONResponse(response_data)
+        logger.debug("🎉 Success! Sending response with %d recommendations", len(recommendations_dict))
+        return ORJSONResponse(response_data)
         
     except Exception as e:
         error_msg = f"Unexpected error in AI endpoint: {str(e)}"
-        print(f"💥 {error_msg}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("💥 %s", error_msg)
         
-        return JSONResponse({
+        return ORJSONResponse({
             "ai_response": "I'm experiencing some technical difficulties right now. Please try again in a moment, or try rephrasing your request.",
             "recommendations": [],
             "preferences_detected": {},
             "error": error_msg
         })
+    finally:
+        AI_STAGE_LATENCY.observe("suggestions", "total", time.perf_counter() - request_start)
+
+def _format_stream_event(event: Dict[str, Any], use_sse: bool) -> str:
+    """Serialize one stream event as an NDJSON line or an SSE frame"""
+    payload = dumps_str(event)
+    if use_sse:
+        return f"event: {event['type']}\ndata: {payload}\n\n"
+    return payload + "\n"
+
+def _stream_movie_suggestions(request: MovieSuggestionRequest, use_sse: bool, neighbor_scores: Dict[str, float]) -> Iterator[str]:
+    """Generate the streamed suggestion events for a single request"""
+    request_start = time.perf_counter()
+    try:
+        with AI_STAGE_LATENCY.span("stream", "load"):
+            movies = load_movies()
+        with AI_STAGE_LATENCY.span("stream", "unique"):
+            all_movies = get_all_unique_movies_list(movies)
+        if not all_movies:
+            yield _format_stream_event({
+                "type": "error",
+                "ai_response": "Sorry, no movies found in the database.",
+                "error": "No unique movies found"
+            }, use_sse)
+            return
+        
+        with AI_STAGE_LATENCY.span("stream", "analyze"):
+            preferences = analyze_user_preferences(request.user_message, request.conversation_history)
+        
+        # The conversational reply only depends on the detected preferences,
+        # so it can be sent before any movie has been scored.
+        try:
+            with AI_STAGE_LATENCY.span("stream", "respond"):
+                ai_response = generate_ai_response(request.user_message, [], preferences)
+        except Exception as e:
+            logger.error("❌ Failed to generate AI response: %s", e)
+            ai_response = "I found some great movies for you! Here are my recommendations:"
+        yield _format_stream_event({
+            "type": "ai_response",
+            "ai_response": ai_response,
+            "preferences_detected": preferences
+        }, use_sse)
+        AI_STAGE_LATENCY.observe("stream", "first_event", time.perf_counter() - request_start)
+        
+        # Use a smaller subset to avoid memory issues, same as the JSON endpoint
+        test_movies = all_movies[:1000] if len(all_movies) > 1000 else all_movies
+        
+        # Only the time spent selecting recommendations counts, not sending them
+        count = 0
+        recommend_seconds = 0.0
+        recommendations = iter_movie_recommendations(preferences, test_movies, limit=5, neighbor_scores=neighbor_scores)
+        while True:
+            start = time.perf_counter()
+            rec = next(recommendations, None)
+            recommend_seconds += time.perf_counter() - start
+            if rec is None:
+                break
+            count += 1
+            yield _format_stream_event({"type": "recommendation", "recommendation": rec.dict()}, use_sse)
+        AI_STAGE_LATENCY.observe("stream", "recommend", recommend_seconds)
+        
+        done_event = {"type": "done", "count": count}
+        if count == 0:
+            done_event["ai_response"] = "I'm sorry, I couldn't find any movies matching your specific criteria. Could you try asking for a different genre or being more specific about what you're looking for?"
+        yield _format_stream_event(done_event, use_sse)
+        
+    except Exception as e:
+        error_msg = f"Unexpected error in AI stream endpoint: {str(e)}"
+        logger.exception("💥 %s", error_msg)
+        yield _format_stream_event({
+            "type": "error",
+            "ai_response": "I'm experiencing some technical difficulties right now. Please try again in a moment, or try rephrasing your request.",
+            "error": error_msg
+        }, use_sse)
+    finally:
+        AI_STAGE_LATENCY.observe("stream", "total", time.perf_counter() - request_start)
+
+@router.post("/api/movie-suggestions/stream")
+async def stream_movie_suggestions(request: MovieSuggestionRequest, http_request: Request, format: str = ""):
+    """Streaming variant of /api/movie-suggestions.
+
+    Sends the conversational ``ai_response`` first and then one event per
+    recommendation as it is selected. The body is NDJSON by default, or
+    Server-Sent Events when ``format=sse`` or ``Accept: text/event-stream``.
+    """
+    use_sse = format == "sse" or "text/event-stream" in http_request.headers.get("accept", "")
+    media_type = "text/event-stream" if use_sse else "application/x-ndjson"
+    return StreamingResponse(
+        _stream_movie_suggestions(request, use_sse, get_user_neighbor_scores(http_request)),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/api/recommendations/for-you")
+async def get_precomputed_recommendations(http_request: Request, limit: int = 10):
+    """Serve the logged-in user's feed from the offline precompute job"""
+    from .precomputed import get_precomputed_feed
+    
+    username = http_request.session.get("username")
+    if not username:
+        return ORJSONResponse({"recommendations": [], "error": "Login required"}, status_code=401)
+    
+    feed = get_precomputed_feed(username)[:max(limit, 0)]
+    if not feed:
+        return ORJSONResponse({"recommendations": [], "precomputed": False})
+    
+    recommendations = []
+    for imdb_id, score, why in feed:
+        movie = get_movie(imdb_id)
+        if not movie:
+            continue
+        recommendations.append(MovieRecommendation(
+            title=str(movie.get('Title', 'Unknown')),
+            year=str(movie.get('Year', 'Unknown')),
+            rating=str(movie.get('imdbRating', 'N/A')),
+            genre=str(movie.get('Genre', 'Unknown')),
+            plot=str(movie.get('Plot', 'No plot available')),
+            poster=poster_src(movie, RECOMMENDATION_POSTER_SIZE),
+            imdb_id=imdb_id,
+            why_recommended=why,
+            match_score=int(score)
+        ).dict())
+    
+    return ORJSONResponse({"recommendations": recommendations, "precomputed": True})
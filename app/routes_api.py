@@ -0,0 +1,244 @@
+"""
+JSON API (v1)
+The home, browse/search, liked and watch-later views as compact JSON for the
+mobile client and integrations. Results are filtered and ordered exactly like
+the HTML pages, then paginated:
+
+    GET /api/v1/movies?genre=Drama&sort_by=year&fields=Title,Year,PosterURL&limit=20
+    -> {"items": [...], "total": 412, "next_cursor": "MjA6dHQwMTExMTYx"}
+    GET /api/v1/movies?...&cursor=MjA6dHQwMTExMTYx
+
+Cursors are opaque. They carry the position and the id of the last item
+returned, so a page still continues after the right movie when the list
+shifted in between. Every response has an ETag derived from the catalog
+(and the likes / watch-later list it depends on); send it back as
+If-None-Match to get a 304 without the list being rebuilt.
+"""
+
+import base64
+import binascii
+import hashlib
+import os
+from typing import Callable, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+
+from .catalog_store import catalog_version
+from .config import LIKES_FILE, WATCH_LATER_FILE
+from .json_codec import ORJSONResponse
+from .posters import poster_src
+from .utils import (
+    get_movie, load_movies, load_likes, load_watch_later,
+    get_all_unique_movies, get_child_unique_movies,
+    get_final_top_movies_by_genre, filter_movies, organize_movies_by_genre
+)
+
+router = APIRouter(prefix="/api/v1")
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+# Returned when ``fields`` is not given: enough to draw a movie card
+DEFAULT_FIELDS = ["imdbID", "Title", "Year", "Genre", "imdbRating", "Rated", "PosterURL"]
+# Not stored on the movie but computed per response
+COMPUTED_FIELDS = {"PosterURL": lambda movie: poster_src(movie, "w342")}
+SORT_KEYS = {
+    "rating": (lambda m: _number(m.get("imdbRating"), float), True),
+    "year": (lambda m: _number(m.get("Year"), int), True),
+    "title": (lambda m: m.get("Title", ""), False),
+}
+# Clients keep their copy but check it on every use; a 304 costs next to nothing.
+# Private, as lists can depend on the session.
+API_CACHE_CONTROL = "private, no-cache"
+
+def _number(value, kind):
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        # "N/A" and missing values sort after every real one
+        return kind(-1)
+
+def _file_version(path: str) -> str:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return ""
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+def _parse_number(value: str, kind, name: str):
+    if not value or not value.strip():
+        return None
+    try:
+        return kind(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} must be a number")
+
+def _filter_args(genre, min_rating, max_rating, year_from, year_to, rated) -> Dict:
+    return {
+        "genre": genre,
+        "min_rating": _parse_number(min_rating, float, "min_rating"),
+        "max_rating": _parse_number(max_rating, float, "max_rating"),
+        "year_from": _parse_number(year_from, int, "year_from"),
+        "year_to": _parse_number(year_to, int, "year_to"),
+        "rated": rated,
+    }
+
+def _parse_fields(fields: str) -> Optional[List[str]]:
+    """Requested field names, always starting with imdbID; None means every field"""
+    if fields.strip() == "*":
+        return None
+    if not fields.strip():
+        return DEFAULT_FIELDS
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    return ["imdbID"] + [name for name in dict.fromkeys(names) if name != "imdbID"]
+
+def _project(movie: Dict, fields: Optional[List[str]]) -> Dict:
+    if fields is None:
+        return {**movie, **{name: compute(movie) for name, compute in COMPUTED_FIELDS.items()}}
+    projected = {}
+    for name in fields:
+        if name in COMPUTED_FIELDS:
+            projected[name] = COMPUTED_FIELDS[name](movie)
+        elif name in movie:
+            projected[name] = movie[name]
+    return projected
+
+def _encode_cursor(offset: int, last_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{offset}:{last_id}".encode("utf-8")).decode("ascii").rstrip("=")
+
+def _page_start(cursor: str, items: List, item_id: Callable) -> int:
+    """Index to continue from: right after the cursor's last item, wherever it is now"""
+    if not cursor:
+        return 0
+    try:
+        offset, last_id = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8").split(":", 1)
+        offset = int(offset)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if 0 < offset <= len(items) and item_id(items[offset - 1]) == last_id:
+        return offset
+    for index, item in enumerate(items):
+        if item_id(item) == last_id:
+            return index + 1
+    # The last item is gone; the position is the best guess left
+    return min(max(offset, 0), len(items))
+
+def _etag(request: Request, *state: str) -> str:
+    """Weak ETag for this query against the current data"""
+    key = "\n".join((catalog_version(), str(request.url.path), str(request.query_params)) + state)
+    return f'W/"{hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]}"'
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": API_CACHE_CONTROL})
+    return None
+
+def _page(items: List, item_id: Callable, render: Callable, cursor: str, limit: int, etag: str) -> ORJSONResponse:
+    if not 1 <= limit <= MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_LIMIT}")
+    start = _page_start(cursor, items, item_id)
+    page = items[start:start + limit]
+    end = start + len(page)
+    next_cursor = _encode_cursor(end, item_id(page[-1])) if page and end < len(items) else None
+    body = {"items": [render(item) for item in page], "total": len(items), "next_cursor": next_cursor}
+    return ORJSONResponse(body, headers={"ETag": etag, "Cache-Control": API_CACHE_CONTROL})
+
+def _movie_page(movies: List[Dict], fields: str, cursor: str, limit: int, etag: str):
+    selected = _parse_fields(fields)
+    return _page(movies, lambda movie: movie.get("imdbID", ""), lambda movie: _project(movie, selected), cursor, limit, etag)
+
+@router.get("/home")
+async def api_home(
+    request: Request,
+    genre: str = "", min_rating: str = "", max_rating: str = "",
+    year_from: str = "", year_to: str = "", rated: str = "",
+    fields: str = "", cursor: str = "", limit: int = 10
+):
+    """The home page's genre rows, a page of rows at a time"""
+    etag = _etag(request)
+    cached = _not_modified(request, etag)
+    if cached:
+        return cached
+    filters = _filter_args(genre, min_rating, max_rating, year_from, year_to, rated)
+    movies = load_movies()
+    if any(value not in (None, "") for value in filters.values()):
+        rows = organize_movies_by_genre(filter_movies(get_all_unique_movies(movies), "", **filters))
+    else:
+        rows = get_final_top_movies_by_genre(get_child_unique_movies(movies))
+    selected = _parse_fields(fields)
+    return _page(
+        list(rows.items()), lambda row: row[0],
+        lambda row: {"genre": row[0], "movies": [_project(movie, selected) for movie in row[1]]},
+        cursor, limit, etag
+    )
+
+@router.get("/movies")
+async def api_movies(
+    request: Request, q: str = "",
+    genre: str = "", min_rating: str = "", max_rating: str = "",
+    year_from: str = "", year_to: str = "", rated: str = "",
+    sort_by: str = "", fields: str = "", cursor: str = "", limit: int = DEFAULT_LIMIT
+):
+    """Browse (sorted by rating unless ``sort_by`` says otherwise) or, with ``q``, search results in match order"""
+    if sort_by and sort_by not in SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"sort_by must be one of {', '.join(SORT_KEYS)}")
+    etag = _etag(request)
+    cached = _not_modified(request, etag)
+    if cached:
+        return cached
+    filters = _filter_args(genre, min_rating, max_rating, year_from, year_to, rated)
+    movies = filter_movies(get_all_unique_movies(load_movies()), q, **filters)
+    sort_by = sort_by or ("" if q else "rating")
+    if sort_by:
+        key, reverse = SORT_KEYS[sort_by]
+        movies = sorted(movies, key=key, reverse=reverse)
+    return _movie_page(movies, fields, cursor, limit, etag)
+
+@router.get("/movies/{imdb_id}")
+async def api_movie(request: Request, imdb_id: str, fields: str = "*"):
+    """One movie, every field unless ``fields`` narrows it"""
+    etag = _etag(request)
+    cached = _not_modified(request, etag)
+    if cached:
+        return cached
+    movie = get_movie(imdb_id)
+    if movie is None:
+        raise HTTPException(status_code=404, detail="Movie not found")
+    return ORJSONResponse(_project(movie, _parse_fields(fields)), headers={"ETag": etag, "Cache-Control": API_CACHE_CONTROL})
+
+@router.get("/liked")
+async def api_liked(
+    request: Request,
+    genre: str = "", min_rating: str = "", max_rating: str = "",
+    year_from: str = "", year_to: str = "", rated: str = "",
+    fields: str = "", cursor: str = "", limit: int = DEFAULT_LIMIT
+):
+    """Liked movies, in catalog order like the Liked page"""
+    etag = _etag(request, _file_version(LIKES_FILE))
+    cached = _not_modified(request, etag)
+    if cached:
+        return cached
+    liked_ids = set(load_likes().keys())
+    movies = [m for m in get_all_unique_movies(load_movies()) if m.get("imdbID") in liked_ids]
+    movies = filter_movies(movies, "", **_filter_args(genre, min_rating, max_rating, year_from, year_to, rated))
+    return _movie_page(movies, fields, cursor, limit, etag)
+
+@router.get("/watch_later")
+async def api_watch_later(
+    request: Request,
+    genre: str = "", min_rating: str = "", max_rating: str = "",
+    year_from: str = "", year_to: str = "", rated: str = "",
+    fields: str = "", cursor: str = "", limit: int = DEFAULT_LIMIT
+):
+    """The signed-in user's watch-later list, in catalog order like its page"""
+    username = request.session.get("username")
+    if not username:
+        raise HTTPException(status_code=401, detail="Login required")
+    etag = _etag(request, username, _file_version(WATCH_LATER_FILE))
+    cached = _not_modified(request, etag)
+    if cached:
+        return cached
+    user_list = set(load_watch_later().get(username, []))
+    movies = [m for m in get_all_unique_movies(load_movies()) if m.get("imdbID") in user_list]
+    movies = filter_movies(movies, "", **_filter_args(genre, min_rating, max_rating, year_from, year_to, rated))
+    return _movie_page(movies, fields, cursor, limit, etag)
@@ -1,10 +1,9 @@
 from fastapi import APIRouter, Request, Form
 from fastapi.responses import RedirectResponse, HTMLResponse
-from fastapi.templating import Jinja2Templates
 from .utils import load_users, save_users, hash_password
+from .templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 @router.get("/register", response_class=HTMLResponse)
 async def register_form(request: Request):
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+from .config import DEBUG_METRICS
+from .metrics import render_prometheus
+
+router = APIRouter()
+
+@router.get("/debug/metrics", response_class=PlainTextResponse)
+async def debug_metrics():
+    """Stage latency histograms in Prometheus text format (only with DEBUG_METRICS=1)"""
+    if not DEBUG_METRICS:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,15 +1,21 @@
 from fastapi import APIRouter, Request, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from .utils import (
-    load_movies, save_movies, load_likes, save_likes,
+    load_movies, upsert_movies, load_likes, save_likes,
     get_all_unique_movies, get_child_unique_movies,
     get_final_top_movies_by_genre, search_movies,
     filter_movies, get_filter_options, organize_movies_by_genre
 )
+from .collaborative import get_also_saved
+from .similarity import get_similar_movies
+from .page_cache import cached_page
+from .templating import render_navbar_user, stream_template, templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
+
+# Query parameters each cached page is rendered from
+HOME_PARAMS = ("q", "genre", "min_rating", "max_rating", "year_from", "year_to", "rated")
+BROWSE_PARAMS = ("genre", "min_rating", "max_rating", "year_from", "year_to", "rated", "sort_by")
 
 @router.get("/", response_class=HTMLResponse)
 async def home(
@@ -22,10 +28,18 @@ async def home(
     year_to: str = "",
     rated: str = ""
 ):
+    return await cached_page(
+        request, HOME_PARAMS,
+        lambda: render_home(request, q, genre, min_rating, max_rating, year_from, year_to, rated),
+        render_navbar_user
+    )
+
+def render_home(request: Request, q, genre, min_rating, max_rating, year_from, year_to, rated):
+    """The home page as an anonymous visitor sees it"""
     movies = load_movies()
     all_unique_movies = get_all_unique_movies(movies)
     child_unique_movies = get_child_unique_movies(movies)
-    username = request.session.get("username")
+    username = None
     
     # Get all available filter options
     filter_options = get_filter_options(all_unique_movies)
@@ -67,7 +81,8 @@ async def home(
         )
         
         if q:  # If there's a search query, show search results template
-            return templates.TemplateResponse(
+            # A broad query can match thousands of movies: stream the results
+            return stream_template(
                 "search_results.html",
                 {
                     "request": request, 
@@ -118,7 +133,10 @@ async def home(
 @router.get("/movie/{imdb_id}", response_class=HTMLResponse)
 async def movie_detail(request: Request, imdb_id: str):
     movies = load_movies()
-    movie = next((m for m in movies if str(m.get('imdbID')) == str(imdb_id)), None)
+    movies_by_id = {}
+    for m in movies:
+        movies_by_id.setdefault(str(m.get('imdbID')), m)
+    movie = movies_by_id.get(str(imdb_id))
     if not movie:
         username = request.session.get("username")
         return templates.TemplateResponse("movie_not_found.html", {"request": request, "username": username, "search_query": ""}, status_code=404)
@@ -135,6 +153,10 @@ async def movie_detail(request: Request, imdb_id: str):
     likes = load_likes()
     is_liked = imdb_id in likes
     
+    # "People who saved this also saved" from the collaborative filtering table
+    also_saved = get_also_saved(imdb_id, movies_by_id)
+    more_like_this = get_similar_movies(imdb_id, movies, movies_by_id)
+    
     username = request.session.get("username")
     return templates.TemplateResponse(
         "movie_detail.html",
@@ -144,7 +166,9 @@ async def movie_detail(request: Request, imdb_id: str):
             "comments": movie_comments,
             "username": username,
             "search_query": "",
-            "is_liked": is_liked
+            "is_liked": is_liked,
+            "also_saved": also_saved,
+            "more_like_this": more_like_this
         }
     )
 
@@ -180,8 +204,7 @@ async def add_movie(
             "Rated": "",
             "Genre": ""
         }
-        movies.append(new_movie)
-        save_movies(movies)
+        upsert_movies([new_movie])
         return RedirectResponse(url=f"/movie/{new_imdb_id}", status_code=303)
     else:
         return templates.TemplateResponse("add_movie.html", {"request": request, "error": "Title is required."})
@@ -300,9 +323,17 @@ async def browse_movies(
     sort_by: str = "rating"
 ):
     """Browse movies with advanced filtering options"""
+    return await cached_page(
+        request, BROWSE_PARAMS,
+        lambda: render_browse(request, genre, min_rating, max_rating, year_from, year_to, rated, sort_by),
+        render_navbar_user
+    )
+
+def render_browse(request: Request, genre, min_rating, max_rating, year_from, year_to, rated, sort_by):
+    """The browse page as an anonymous visitor sees it"""
     movies = load_movies()
     all_unique_movies = get_all_unique_movies(movies)
-    username = request.session.get("username")
+    username = None
     
     # Get all available filter options
     filter_options = get_filter_options(all_unique_movies)
@@ -350,7 +381,7 @@ async def browse_movies(
     elif sort_by == "title":
         filtered_movies.sort(key=lambda x: x.get("Title", ""))
     
-    return templates.TemplateResponse(
+    return stream_template(
         "browse_movies.html",
         {
             "request": request, 
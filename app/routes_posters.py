@@ -0,0 +1,44 @@
+from typing import Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, RedirectResponse, Response
+
+from .catalog_store import catalog_version, get_catalog_store
+from .poster_cache import POSTER_SIZES, poster_cache
+from .posters import placeholder_url, poster_origin_url
+
+router = APIRouter()
+
+# Posters rarely change for a movie; revalidation is a cheap 304 thanks to the ETag
+POSTER_CACHE_CONTROL = "public, max-age=604800, stale-while-revalidate=86400"
+# Missing posters are retried sooner, in case the origin comes back
+PLACEHOLDER_CACHE_CONTROL = "public, max-age=3600"
+
+_origins: Dict = {"version": None, "urls": {}}
+
+def poster_origin(imdb_id: str) -> Optional[str]:
+    """Origin URL of a movie's poster, from a lookup table rebuilt when the catalog changes"""
+    version = catalog_version()
+    if _origins["version"] != version:
+        urls = {}
+        for movie in get_catalog_store().load():
+            url = poster_origin_url(movie)
+            if movie.get("imdbID") and url:
+                urls.setdefault(movie["imdbID"], url)
+        _origins.update(version=version, urls=urls)
+    return _origins["urls"].get(imdb_id)
+
+@router.get("/poster/{imdb_id}")
+async def get_poster(imdb_id: str, request: Request, size: Optional[str] = None):
+    """A movie's poster from the on-disk cache, resized to ``size`` (w92, w185 or w342) if given"""
+    if size is not None and size not in POSTER_SIZES:
+        raise HTTPException(status_code=400, detail=f"size must be one of {', '.join(POSTER_SIZES)}")
+    url = poster_origin(imdb_id)
+    poster = await poster_cache.get(url, size) if url else None
+    if poster is None:
+        return RedirectResponse(placeholder_url(), status_code=302, headers={"Cache-Control": PLACEHOLDER_CACHE_CONTROL})
+
+    headers = {"ETag": poster.etag, "Cache-Control": POSTER_CACHE_CONTROL}
+    if poster.etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(poster.path, media_type=poster.media_type, headers=headers)
@@ -1,10 +1,9 @@
 from fastapi import APIRouter, Request
 from fastapi.responses import RedirectResponse, HTMLResponse
-from fastapi.templating import Jinja2Templates
 from .utils import load_watch_later, save_watch_later, load_movies, get_all_unique_movies
+from .templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 @router.post("/watch_later/{imdb_id}")
 async def watch_later_movie(request: Request, imdb_id: str):
@@ -0,0 +1,263 @@
+"""
+"More like this" similarity index
+Embeds every movie from its metadata (genre, decade, rating band, hashed plot
+and cast features) and serves approximate nearest neighbors through a
+random-projection LSH index that is persisted next to the catalog.
+
+The index is keyed on the fields the embeddings read, so catalog writes that
+only touch other fields (poster status, placeholders) keep it valid. When it
+does go stale it is rebuilt in a background thread, one rebuild at a time,
+while requests keep being served from the previous index.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import zlib
+from typing import Dict, List, Optional
+
+from .catalog_store import catalog_version
+from .config import MOVIES_FILE, SIMILARITY_INDEX_FILE
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Embedding layout: one block per metadata field, each L2-normalized then weighted
+GENRE_DIMS = 64
+DECADE_DIMS = 16
+RATING_DIMS = 10
+PLOT_DIMS = 128
+PEOPLE_DIMS = 64
+EMBED_DIM = GENRE_DIMS + DECADE_DIMS + RATING_DIMS + PLOT_DIMS + PEOPLE_DIMS
+BLOCK_WEIGHTS = {"genre": 1.0, "decade": 0.5, "rating": 0.3, "plot": 0.6, "people": 0.6}
+
+# LSH parameters: more tables raise recall, more bits shrink the buckets
+LSH_TABLES = 16
+LSH_BITS = 10
+LSH_SEED = 1234
+INDEX_VERSION = 2
+# Everything embed_movie() reads; the index only has to change when one of these does
+FEATURE_FIELDS = ("imdbID", "Genre", "Year", "imdbRating", "Plot", "Actors", "Director")
+
+PLOT_STOPWORDS = {
+    "the", "and", "that", "with", "from", "this", "their", "they", "when", "into",
+    "after", "before", "while", "where", "which", "about", "them", "have", "been",
+    "must", "will", "what", "his", "her", "who", "for", "are", "but", "its", "one"
+}
+WORD_RE = re.compile(r"[a-z0-9']+")
+
+_index_cache = {"version": None, "index": None}
+_refresh_lock = threading.Lock()
+
+def _bucket(token: str, dims: int) -> int:
+    # crc32 is stable across processes, unlike hash(), so persisted vectors stay valid
+    return zlib.crc32(token.encode("utf-8")) % dims
+
+def _split_list(value) -> List[str]:
+    if not value or value == "N/A":
+        return []
+    return [part.strip().lower() for part in str(value).split(",") if part.strip()]
+
+def embed_movie(movie: Dict) -> "np.ndarray":
+    """Dense, L2-normalized metadata embedding for a single movie"""
+    blocks = {
+        "genre": np.zeros(GENRE_DIMS, dtype=np.float32),
+        "decade": np.zeros(DECADE_DIMS, dtype=np.float32),
+        "rating": np.zeros(RATING_DIMS, dtype=np.float32),
+        "plot": np.zeros(PLOT_DIMS, dtype=np.float32),
+        "people": np.zeros(PEOPLE_DIMS, dtype=np.float32),
+    }
+
+    for genre in _split_list(movie.get("Genre")):
+        blocks["genre"][_bucket(genre, GENRE_DIMS)] = 1.0
+
+    year = str(movie.get("Year", ""))[:4]
+    if year.isdigit():
+        # 1870s..2020s land in their own slot, anything older shares slot 0
+        decade = min(max((int(year) - 1870) // 10, 0), DECADE_DIMS - 1)
+        blocks["decade"][decade] = 1.0
+
+    try:
+        rating = float(movie.get("imdbRating", ""))
+        blocks["rating"][min(int(rating), RATING_DIMS - 1)] = 1.0
+    except (ValueError, TypeError):
+        pass
+
+    plot = str(movie.get("Plot", "")).lower()
+    for word in WORD_RE.findall(plot):
+        if len(word) > 3 and word not in PLOT_STOPWORDS:
+            blocks["plot"][_bucket(word, PLOT_DIMS)] += 1.0
+
+    for person in _split_list(movie.get("Actors")) + _split_list(movie.get("Director")):
+        blocks["people"][_bucket(person, PEOPLE_DIMS)] = 1.0
+
+    parts = []
+    for name in ("genre", "decade", "rating", "plot", "people"):
+        block = blocks[name]
+        norm = np.linalg.norm(block)
+        parts.append(block * (BLOCK_WEIGHTS[name] / norm) if norm else block)
+    vector = np.concatenate(parts)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+class SimilarityIndex:
+    """Random-projection LSH over movie embeddings.
+
+    Each table hashes a vector to the sign pattern of ``LSH_BITS`` random
+    hyperplanes. Bucket members are kept as sorted code arrays, so a lookup
+    is a pair of binary searches and the whole index saves as one ``.npz``.
+    """
+
+    def __init__(self, ids: List[str], vectors, planes, codes, features_key: str = ""):
+        self.ids = ids
+        self.positions = {imdb_id: i for i, imdb_id in enumerate(ids)}
+        self.vectors = vectors
+        self.planes = planes
+        self.codes = codes
+        self.features_key = features_key
+        self.order = np.argsort(codes, axis=1, kind="stable")
+        self.sorted_codes = np.take_along_axis(codes, self.order, axis=1)
+
+    @classmethod
+    def build(cls, movies: List[Dict], key: str = "") -> "SimilarityIndex":
+        unique = _unique_movies(movies)
+        ids = list(unique)
+        vectors = np.zeros((len(ids), EMBED_DIM), dtype=np.float32)
+        for i, imdb_id in enumerate(ids):
+            vectors[i] = embed_movie(unique[imdb_id])
+        rng = np.random.default_rng(LSH_SEED)
+        planes = rng.standard_normal((LSH_TABLES, EMBED_DIM, LSH_BITS)).astype(np.float32)
+        return cls(ids, vectors, planes, cls._hash(vectors, planes), key or features_key(movies))
+
+    @staticmethod
+    def _hash(vectors, planes):
+        weights = (1 << np.arange(LSH_BITS)).astype(np.int64)
+        # (tables, n, bits) sign pattern -> (tables, n) integer bucket codes
+        bits = np.einsum("nd,tdb->tnb", vectors, planes) > 0
+        return (bits * weights).sum(axis=2)
+
+    def save(self, path: str = SIMILARITY_INDEX_FILE):
+        """Persist the index so other workers can load it instead of rebuilding"""
+        tmp_path = path + ".tmp.npz"
+        np.savez(
+            tmp_path,
+            version=np.array(INDEX_VERSION),
+            features_key=np.array(self.features_key),
+            ids=np.array(self.ids),
+            vectors=self.vectors,
+            planes=self.planes,
+            codes=self.codes,
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = SIMILARITY_INDEX_FILE) -> Optional["SimilarityIndex"]:
+        try:
+            with np.load(path) as data:
+                if int(data["version"]) != INDEX_VERSION:
+                    return None
+                return cls(
+                    data["ids"].tolist(), data["vectors"], data["planes"],
+                    data["codes"], str(data["features_key"])
+                )
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def candidates(self, position: int):
+        """Rows sharing a bucket with ``position`` in at least one table"""
+        found = []
+        for table in range(self.codes.shape[0]):
+            code = self.codes[table, position]
+            row = self.sorted_codes[table]
+            lo = np.searchsorted(row, code, side="left")
+            hi = np.searchsorted(row, code, side="right")
+            found.append(self.order[table, lo:hi])
+        return np.unique(np.concatenate(found))
+
+    def similar(self, imdb_id: str, k: int = 10) -> List[str]:
+        """IDs of up to ``k`` movies most similar to ``imdb_id``, best first"""
+        position = self.positions.get(imdb_id)
+        if position is None:
+            return []
+        candidates = self.candidates(position)
+        if len(candidates) <= k:
+            # Outliers and tiny catalogs can leave buckets nearly empty, scan everything instead
+            candidates = np.arange(len(self.ids))
+        candidates = candidates[candidates != position]
+        if len(candidates) == 0:
+            return []
+        scores = self.vectors[candidates] @ self.vectors[position]
+        if len(candidates) > k:
+            top = np.argpartition(-scores, k)[:k]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.argsort(-scores[top])]
+        return [self.ids[i] for i in candidates[top]]
+
+def _unique_movies(movies: List[Dict]) -> Dict[str, Dict]:
+    unique = {}
+    for movie in movies:
+        imdb_id = movie.get("imdbID")
+        if imdb_id and imdb_id not in unique:
+            unique[imdb_id] = movie
+    return unique
+
+def features_key(movies: List[Dict]) -> str:
+    """Identify a catalog by the fields the embeddings are built from"""
+    digest = hashlib.sha1()
+    for movie in _unique_movies(movies).values():
+        digest.update("\x1f".join(str(movie.get(field, "")) for field in FEATURE_FIELDS).encode("utf-8"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+def refresh_similarity_index(movies: List[Dict], path: str = SIMILARITY_INDEX_FILE) -> SimilarityIndex:
+    """Load the persisted index if it matches ``movies``, otherwise rebuild and save it"""
+    key = features_key(movies)
+    current = _index_cache["index"]
+    if current is not None and current.features_key == key:
+        return current
+    index = SimilarityIndex.load(path)
+    if index is None or index.features_key != key:
+        index = SimilarityIndex.build(movies, key)
+        try:
+            index.save(path)
+        except OSError as e:
+            print(f"⚠️ Could not persist similarity index: {e}")
+    return index
+
+def _refresh_in_background(movies: List[Dict], version: str):
+    try:
+        index = refresh_similarity_index(movies)
+        _index_cache["index"] = index
+        _index_cache["version"] = version
+    except Exception as e:
+        print(f"⚠️ Could not refresh similarity index: {e}")
+    finally:
+        _refresh_lock.release()
+
+def get_similarity_index(movies: List[Dict]) -> Optional[SimilarityIndex]:
+    """Return the index for the current catalog, refreshing it in the background after a change.
+
+    Until the refresh finishes, the previous index (or none, on a cold start)
+    is served; movies it doesn't know yet simply have no neighbors.
+    """
+    if np is None:
+        return None
+    version = catalog_version(MOVIES_FILE)
+    if _index_cache["version"] != version and _refresh_lock.acquire(blocking=False):
+        # Single flight: a change made meanwhile is picked up by the next request
+        threading.Thread(
+            target=_refresh_in_background, args=(movies, version),
+            name="similarity-index-refresh", daemon=True
+        ).start()
+    return _index_cache["index"]
+
+def get_similar_movies(imdb_id: str, movies: List[Dict], movies_by_id: Dict[str, Dict], limit: int = 10) -> List[Dict]:
+    """Top ``limit`` "more like this" movies for the detail page"""
+    index = get_similarity_index(movies)
+    if index is None:
+        return []
+    return [movies_by_id[other] for other in index.similar(imdb_id, limit) if other in movies_by_id]
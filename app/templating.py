@@ -0,0 +1,135 @@
+"""
+Templates
+The one Jinja2 environment every router renders with. Compiled templates are
+kept in a bytecode cache on disk, so a new worker loads them instead of
+compiling every template again.
+
+Movie cards are the bulk of every grid, and a card looks the same wherever a
+movie appears with the same variant. movie_card() renders each one once and
+reuses the markup until the catalog, static assets or templates change.
+
+Pages with long result lists are streamed (stream_template): the head,
+navbar and filters go out as soon as they are rendered, at the points
+templates mark with {{ flush() }}, and the results follow in chunks.
+"""
+
+import os
+from typing import Dict, Iterator, Tuple
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, pass_context
+from markupsafe import Markup
+
+from .config import TEMPLATE_CACHE_DIR
+from .page_cache import TEMPLATES_DIR, page_cache
+from .posters import poster_background, poster_src
+from .static_assets import asset_url
+
+CARD_TEMPLATE = "partials/movie_card.html"
+CARD_VARIANTS = ("row", "grid", "search", "related")
+# Enough for every movie in every variant of a 10k catalog, with room to spare
+MAX_CARDS = 50_000
+# Results are sent once this much is rendered; small enough to keep the browser busy
+STREAM_CHUNK_BYTES = 32 * 1024
+# What {{ flush() }} emits while streaming; never part of real markup, and stripped before sending
+FLUSH_MARKER = "\x00flush\x00"
+
+def _bytecode_cache():
+    try:
+        os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+    except OSError as e:
+        print(f"⚠️ Template bytecode cache disabled: {e}")
+        return None
+    return FileSystemBytecodeCache(TEMPLATE_CACHE_DIR)
+
+env = Environment(loader=FileSystemLoader(TEMPLATES_DIR), autoescape=True, bytecode_cache=_bytecode_cache())
+templates = Jinja2Templates(env=env)
+
+class CardCache:
+    """Rendered movie cards by (imdbID, variant), dropped whenever the render version changes"""
+
+    def __init__(self, max_entries: int = MAX_CARDS):
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0}
+        self._cards: Dict[Tuple[str, str], Tuple[Dict, Markup]] = {}
+        self._version = None
+
+    def card(self, movie: Dict, variant: str, version: str) -> Markup:
+        if version != self._version:
+            self._cards = {}
+            self._version = version
+        key = (movie.get("imdbID"), variant)
+        entry = self._cards.get(key)
+        # The catalog can hold duplicates of an id; a card is only reused for the same record
+        if entry is not None and entry[0] is movie:
+            self.stats["hits"] += 1
+            return entry[1]
+        self.stats["misses"] += 1
+        markup = Markup(env.get_template(CARD_TEMPLATE).render(movie=movie, variant=variant))
+        if len(self._cards) >= self.max_entries:
+            self._cards = {}
+        self._cards[key] = (movie, markup)
+        return markup
+
+card_cache = CardCache()
+
+@pass_context
+def movie_card(context, movie: Dict, variant: str = "row") -> Markup:
+    """A movie's card markup, from the card cache"""
+    if variant not in CARD_VARIANTS:
+        raise ValueError(f"Unknown movie card variant {variant!r}")
+    request = context.get("request")
+    # One version lookup per page, however many cards it has
+    version = getattr(request.state, "render_version", None) if request is not None else None
+    if version is None:
+        version = page_cache.version()
+        if request is not None:
+            request.state.render_version = version
+    return card_cache.card(movie, variant, version)
+
+@pass_context
+def flush(context) -> str:
+    """Send everything rendered so far, when the page is being streamed"""
+    return FLUSH_MARKER if context.get("streaming") else ""
+
+def _chunks(pieces: Iterator[str]) -> Iterator[bytes]:
+    buffer, size = [], 0
+    for piece in pieces:
+        if FLUSH_MARKER in piece:
+            buffer.append(piece.replace(FLUSH_MARKER, ""))
+            yield "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+            continue
+        buffer.append(piece)
+        size += len(piece)
+        if size >= STREAM_CHUNK_BYTES:
+            yield "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+def stream_template(name: str, context: Dict, status_code: int = 200) -> StreamingResponse:
+    """Like templates.TemplateResponse, but sends the page while it renders.
+
+    Rendering runs in the threadpool, one chunk at a time, so time to first
+    byte does not grow with the number of results.
+    """
+    template = env.get_template(name)
+    context = {**context, "streaming": True}
+    return StreamingResponse(_chunks(template.generate(context)), status_code=status_code, media_type="text/html")
+
+def render_navbar_user(request: Request) -> str:
+    """The signed-in part of the navbar, spliced into cached pages"""
+    return env.get_template("partials/navbar_user.html").render(
+        request=request, username=request.session.get("username")
+    )
+
+env.globals.update(
+    poster_src=poster_src,
+    poster_background=poster_background,
+    asset_url=asset_url,
+    movie_card=movie_card,
+    flush=flush,
+)
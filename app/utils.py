@@ -1,95 +1,98 @@
-import json
 import hashlib
 import os
-from .config import MOVIES_FILE, LIKES_FILE, WATCH_LATER_FILE, USERS_FILE, COMMENTS_FILE
+from .config import LIKES_FILE, WATCH_LATER_FILE, USERS_FILE, COMMENTS_FILE
+from .catalog_store import get_catalog_store
+from .json_codec import dump_file, load_file
 
-# TMDB base URL for poster images
-TMDB_POSTER_BASE_URL = "https://image.tmdb.org/t/p/w500"
-
-def fix_poster_url(poster_url):
-    """Fix poster URLs to ensure they are complete and valid"""
-    if not poster_url or poster_url == 'N/A':
-        return '/static/no-poster.svg'
-    
-    # If it's already a full URL (like Amazon posters), return as-is
-    if poster_url.startswith('http'):
-        return poster_url
-    
-    # If it's a TMDB relative path (starts with /), prepend the base URL
-    if poster_url.startswith('/'):
-        return f"{TMDB_POSTER_BASE_URL}{poster_url}"
-    
-    # For any other case, return a fallback
-    return '/static/no-poster.svg'
+def load_movies():
+    """The catalog, with posters already resolved at ingest (see posters.py).
 
-def process_movie_posters(movies):
-    """Process a list of movies to fix their poster URLs"""
-    if isinstance(movies, dict):
-        # Single movie
-        if 'Poster' in movies:
-            movies['Poster'] = fix_poster_url(movies['Poster'])
-        return movies
-    elif isinstance(movies, list):
-        # List of movies
-        for movie in movies:
-            if 'Poster' in movie:
-                movie['Poster'] = fix_poster_url(movie['Poster'])
-        return movies
-    return movies
+    The movie dicts are shared with every other request, so treat them as read-only;
+    the list itself is a fresh copy that may be reordered.
+    """
+    return list(get_catalog_store().load())
 
-def load_movies():
-    with open(MOVIES_FILE, 'r', encoding='utf-8') as f:
-        movies = json.load(f)
-    # Fix poster URLs when loading
-    return process_movie_posters(movies)
+def get_movie(imdb_id):
+    """A single catalog movie by imdbID, or None; shared with other requests, so read-only"""
+    return get_catalog_store().get(imdb_id)
 
 def save_movies(movies):
-    with open(MOVIES_FILE, 'w', encoding='utf-8') as f:
-        json.dump(movies, f, ensure_ascii=False, indent=2)
+    """Replace the whole catalog; prefer upsert_movies/delete_movies for small changes"""
+    get_catalog_store().replace(movies)
+
+def upsert_movies(movies):
+    """Add or update movies (by imdbID) without rewriting the catalog"""
+    get_catalog_store().append(upserts=movies)
+
+def delete_movies(imdb_ids):
+    """Remove movies by imdbID without rewriting the catalog"""
+    get_catalog_store().append(deletes=imdb_ids)
 
 def load_likes():
     if not os.path.exists(LIKES_FILE):
         return {}
-    with open(LIKES_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_file(LIKES_FILE)
 
 def save_likes(likes):
-    with open(LIKES_FILE, 'w', encoding='utf-8') as f:
-        json.dump(likes, f)
+    dump_file(LIKES_FILE, likes)
 
 def load_watch_later():
     if not os.path.exists(WATCH_LATER_FILE):
         return {}
-    with open(WATCH_LATER_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_file(WATCH_LATER_FILE)
 
 def save_watch_later(watch_later):
-    with open(WATCH_LATER_FILE, 'w', encoding='utf-8') as f:
-        json.dump(watch_later, f)
+    dump_file(WATCH_LATER_FILE, watch_later)
 
 def load_users():
     if not os.path.exists(USERS_FILE):
         return {}
-    with open(USERS_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_file(USERS_FILE)
 
 def save_users(users):
-    with open(USERS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(users, f)
+    dump_file(USERS_FILE, users)
 
 def load_comments():
     if not os.path.exists(COMMENTS_FILE):
         return {}
-    with open(COMMENTS_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_file(COMMENTS_FILE)
 
 def save_comments(comments):
-    with open(COMMENTS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(comments, f)
+    dump_file(COMMENTS_FILE, comments)
 
 def hash_password(password):
     return hashlib.sha256(password.encode()).hexdigest()
 
+def format_timestamp(timestamp_str):
+    """Format timestamp to be more user-friendly"""
+    from datetime import datetime
+    try:
+        dt = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
+        now = datetime.now()
+        diff = now - dt
+        
+        if diff.days > 0:
+            if diff.days == 1:
+                return "1 day ago"
+            elif diff.days < 7:
+                return f"{diff.days} days ago"
+            elif diff.days < 30:
+                weeks = diff.days // 7
+                return f"{weeks} week{'s' if weeks > 1 else ''} ago"
+            else:
+                months = diff.days // 30
+                return f"{months} month{'s' if months > 1 else ''} ago"
+        elif diff.seconds > 3600:
+            hours = diff.seconds // 3600
+            return f"{hours} hour{'s' if hours > 1 else ''} ago"
+        elif diff.seconds > 60:
+            minutes = diff.seconds // 60
+            return f"{minutes} minute{'s' if minutes > 1 else ''} ago"
+        else:
+            return "Just now"
+    except:
+        return timestamp_str
+
 def get_all_unique_movies(movies):
     unique_movies = {}
     for movie in movies:
@@ -1,5 +1,4 @@
 import pandas as pd
-import re
 import requests
 import json
 import time
@@ -18,29 +17,24 @@ existing_titles = set(movie['Title'].lower() for movie in existing_movies)
 print(f"Existing movies in JSON: {len(existing_movies)}")
 
 # Common movie title patterns in reviews
-def extract_movie_titles_from_reviews(reviews_sample):
+def extract_movie_titles_from_reviews(reviews_sample: pd.Series) -> pd.Series:
     """Extract potential movie titles from reviews"""
-    potential_titles = []
+    # Look for patterns like "Movie Name" or 'Movie Name', across the whole column at once
+    quoted_titles = reviews_sample.str.extractall(r'"([^"]+)"')[0]
+    single_quoted_titles = reviews_sample.str.extractall(r"'([^']+)'")[0]
     
-    # Sample reviews for analysis
-    for review in reviews_sample:
-        # Look for patterns like "Movie Name" or 'Movie Name'
-        quoted_titles = re.findall(r'"([^"]+)"', review)
-        single_quoted_titles = re.findall(r"'([^']+)'", review)
-        
-        potential_titles.extend(quoted_titles)
-        potential_titles.extend(single_quoted_titles)
-    
-    return potential_titles
+    # Keep review order (double-quoted matches before single-quoted ones in each review)
+    potential_titles = pd.concat([quoted_titles, single_quoted_titles], keys=[0, 1], names=['pattern'])
+    return potential_titles.sort_index(level=[1, 0, 2]).reset_index(drop=True)
 
 # Analyze a sample of reviews
 print("\nAnalyzing sample reviews for movie titles...")
-sample_reviews = df['review'].head(1000).tolist()
+sample_reviews = df['review'].head(1000)
 potential_titles = extract_movie_titles_from_reviews(sample_reviews)
 
 # Filter out common non-movie phrases
 common_words = ['the', 'and', 'or', 'but', 'if', 'then', 'so', 'this', 'that', 'these', 'those', 'a', 'an']
-filtered_titles = [title for title in potential_titles if len(title) > 2 and title.lower() not in common_words]
+filtered_titles = potential_titles[(potential_titles.str.len() > 2) & ~potential_titles.str.lower().isin(common_words)].tolist()
 
 # Count occurrences
 title_counts = Counter(filtered_titles)
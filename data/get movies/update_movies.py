@@ -1,9 +1,12 @@
-import requests
 import json
-import time
 import csv
+import sys
+from pathlib import Path
 import pandas as pd
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "scripts" / "data_import"))
+from omdb_client import enrich_titles
+
 # API key for OMDB
 api_key = '984b4107'
 
@@ -38,23 +41,16 @@ if missing_movies:
     for movie in missing_movies:
         print(f"  - {movie}")
     
-    # Fetch missing movies from OMDB API
+    # Fetch missing movies from OMDB API, concurrently and in input order
     new_movies = []
-    for i, title in enumerate(missing_movies):
-        print(f"Fetching {i+1}/{len(missing_movies)}: {title}")
-        try:
-            resp = requests.get(f"http://www.omdbapi.com/?t={title}&apikey={api_key}")
-            data = resp.json()
-            if data.get("Response") == "True":
-                new_movies.append(data)
-                print(f"  ✓ Added: {data['Title']}")
-            else:
-                print(f"  ✗ Failed: {data.get('Error', 'Unknown error')}")
-        except Exception as e:
-            print(f"  ✗ Error fetching {title}: {e}")
-        
-        # Rate limiting
-        time.sleep(0.2)
+    results = enrich_titles([(title, None) for title in missing_movies], api_key=api_key)
+    for i, (title, data) in enumerate(zip(missing_movies, results)):
+        print(f"Fetched {i+1}/{len(missing_movies)}: {title}")
+        if data:
+            new_movies.append(data)
+            print(f"  ✓ Added: {data['Title']}")
+        else:
+            print(f"  ✗ Failed: not found on OMDB")
     
     # Add new movies to existing ones
     all_movies = existing_movies + new_movies
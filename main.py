@@ -1,17 +1,25 @@
+import logging
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 
-from app.config import SECRET_KEY
+from app.config import SECRET_KEY, LOG_LEVEL
+from app.json_codec import ORJSONResponse
+from app.static_assets import AssetFiles, ensure_static_build
 from app.routes_movies import router as movies_router
 from app.routes_watch_later import router as watch_later_router
 from app.routes_comments import router as comments_router
 from app.routes_auth import router as auth_router
 from app.routes_ai_suggestions import router as ai_suggestions_router
+from app.routes_debug import router as debug_router
+from app.routes_posters import router as posters_router
+from app.routes_api import router as api_router
+
+logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
 
-app = FastAPI()
+# API responses are encoded with orjson when it is installed
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Add CORS middleware to allow frontend-backend communication
 app.add_middleware(
@@ -24,14 +32,18 @@ app.add_middleware(
 
 app.add_middleware(SessionMiddleware, secret_key=SECRET_KEY)
 
-templates = Jinja2Templates(directory="templates")
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Hashed copies of changed assets are written before the first page links them
+ensure_static_build()
+app.mount("/static", AssetFiles(directory="static"), name="static")
 
 app.include_router(movies_router)
 app.include_router(watch_later_router)
 app.include_router(comments_router)
 app.include_router(auth_router)
 app.include_router(ai_suggestions_router)
+app.include_router(debug_router)
+app.include_router(posters_router)
+app.include_router(api_router)
 
 # Try to import Google OAuth router, make it optional
 try:
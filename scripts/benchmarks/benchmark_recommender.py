@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Recommender Benchmark Suite
+Times analyze_user_preferences, calculate_movie_match_score and
+get_movie_recommendations against synthetic OMDB-shaped catalogs and a fixed
+prompt corpus, and writes throughput and latency percentiles as JSON so runs
+can be compared for regressions.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from app.routes_ai_suggestions import (
+    analyze_user_preferences,
+    calculate_movie_match_score,
+    get_movie_recommendations
+)
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+DEFAULT_SEED = 42
+# Per-call match scoring is independent of catalog size, so it is timed on an
+# evenly spaced sample instead of every movie of the largest catalogs
+MATCH_SCORE_SAMPLE = 50_000
+# Microsecond-scale calls are timed in chunks and reported per call, which keeps
+# timer resolution and scheduler noise out of the percentiles
+CHUNK_CALLS = 500
+DEFAULT_TOLERANCE = 0.20
+
+PROMPT_CORPUS = [
+    "I want something funny and light-hearted",
+    "Suggest scary movies from the 80s",
+    "I need a good action movie with great ratings",
+    "What's a good romantic comedy?",
+    "I'm looking for dark, gritty crime dramas",
+    "Something like Inception but more recent",
+    "A classic sci-fi film about space",
+    "Family movies the kids will love, animated if possible",
+    "Mind bending thriller with a twist ending",
+    "Uplifting true story documentary",
+    "90s action movies with lots of fights",
+    "Recent horror that is actually creepy",
+    "Feel good romance for date night",
+    "Mature, intense war drama",
+    "Fantasy adventure with dragons and magic",
+    "A detective mystery from the golden age",
+    "Something easy and relaxing to watch tonight",
+    "Emotional character drama that is touching",
+    "Superhero movies from the 2010s",
+    "Anything good",
+]
+
+# Value pools for the synthetic catalog, modelled on OMDB responses
+GENRES = [
+    "Action", "Adventure", "Animation", "Biography", "Comedy", "Crime", "Documentary",
+    "Drama", "Family", "Fantasy", "History", "Horror", "Music", "Mystery", "Romance",
+    "Sci-Fi", "Sport", "Thriller", "War", "Western"
+]
+RATED = ["G", "PG", "PG-13", "R", "NC-17", "Not Rated", "Unrated", "N/A"]
+LANGUAGES = ["English", "English, Spanish", "French", "Japanese", "Korean", "German", "Hindi"]
+COUNTRIES = ["United States", "United Kingdom", "France", "Japan", "South Korea", "Germany", "India"]
+TITLE_WORDS = [
+    "Last", "Night", "City", "Dream", "Shadow", "Return", "Secret", "Road", "Fire", "Silent",
+    "Star", "Blood", "Heart", "Ghost", "King", "River", "Edge", "Storm", "Legacy", "Empire"
+]
+PLOT_WORDS = [
+    "a", "young", "detective", "family", "journey", "small", "town", "war", "love", "team",
+    "must", "stop", "discover", "hidden", "past", "friends", "escape", "city", "mission", "future",
+    "inspiring", "uplifting", "heartwarming", "dark", "crime", "murder", "death", "twist", "mystery", "complex"
+]
+FIRST_NAMES = ["James", "Maria", "Chen", "Aisha", "Lucas", "Emma", "Kwame", "Sofia", "Ivan", "Yuki"]
+LAST_NAMES = ["Smith", "Garcia", "Wang", "Mensah", "Müller", "Rossi", "Kim", "Novak", "Silva", "Brown"]
+POOL_SIZE = 4096
+
+def generate_catalog(size: int, seed: int = DEFAULT_SEED) -> List[Dict]:
+    """Deterministic catalog of ``size`` OMDB-shaped movie dicts.
+
+    Plots and people are drawn from shared pools so a million movies fit in
+    memory, and a few percent of fields are "N/A" like real OMDB data.
+    """
+    rng = random.Random(seed)
+    people = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" for _ in range(POOL_SIZE)]
+    plots = [
+        " ".join(rng.choice(PLOT_WORDS) for _ in range(rng.randint(12, 30))).capitalize() + "."
+        for _ in range(POOL_SIZE)
+    ]
+    casts = [", ".join(rng.sample(people, 3)) for _ in range(POOL_SIZE)]
+    genres = [", ".join(sorted(rng.sample(GENRES, rng.randint(1, 3)))) for _ in range(POOL_SIZE)]
+    years = {year: str(year) for year in range(1920, 2025)}
+
+    movies = []
+    for i in range(size):
+        year = rng.randint(1920, 2024)
+        missing = rng.random() < 0.03
+        rating = "N/A" if missing else f"{rng.triangular(1.5, 9.5, 6.8):.1f}"
+        votes = "N/A" if missing else f"{int(rng.paretovariate(1.2) * 1000):,}"
+        movies.append({
+            "Title": f"{rng.choice(TITLE_WORDS)} {rng.choice(TITLE_WORDS)} {i}",
+            "Year": years[year],
+            "Rated": rng.choice(RATED),
+            "Released": f"{rng.randint(1, 28):02d} Jan {year}",
+            "Runtime": f"{rng.randint(75, 180)} min",
+            "Genre": rng.choice(genres),
+            "Director": rng.choice(people),
+            "Writer": rng.choice(people),
+            "Actors": rng.choice(casts),
+            "Plot": rng.choice(plots),
+            "Language": rng.choice(LANGUAGES),
+            "Country": rng.choice(COUNTRIES),
+            "Awards": "N/A",
+            "Poster": f"https://m.media-amazon.com/images/M/synthetic{i}.jpg",
+            "Metascore": "N/A" if missing else str(rng.randint(20, 100)),
+            "imdbRating": rating,
+            "imdbVotes": votes,
+            "imdbID": f"tt{9000000 + i:08d}",
+            "Type": "movie",
+        })
+    return movies
+
+def summarize(name: str, catalog_size, samples: List[float], elapsed: float, units: int, unit: str) -> Dict:
+    """Per-call latency percentiles in milliseconds plus throughput for one benchmark"""
+    ordered = sorted(samples)
+    if len(ordered) > 1:
+        cuts = statistics.quantiles(ordered, n=100, method="inclusive")
+        p50, p90, p99 = cuts[49], cuts[89], cuts[98]
+    else:
+        p50 = p90 = p99 = ordered[0]
+    return {
+        "benchmark": name,
+        "catalog_size": catalog_size,
+        "calls": units,
+        "throughput": round(units / elapsed, 2) if elapsed else 0.0,
+        "throughput_unit": f"{unit}/s",
+        "mean_ms": round(elapsed / units * 1000, 4),
+        "p50_ms": round(p50 * 1000, 4),
+        "p90_ms": round(p90 * 1000, 4),
+        "p99_ms": round(p99 * 1000, 4),
+        "max_ms": round(ordered[-1] * 1000, 4),
+    }
+
+def bench_analyze(prompts: List[str], repeat: int) -> Dict:
+    samples = []
+    for _ in range(repeat):
+        for prompt in prompts:
+            start = time.perf_counter()
+            for _ in range(CHUNK_CALLS):
+                analyze_user_preferences(prompt, [])
+            samples.append((time.perf_counter() - start) / CHUNK_CALLS)
+    calls = len(samples) * CHUNK_CALLS
+    return summarize("analyze_user_preferences", None, samples, sum(samples) * CHUNK_CALLS, calls, "prompts")
+
+def bench_match_score(movies: List[Dict], preferences: List[Dict]) -> Dict:
+    step = max(1, len(movies) // MATCH_SCORE_SAMPLE)
+    sample = movies[::step]
+    chunks = [sample[i:i + CHUNK_CALLS] for i in range(0, len(sample), CHUNK_CALLS)]
+    samples = []
+    elapsed = 0.0
+    for prefs in preferences:
+        for chunk in chunks:
+            start = time.perf_counter()
+            for movie in chunk:
+                calculate_movie_match_score(movie, prefs)
+            took = time.perf_counter() - start
+            elapsed += took
+            samples.append(took / len(chunk))
+    calls = len(sample) * len(preferences)
+    return summarize("calculate_movie_match_score", len(movies), samples, elapsed, calls, "movies")
+
+def bench_recommendations(movies: List[Dict], preferences: List[Dict], repeat: int) -> Dict:
+    # One untimed call warms caches and lazy imports
+    get_movie_recommendations(preferences[0], movies, limit=5)
+    samples = []
+    for _ in range(repeat):
+        for prefs in preferences:
+            start = time.perf_counter()
+            get_movie_recommendations(prefs, movies, limit=5)
+            samples.append(time.perf_counter() - start)
+    return summarize("get_movie_recommendations", len(movies), samples, sum(samples), len(samples), "requests")
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=Path(__file__).resolve().parent, timeout=10
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+def load_baseline(baseline_path: str) -> Dict:
+    """Earlier results keyed by (benchmark, catalog size)"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        return {
+            (r["benchmark"], r["catalog_size"]): r for r in json.load(f).get("results", [])
+        }
+
+def compare_with_baseline(results: List[Dict], baseline: Dict, tolerance: float) -> List[str]:
+    """Benchmarks whose p50 got slower than the baseline by more than ``tolerance``"""
+    regressions = []
+    for result in results:
+        old = baseline.get((result["benchmark"], result["catalog_size"]))
+        if not old or not old.get("p50_ms"):
+            continue
+        change = result["p50_ms"] / old["p50_ms"] - 1
+        label = f"{result['benchmark']} @ {result['catalog_size'] or '-'}"
+        print(f"   {label:<45} p50 {old['p50_ms']:>10.3f}ms -> {result['p50_ms']:>10.3f}ms ({change:+.1%})")
+        if change > tolerance:
+            regressions.append(label)
+    return regressions
+
+def print_result(result: Dict):
+    size = f"{result['catalog_size']:,}" if result["catalog_size"] else "-"
+    print(
+        f"   {result['benchmark']:<28} {size:>10}  "
+        f"{result['throughput']:>14,.1f} {result['throughput_unit']:<12} "
+        f"p50 {result['p50_ms']:.3f}ms  p90 {result['p90_ms']:.3f}ms  p99 {result['p99_ms']:.3f}ms"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the AI recommender on synthetic catalogs")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="catalog sizes to benchmark")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="seed for the synthetic catalog")
+    parser.add_argument("--repeat", type=int, default=1, help="passes over the prompt corpus per benchmark")
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write the JSON results")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed p50 slowdown before failing")
+    args = parser.parse_args()
+
+    print("🎬 Recommender Benchmark")
+    print("=" * 50)
+
+    # Read the baseline before anything is written: it may be the same file as --output
+    baseline = None
+    if args.baseline:
+        try:
+            baseline = load_baseline(args.baseline)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"❌ Could not read baseline {args.baseline}: {e}")
+            sys.exit(2)
+
+    preferences = [analyze_user_preferences(prompt, []) for prompt in PROMPT_CORPUS]
+    results = [bench_analyze(PROMPT_CORPUS, args.repeat)]
+    print_result(results[0])
+
+    for size in args.sizes:
+        start = time.perf_counter()
+        movies = generate_catalog(size, args.seed)
+        print(f"📚 Generated {size:,} synthetic movies in {time.perf_counter() - start:.2f}s")
+        for result in (
+            bench_match_score(movies, preferences),
+            bench_recommendations(movies, preferences, args.repeat),
+        ):
+            results.append(result)
+            print_result(result)
+        # Release the catalog before generating the next, larger one
+        del movies
+        gc.collect()
+
+    report = {
+        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "git_revision": git_revision(),
+        },
+        "config": {
+            "sizes": args.sizes,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "prompts": len(PROMPT_CORPUS),
+            "match_score_sample": MATCH_SCORE_SAMPLE,
+            "chunk_calls": CHUNK_CALLS,
+        },
+        "results": results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Saved results to {args.output}")
+
+    if baseline is not None:
+        print(f"📊 Comparing with {args.baseline}")
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print("✅ No regressions")
+
+if __name__ == "__main__":
+    main()
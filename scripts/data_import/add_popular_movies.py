@@ -1,13 +1,18 @@
 import json
 import os
+import sys
 import requests
+from pathlib import Path
 from typing import List, Dict, Set
 
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+from app.catalog_store import CatalogStore
+
 def load_existing_movies(file_path: str) -> List[Dict]:
-    """Load existing movies from the JSON file"""
+    """Load existing movies from the JSON file (plus changes logged since it was written)"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return CatalogStore(file_path).load()
     except FileNotFoundError:
         print(f"File not found: {file_path}")
         return []
@@ -269,27 +274,12 @@ def main():
     if new_movies:
         print(f"\n🎬 Adding {len(new_movies)} new movies...")
         
-        # Add new movies to existing list
-        updated_movies = existing_movies + new_movies
-        
-        # Create backup
-        backup_file = existing_movies_file.replace('.json', '_backup.json')
-        print(f"💾 Creating backup: {backup_file}")
-        
-        try:
-            with open(backup_file, 'w', encoding='utf-8') as f:
-                json.dump(existing_movies, f, ensure_ascii=False, indent=2)
-            print("✅ Backup created successfully")
-        except Exception as e:
-            print(f"❌ Error creating backup: {e}")
-            return
-        
-        # Save updated movies
+        # Save the new movies as catalog changes; the existing catalog file is not rewritten,
+        # so a failed save leaves it untouched and needs no backup
         try:
-            with open(existing_movies_file, 'w', encoding='utf-8') as f:
-                json.dump(updated_movies, f, ensure_ascii=False, indent=2)
+            CatalogStore(existing_movies_file).append(upserts=new_movies)
             print(f"✅ Successfully updated movie database!")
-            print(f"📊 Total movies: {len(updated_movies)} (added {len(new_movies)})")
+            print(f"📊 Total movies: {len(existing_movies) + len(new_movies)} (added {len(new_movies)})")
             
             # Show added movies
             print("\n🎬 Added movies:")
@@ -298,15 +288,6 @@ def main():
                 
         except Exception as e:
             print(f"❌ Error saving updated movies: {e}")
-            print("🔄 Restoring from backup...")
-            try:
-                with open(backup_file, 'r', encoding='utf-8') as f:
-                    backup_data = json.load(f)
-                with open(existing_movies_file, 'w', encoding='utf-8') as f:
-                    json.dump(backup_data, f, ensure_ascii=False, indent=2)
-                print("✅ Restored from backup")
-            except Exception as restore_error:
-                print(f"❌ Error restoring backup: {restore_error}")
     else:
         print("✅ No new movies to add - all movies already exist!")
         
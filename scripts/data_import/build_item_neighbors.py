@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Item Neighbor Builder
+Computes item-item collaborative filtering neighbors from watch-later lists
+and writes the compact neighbor table loaded by the web app.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from app.collaborative import (
+    DEFAULT_TOP_N, MAX_ITEMS_PER_USER,
+    build_user_item_lists, compute_item_neighbors, save_item_neighbors
+)
+from app.config import ITEM_NEIGHBORS_FILE
+from app.utils import load_likes, load_watch_later
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the 'people who saved this also saved' neighbor table")
+    parser.add_argument("--top-n", type=int, default=DEFAULT_TOP_N, help="neighbors kept per movie")
+    parser.add_argument("--min-support", type=int, default=1, help="minimum number of shared savers")
+    parser.add_argument("--max-items-per-user", type=int, default=MAX_ITEMS_PER_USER)
+    parser.add_argument("--output", default=ITEM_NEIGHBORS_FILE)
+    args = parser.parse_args()
+
+    print("🎬 Item Neighbor Builder")
+    print("=" * 50)
+
+    start = time.perf_counter()
+    user_items = build_user_item_lists(load_watch_later(), args.max_items_per_user)
+    likes = load_likes()
+    interactions = sum(len(items) for items in user_items.values())
+    print(f"📊 {len(user_items):,} users with {interactions:,} saved titles")
+
+    neighbors = compute_item_neighbors(user_items, likes, top_n=args.top_n, min_support=args.min_support)
+    elapsed = time.perf_counter() - start
+    print(f"✅ Computed neighbors for {len(neighbors):,} movies in {elapsed:.2f}s")
+
+    save_item_neighbors(neighbors, {
+        "users": len(user_items),
+        "interactions": interactions,
+        "movies": len(neighbors),
+        "top_n": args.top_n,
+        "min_support": args.min_support
+    }, args.output)
+    print(f"💾 Saved neighbor table to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Poster Placeholder Builder
+Makes a tiny blurred preview (a data: URI of a few hundred bytes at most) of
+every cached poster and saves it with the movie as ``PosterPlaceholder``, so
+grids paint each card's colours at once while the real image lazy-loads.
+
+Incremental: a movie is only redone when its cached poster changed since its
+placeholder was made. The images are decoded on every core.
+
+    python scripts/data_import/build_poster_placeholders.py
+    python scripts/data_import/build_poster_placeholders.py --fetch --workers 4
+
+Needs Pillow (pip install Pillow).
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+from app.catalog_store import CatalogStore
+from app.config import MOVIES_FILE
+from app.poster_cache import Image, placeholder_data_uri, poster_cache
+from app.posters import poster_origin_url
+
+def make_placeholder(path: str):
+    """Worker: the placeholder for one cached poster, or None if Pillow cannot read it"""
+    try:
+        return placeholder_data_uri(path)
+    except (OSError, ValueError):
+        return None
+
+async def fetch_missing(urls):
+    """Pull posters that are not cached yet through the poster cache (its own fetch limits apply)"""
+    await asyncio.gather(*(poster_cache.get(url) for url in urls))
+
+def main():
+    parser = argparse.ArgumentParser(description="Build inline placeholders for cached posters")
+    parser.add_argument("--catalog", default=MOVIES_FILE, help="catalog JSON to update")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes decoding images")
+    parser.add_argument("--fetch", action="store_true", help="fetch posters that are not cached yet first")
+    parser.add_argument("--force", action="store_true", help="redo placeholders that are already up to date")
+    args = parser.parse_args()
+
+    if Image is None:
+        print("❌ Placeholders need Pillow: pip install Pillow")
+        sys.exit(1)
+
+    store = CatalogStore(args.catalog)
+    movies = [(movie, poster_origin_url(movie)) for movie in store.load()]
+    movies = [(movie, url) for movie, url in movies if url]
+    print(f"🎬 {len(movies):,} movies with posters")
+
+    if args.fetch:
+        missing = sorted({url for _, url in movies if poster_cache.cached_blob(url) is None})
+        if missing:
+            print(f"🌐 Fetching {len(missing):,} posters that are not cached yet...")
+            asyncio.run(fetch_missing(missing))
+
+    # Work per image, not per movie: movies sharing a poster share its placeholder
+    pending = {}
+    skipped = uncached = 0
+    for movie, url in movies:
+        blob = poster_cache.cached_blob(url)
+        if blob is None:
+            uncached += 1
+            continue
+        sha = os.path.basename(blob)
+        if not args.force and movie.get("PosterPlaceholderKey") == sha and movie.get("PosterPlaceholder"):
+            skipped += 1
+            continue
+        pending.setdefault(sha, (blob, []))[1].append(movie)
+    print(f"🔍 {skipped:,} up to date, {uncached:,} not cached yet, {len(pending):,} posters to process")
+    if not pending:
+        print("✅ Nothing to do")
+        return
+
+    started = time.perf_counter()
+    shas = list(pending)
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        placeholders = executor.map(make_placeholder, [pending[sha][0] for sha in shas], chunksize=32)
+        changed, failed, total_bytes = [], 0, 0
+        for sha, placeholder in zip(shas, placeholders):
+            if placeholder is None:
+                failed += 1
+                continue
+            total_bytes += len(placeholder)
+            for movie in pending[sha][1]:
+                changed.append({**movie, "PosterPlaceholder": placeholder, "PosterPlaceholderKey": sha})
+    elapsed = time.perf_counter() - started
+    done = len(shas) - failed
+    print(f"🖼️ {done:,} placeholders in {elapsed:.1f}s with {args.workers} workers "
+          f"(avg {total_bytes // max(done, 1):,} chars, {failed:,} unreadable)")
+
+    if changed:
+        store.append(upserts=changed)
+    print(f"💾 Saved placeholders for {len(changed):,} movies")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Similarity Index Builder
+Builds the "more like this" LSH index ahead of time, so the web app loads it
+instead of building it in the background after a deploy or a catalog import.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+from app.config import SIMILARITY_INDEX_FILE
+from app.similarity import np, refresh_similarity_index
+from app.utils import load_movies
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the 'more like this' similarity index")
+    parser.add_argument("--output", default=SIMILARITY_INDEX_FILE)
+    args = parser.parse_args()
+
+    print("🎬 Similarity Index Builder")
+    print("=" * 50)
+
+    if np is None:
+        print("❌ numpy is required to build the similarity index")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    movies = load_movies()
+    index = refresh_similarity_index(movies, args.output)
+    elapsed = time.perf_counter() - start
+    print(f"✅ Index covers {len(index.ids):,} movies ({elapsed:.2f}s, reused if unchanged)")
+    print(f"💾 Saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
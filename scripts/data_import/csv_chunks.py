@@ -0,0 +1,107 @@
+"""
+Parallel CSV Chunking
+Splits a large CSV into byte ranges that start and end on record boundaries,
+converts the ranges across a process pool and hands the results back in file
+order.
+"""
+
+import csv
+import io
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterator, List, Tuple
+
+SCAN_BLOCK_BYTES = 4 << 20
+DEFAULT_CHUNK_BYTES = 16 << 20
+
+def read_header(path: str) -> Tuple[List[str], int]:
+    """Column names of the CSV and the byte offset where its first record starts"""
+    with open(path, 'rb') as f:
+        line = f.readline()
+        # A header with quoted newlines is not worth supporting, column names are plain
+        fieldnames = next(csv.reader([line.decode('utf-8-sig')]))
+        return fieldnames, f.tell()
+
+def find_record_boundaries(path: str, start: int, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> List[int]:
+    """Offsets roughly ``chunk_bytes`` apart where a new CSV record begins.
+
+    A newline ends a record only outside a quoted field, i.e. when the number
+    of quote characters seen so far is even (an escaped ``""`` counts twice,
+    so the parity still holds). Quotes are counted a block at a time with
+    ``bytes.count``, and only the blocks containing a target offset are
+    searched in detail.
+    """
+    size = os.path.getsize(path)
+    boundaries = [start]
+    target = start + chunk_bytes
+    quotes_before = 0  # quote parity at the start of the current block
+    block_start = start
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while target < size:
+            block = f.read(SCAN_BLOCK_BYTES)
+            if not block:
+                break
+            block_end = block_start + len(block)
+            while target < block_end:
+                pos = block.find(b'\n', target - block_start)
+                while pos != -1 and (quotes_before + block.count(b'"', 0, pos)) % 2:
+                    pos = block.find(b'\n', pos + 1)
+                if pos == -1:
+                    # The record continues into the next block, look again there
+                    target = block_end
+                    break
+                boundary = block_start + pos + 1
+                if boundary < size:
+                    boundaries.append(boundary)
+                target = boundary + chunk_bytes
+            quotes_before += block.count(b'"')
+            block_start = block_end
+    boundaries.append(size)
+    return boundaries
+
+def read_chunk_rows(path: str, start: int, end: int, fieldnames: List[str]) -> Iterator[dict]:
+    """Parse the records in ``[start, end)`` as dicts keyed by ``fieldnames``"""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    # Boundaries sit right after a newline byte, so they never split a UTF-8 sequence
+    return csv.DictReader(io.StringIO(data.decode('utf-8'), newline=''), fieldnames=fieldnames)
+
+def iter_parallel_chunks(
+    func: Callable,
+    path: str,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    workers: int = None,
+    max_pending: int = None,
+    start: int = None
+) -> Iterator:
+    """Run ``func(path, start, end, fieldnames)`` on every chunk, yielding results in file order.
+
+    ``start`` resumes part-way through the file; it must be a record boundary.
+
+    At most ``max_pending`` chunks are in flight or waiting to be consumed, so
+    memory stays bounded even when the consumer is slower than the pool.
+    """
+    fieldnames, header_end = read_header(path)
+    if start is None:
+        start = header_end
+    boundaries = find_record_boundaries(path, start, chunk_bytes)
+    ranges = list(zip(boundaries[:-1], boundaries[1:]))
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 2
+
+    if workers == 1:
+        for chunk_start, chunk_end in ranges:
+            yield func(path, chunk_start, chunk_end, fieldnames)
+        return
+
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        for chunk_start, chunk_end in ranges:
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+            pending.append(pool.submit(func, path, chunk_start, chunk_end, fieldnames))
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,269 @@
+"""
+Fuzzy Duplicate Detection
+Blocks candidate movies by release year (plus or minus one) and compares
+titles by character-trigram similarity, so near-duplicates such as
+alternate punctuation, spelling or subtitles are caught during merges, not
+only exact title/year matches. Digits standing in for letters ("Se7en",
+"S1m0ne") are also tried as the letters they look like, and records without
+a year are compared against every year.
+"""
+
+import csv
+import itertools
+import math
+import re
+import sys
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_THRESHOLD = 0.85         # Dice similarity at or above which titles are merged
+DEFAULT_REVIEW_THRESHOLD = 0.7   # ...and at or above which they are reported for review
+DEFAULT_YEAR_WINDOW = 1
+
+ARTICLE_RE = re.compile(r'^(the|a|an)\s+')
+PUNCTUATION_RE = re.compile(r'[^\w\s]')
+SPACES_RE = re.compile(r'\s+')
+YEAR_RE = re.compile(r'\d{4}')
+# Numbers and roman numerals tell sequels apart ("Saw II" vs "Saw III")
+SEQUEL_TOKEN_RE = re.compile(r'^(\d+|[ivxlc]+)$')
+# A digit between two letters is a letter in disguise ("se7en"), unlike "9to5" or "3d"
+LOOKALIKE_DIGIT_RE = re.compile(r'(?<=[a-z])\d(?=[a-z])')
+LOOKALIKE_LETTERS = {
+    '0': 'o', '1': 'il', '2': 'z', '3': 'e', '4': 'a',
+    '5': 's', '6': 'gb', '7': 'tv', '8': 'b', '9': 'g'
+}
+MAX_LOOKALIKE_VARIANTS = 16
+
+def normalize_title(title: str) -> str:
+    """Lower-case, accent-free title without leading article or punctuation"""
+    if not title:
+        return ""
+    title = unicodedata.normalize('NFKD', str(title)).encode('ascii', 'ignore').decode('ascii')
+    title = title.lower().strip().replace('&', ' and ')
+    title = ARTICLE_RE.sub('', title)
+    title = PUNCTUATION_RE.sub('', title)
+    return SPACES_RE.sub(' ', title).strip()
+
+def parse_year(year) -> Optional[int]:
+    """First four-digit year in values like '1995', '2010–2015' or '2019-04-26'"""
+    match = YEAR_RE.search(str(year or ''))
+    return int(match.group(0)) if match else None
+
+def lookalike_variants(normalized: str) -> List[str]:
+    """Spellings of a normalized title with disguised digits read as letters, if it has any"""
+    digits = list(LOOKALIKE_DIGIT_RE.finditer(normalized))
+    if not digits:
+        return []
+    choices = [LOOKALIKE_LETTERS[match.group(0)] for match in digits]
+    variants = []
+    for letters in itertools.islice(itertools.product(*choices), MAX_LOOKALIKE_VARIANTS):
+        chars = list(normalized)
+        for match, letter in zip(digits, letters):
+            chars[match.start()] = letter
+        variants.append("".join(chars))
+    return variants
+
+def trigrams(normalized: str) -> set:
+    """Distinct padded character trigrams, interned so the index shares one copy of each"""
+    padded = f"  {normalized} "
+    return {sys.intern(padded[i:i + 3]) for i in range(len(padded) - 2)}
+
+def sequel_tokens(normalized: str) -> frozenset:
+    return frozenset(token for token in normalized.split() if SEQUEL_TOKEN_RE.match(token))
+
+class FuzzyDedupIndex:
+    """Incremental duplicate index over ``(title, year)`` records.
+
+    Exact normalized matches are a dict lookup. Otherwise it uses prefix
+    filtering: every title's trigrams are ordered rarest-first by a frequency
+    table fixed up front (``fit``). Two titles that are similar enough must
+    share a trigram within both of their prefixes. Only those prefixes are
+    indexed and probed, per neighbouring year, so a lookup touches a few
+    short posting lists and a merge stays near-linear in the number of rows.
+    Records without a year are probed against every year block (and every
+    record is probed against the no-year block).
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        review_threshold: float = DEFAULT_REVIEW_THRESHOLD,
+        year_window: int = DEFAULT_YEAR_WINDOW
+    ):
+        self.threshold = threshold
+        self.review_threshold = min(review_threshold, threshold)
+        self.year_window = year_window
+        self.frequency: Dict[str, int] = {}
+        self.titles: List[str] = []
+        self.years: List[Optional[int]] = []
+        self.grams: List[Tuple[str, ...]] = []
+        self.exact: Dict[Tuple[str, Optional[int]], int] = {}
+        self.postings: Dict[Tuple[Optional[int], str], List[int]] = {}
+        # Every year block holding records, in the order they appeared
+        self.block_years: Dict[Optional[int], None] = {}
+        self.matches: List[Dict] = []
+
+    def __len__(self):
+        return len(self.titles)
+
+    def fit(self, titles: Iterable[str]):
+        """Fix the trigram order from a representative sample, normally the existing catalog.
+
+        Must run before anything is added: the prefix guarantee only holds if
+        every record is ordered the same way.
+        """
+        if self.titles:
+            raise ValueError("fit() must be called before records are added")
+        frequency = Counter()
+        for title in titles:
+            frequency.update(trigrams(normalize_title(title)))
+        self.frequency = dict(frequency)
+
+    def _ordered_grams(self, normalized: str) -> Tuple[str, ...]:
+        grams = sorted(trigrams(normalized))
+        frequency = self.frequency
+        for gram in grams:
+            if gram not in frequency:
+                # Unseen trigrams rank as rarest, which is what fit() implied for them
+                frequency[gram] = 0
+        grams.sort(key=frequency.__getitem__)
+        return tuple(grams)
+
+    def _prepare(self, title: str, year) -> Tuple[str, Optional[int], Tuple[str, ...]]:
+        """Normalized title, parsed year and trigrams in the index's fixed order"""
+        normalized = normalize_title(title)
+        return normalized, parse_year(year), self._ordered_grams(normalized)
+
+    def _prefix_length(self, size: int) -> int:
+        # Dice >= t needs at least ceil(t * size / (2 - t)) shared trigrams, so the
+        # first size - that + 1 trigrams must contain one of them
+        t = self.review_threshold
+        return size - max(1, math.ceil(t * size / (2 - t) - 1e-9)) + 1
+
+    def _add(self, title: str, prepared) -> int:
+        normalized, year, grams = prepared
+        record_id = len(self.titles)
+        self.titles.append(title)
+        self.years.append(year)
+        self.grams.append(grams)
+        self.exact.setdefault((normalized, year), record_id)
+        self.block_years.setdefault(year)
+        for gram in grams[:self._prefix_length(len(grams))]:
+            self.postings.setdefault((year, gram), []).append(record_id)
+        return record_id
+
+    def add(self, title: str, year=None) -> int:
+        """Index a record unconditionally, returning its id"""
+        return self._add(title, self._prepare(title, year))
+
+    def _blocks(self, year: Optional[int]) -> List[Optional[int]]:
+        if year is None:
+            # Nothing to block on: any year could be the right one
+            return list(self.block_years)
+        blocks = list(range(year - self.year_window, year + self.year_window + 1))
+        if None in self.block_years:
+            blocks.append(None)
+        return blocks
+
+    def _best_match(self, prepared) -> Tuple[Optional[int], float]:
+        normalized, year, grams = prepared
+        blocks = self._blocks(year)
+        best_id, best_score = self._search(normalized, grams, blocks)
+        if best_score < 1.0:
+            for variant in lookalike_variants(normalized):
+                record_id, score = self._search(variant, self._ordered_grams(variant), blocks)
+                if score > best_score:
+                    best_id, best_score = record_id, score
+                if best_score == 1.0:
+                    break
+        return best_id, best_score
+
+    def _search(self, normalized: str, grams: Tuple[str, ...], blocks) -> Tuple[Optional[int], float]:
+        for block in blocks:
+            record_id = self.exact.get((normalized, block))
+            if record_id is not None:
+                return record_id, 1.0
+        if not grams:
+            return None, 0.0
+
+        size = len(grams)
+        gram_set = set(grams)
+        t = self.review_threshold
+        # Dice >= t is impossible when one title has far more trigrams than the other
+        min_size = size * t / (2 - t)
+        max_size = size * (2 - t) / t
+        best_id, best_score = None, 0.0
+        checked = set()
+        postings = self.postings
+        all_grams = self.grams
+        for gram in grams[:self._prefix_length(size)]:
+            for block in blocks:
+                for candidate in postings.get((block, gram), ()):
+                    if candidate in checked:
+                        continue
+                    checked.add(candidate)
+                    other = all_grams[candidate]
+                    if not min_size <= len(other) <= max_size:
+                        continue
+                    score = 2 * len(gram_set.intersection(other)) / (size + len(other))
+                    if score > best_score:
+                        best_id, best_score = candidate, score
+        if best_score < t:
+            return None, 0.0
+        return best_id, best_score
+
+    def best_match(self, title: str, year=None) -> Tuple[Optional[int], float]:
+        """Most similar indexed record at or above the review threshold, or ``(None, 0.0)``"""
+        return self._best_match(self._prepare(title, year))
+
+    def _check(self, title: str, prepared) -> Tuple[str, Optional[int], float]:
+        record_id, score = self._best_match(prepared)
+        if record_id is None:
+            return "new", None, 0.0
+        normalized, year, _ = prepared
+        matched = normalize_title(self.titles[record_id])
+        if normalized == matched:
+            return "exact", record_id, score
+        same_sequel = sequel_tokens(normalized) == sequel_tokens(matched)
+        status = "fuzzy" if score >= self.threshold and same_sequel else "review"
+        self.matches.append({
+            "status": status,
+            "score": round(score, 3),
+            "title": title,
+            "year": year or "",
+            "matched_title": self.titles[record_id],
+            "matched_year": self.years[record_id] or "",
+        })
+        return status, record_id, score
+
+    def check(self, title: str, year=None) -> Tuple[str, Optional[int], float]:
+        """Classify a record as ``new``, ``exact``, ``fuzzy`` (a duplicate) or ``review`` (kept, but reported)"""
+        return self._check(title, self._prepare(title, year))
+
+    def add_if_new(self, title: str, year=None) -> Tuple[bool, str]:
+        """Index the record unless it duplicates one already indexed; ``(added, status)``"""
+        prepared = self._prepare(title, year)
+        status, _, _ = self._check(title, prepared)
+        if status in ("exact", "fuzzy"):
+            return False, status
+        self._add(title, prepared)
+        return True, status
+
+    def write_report(self, path: str) -> int:
+        """Write fuzzy merges and review candidates as CSV, returning how many rows were written"""
+        fields = ["status", "score", "title", "year", "matched_title", "matched_year"]
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(sorted(self.matches, key=lambda m: (m["status"], -m["score"])))
+        return len(self.matches)
+
+def build_catalog_index(movies: Iterable[Dict], **options) -> FuzzyDedupIndex:
+    """Index an existing catalog of OMDB-style movie dicts, fitting the trigram order to it"""
+    movies = list(movies)
+    index = FuzzyDedupIndex(**options)
+    index.fit(movie.get('Title', '') for movie in movies)
+    for movie in movies:
+        index.add(movie.get('Title', ''), movie.get('Year'))
+    return index
@@ -0,0 +1,138 @@
+"""
+Resumable Import Checkpoints
+Append-only JSON-lines journal of a long import: a header identifying the
+inputs, one line per accepted item (the partial output) and periodic progress
+markers (last processed position plus counters). An interrupted run picks up
+after the last marker instead of starting over.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+CHECKPOINT_INTERVAL = 10.0  # seconds between progress markers
+WRITE_BUFFER_BYTES = 1 << 20
+
+def file_fingerprint(*paths) -> Dict[str, list]:
+    """Size and modification time of each input, so a checkpoint is only reused for the same files"""
+    fingerprint = {}
+    for path in paths:
+        stat = os.stat(path)
+        fingerprint[str(path)] = [stat.st_size, stat.st_mtime_ns]
+    return fingerprint
+
+class ImportCheckpoint:
+    """Progress journal for one import.
+
+    Items are only trusted up to the last progress marker: anything appended
+    after it (or a line torn by a crash) is cut off on resume and redone, so
+    resuming never duplicates or loses an item.
+    """
+
+    def __init__(self, path, fingerprint: Dict, interval: float = CHECKPOINT_INTERVAL):
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.interval = interval
+        self.options: Dict = {}
+        self.position = None
+        self.stats: Dict = {}
+        self.item_count = 0
+        self.resumed_bytes = 0
+        self.last_mark = time.monotonic()
+        self.file = None
+
+    def resume(self) -> bool:
+        """Reopen the checkpoint of an interrupted run over the same inputs; False if there is none"""
+        if not self.path.exists():
+            return False
+        committed = 0
+        with open(self.path, 'rb') as f:
+            try:
+                header = json.loads(f.readline())
+            except ValueError:
+                header = {}
+            if header.get("fingerprint") != self.fingerprint:
+                print(f"⚠️ Ignoring stale checkpoint {self.path.name}: the input files have changed")
+                return False
+            offset = f.tell()
+            items = 0
+            for line in f:
+                offset += len(line)
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if "item" in record:
+                    items += 1
+                elif "position" in record:
+                    committed = offset
+                    self.position = record["position"]
+                    self.stats = record.get("stats", {})
+                    self.item_count = items
+        if not committed:
+            return False
+
+        self.options = header.get("options", {})
+        self.resumed_bytes = committed
+        with open(self.path, 'r+b') as f:
+            f.truncate(committed)
+        self.file = open(self.path, 'a', encoding='utf-8', buffering=WRITE_BUFFER_BYTES)
+        return True
+
+    def start(self, options: Optional[Dict] = None):
+        """Begin a fresh checkpoint, replacing any previous one"""
+        self.options = options or {}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_BYTES)
+        self.file.write(json.dumps({"fingerprint": self.fingerprint, "options": self.options}, ensure_ascii=False) + '\n')
+        self._sync()
+
+    def items(self) -> Iterator:
+        """Items committed by the interrupted run, in the order they were added"""
+        if not self.resumed_bytes:
+            return
+        with open(self.path, 'rb') as f:
+            offset = len(f.readline())
+            for line in f:
+                offset += len(line)
+                if offset > self.resumed_bytes:
+                    break
+                record = json.loads(line)
+                if "item" in record:
+                    yield record["item"]
+
+    def add(self, item):
+        """Record an accepted item; it becomes durable with the next progress marker"""
+        self.file.write(json.dumps({"item": item}, ensure_ascii=False) + '\n')
+        self.item_count += 1
+
+    def mark(self, position, stats: Optional[Dict] = None, force: bool = False) -> bool:
+        """Commit everything added so far as processed up to ``position``, at most once per interval"""
+        now = time.monotonic()
+        if not force and now - self.last_mark < self.interval:
+            return False
+        self.position = position
+        self.stats = stats or {}
+        self.file.write(json.dumps({"position": position, "stats": self.stats}) + '\n')
+        self._sync()
+        self.last_mark = now
+        return True
+
+    def _sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        """Flush and keep the checkpoint so the next run can resume"""
+        if self.file and not self.file.closed:
+            self.file.close()
+
+    def complete(self):
+        """The import finished and its output is saved, so there is nothing left to resume"""
+        self.close()
+        if self.path.exists():
+            self.path.unlink()
@@ -1,15 +1,21 @@
 import json
 import csv
-import requests
-import time
-from typing import List, Dict, Set
+from typing import List, Dict
 import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+from app.catalog_store import CatalogStore
+
+from omdb_client import enrich_titles
+from fuzzy_dedup import build_catalog_index
 
 def load_existing_movies(file_path: str) -> List[Dict]:
-    """Load existing movies from the JSON file"""
+    """Load existing movies from the JSON file (plus changes logged since it was written)"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return CatalogStore(file_path).load()
     except FileNotFoundError:
         print(f"File not found: {file_path}")
         return []
@@ -17,15 +23,6 @@ def load_existing_movies(file_path: str) -> List[Dict]:
         print(f"Error decoding JSON: {e}")
         return []
 
-def get_existing_movie_titles(movies: List[Dict]) -> Set[str]:
-    """Extract all existing movie titles from the current dataset"""
-    existing_titles = set()
-    for movie in movies:
-        title = movie.get('Title', '').lower().strip()
-        if title:
-            existing_titles.add(title)
-    return existing_titles
-
 def read_csv_movies(csv_file: str) -> List[Dict]:
     """Read movies from CSV file and extract unique titles"""
     csv_movies = []
@@ -54,24 +51,6 @@ def read_csv_movies(csv_file: str) -> List[Dict]:
     
     return csv_movies
 
-def fetch_movie_from_omdb(title: str, year: str = None, api_key: str = '984b4107') -> Dict:
-    """Fetch movie details from OMDB API"""
-    url = f"http://www.omdbapi.com/?t={title}&apikey={api_key}"
-    if year:
-        url += f"&y={year}"
-    
-    try:
-        response = requests.get(url, timeout=10)
-        data = response.json()
-        if data.get("Response") == "True":
-            return data
-        else:
-            print(f"❌ OMDB API error for '{title}': {data.get('Error', 'Unknown error')}")
-            return None
-    except Exception as e:
-        print(f"❌ Request error for '{title}': {e}")
-        return None
-
 def main():
     # Paths
     csv_file = r"c:\Users\edakw\Downloads\fam\ekows-famvyux\get movies\imdb_clean.csv"
@@ -81,9 +60,9 @@ def main():
     existing_movies = load_existing_movies(existing_movies_file)
     print(f"📊 Found {len(existing_movies)} existing movies")
     
-    # Get existing movie titles
-    existing_titles = get_existing_movie_titles(existing_movies)
-    print(f"📝 Extracted {len(existing_titles)} unique movie titles")
+    # Index existing titles for exact and fuzzy duplicate checks
+    title_index = build_catalog_index(existing_movies)
+    print(f"📝 Indexed {len(title_index)} movie titles")
     
     print("\n📁 Reading CSV file...")
     csv_movies = read_csv_movies(csv_file)
@@ -92,10 +71,15 @@ def main():
     # Find movies not in existing database
     new_movies_to_fetch = []
     for csv_movie in csv_movies:
-        title_lower = csv_movie['title'].lower().strip()
-        if title_lower not in existing_titles:
+        added, _ = title_index.add_if_new(csv_movie['title'], csv_movie['release_year'])
+        if added:
             new_movies_to_fetch.append(csv_movie)
     
+    if title_index.matches:
+        matches_file = os.path.join(os.path.dirname(existing_movies_file), "fuzzy_matches.csv")
+        title_index.write_report(matches_file)
+        print(f"🔎 {len(title_index.matches)} fuzzy title matches written to {matches_file} for review")
+    
     print(f"🔍 Found {len(new_movies_to_fetch)} new movies to fetch from OMDB")
     
     if not new_movies_to_fetch:
@@ -118,59 +102,33 @@ def main():
     
     print(f"\n🌐 Fetching {len(movies_to_process)} movies from OMDB API...")
     
-    # Create backup
-    backup_file = existing_movies_file.replace('.json', '_backup.json')
-    print(f"💾 Creating backup: {backup_file}")
-    
-    try:
-        with open(backup_file, 'w', encoding='utf-8') as f:
-            json.dump(existing_movies, f, ensure_ascii=False, indent=2)
-        print("✅ Backup created successfully")
-    except Exception as e:
-        print(f"❌ Error creating backup: {e}")
-        return
-    
-    # Fetch movies from OMDB
+    # Fetch movies from OMDB, concurrently and in input order
     successfully_added = []
     failed_movies = []
+    omdb_results = enrich_titles([(m['title'], m['release_year']) for m in movies_to_process])
     
-    for i, csv_movie in enumerate(movies_to_process, 1):
+    for i, (csv_movie, omdb_movie) in enumerate(zip(movies_to_process, omdb_results), 1):
         title = csv_movie['title']
         year = csv_movie['release_year']
         
-        print(f"[{i}/{len(movies_to_process)}] Fetching: {title} ({year})")
+        print(f"[{i}/{len(movies_to_process)}] Fetched: {title} ({year})")
         
-        omdb_movie = fetch_movie_from_omdb(title, year)
         if omdb_movie:
             successfully_added.append(omdb_movie)
             print(f"✅ Added: {omdb_movie['Title']} ({omdb_movie['Year']}) - Rating: {omdb_movie.get('imdbRating', 'N/A')}")
         else:
             failed_movies.append(f"{title} ({year})")
-        
-        # Rate limiting
-        time.sleep(0.2)
     
-    # Save updated movies
+    # Save the new movies as catalog changes; the existing catalog file is not rewritten,
+    # so a failed save leaves it untouched and needs no backup
     if successfully_added:
-        updated_movies = existing_movies + successfully_added
-        
         try:
-            with open(existing_movies_file, 'w', encoding='utf-8') as f:
-                json.dump(updated_movies, f, ensure_ascii=False, indent=2)
+            CatalogStore(existing_movies_file).append(upserts=successfully_added)
             print(f"\n✅ Successfully updated movie database!")
-            print(f"📊 Total movies: {len(updated_movies)} (added {len(successfully_added)})")
+            print(f"📊 Total movies: {len(existing_movies) + len(successfully_added)} (added {len(successfully_added)})")
             
         except Exception as e:
             print(f"❌ Error saving updated movies: {e}")
-            print("🔄 Restoring from backup...")
-            try:
-                with open(backup_file, 'r', encoding='utf-8') as f:
-                    backup_data = json.load(f)
-                with open(existing_movies_file, 'w', encoding='utf-8') as f:
-                    json.dump(backup_data, f, ensure_ascii=False, indent=2)
-                print("✅ Restored from backup")
-            except Exception as restore_error:
-                print(f"❌ Error restoring backup: {restore_error}")
     
     # Final statistics
     print(f"\n📊 Final Statistics:")
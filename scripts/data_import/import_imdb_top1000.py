@@ -1,16 +1,22 @@
 import json
 import csv
-import requests
-import time
 import pandas as pd
-from typing import List, Dict, Set
+from typing import List, Dict
 import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+from app.catalog_store import CatalogStore, catalog_version
+from omdb_client import enrich_titles
+from fuzzy_dedup import build_catalog_index
+from import_checkpoint import ImportCheckpoint, file_fingerprint
 
 def load_existing_movies(file_path: str) -> List[Dict]:
-    """Load existing movies from the JSON file"""
+    """Load existing movies from the JSON file (plus changes logged since it was written)"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return CatalogStore(file_path).load()
     except FileNotFoundError:
         print(f"File not found: {file_path}")
         return []
@@ -18,70 +24,48 @@ def load_existing_movies(file_path: str) -> List[Dict]:
         print(f"Error decoding JSON: {e}")
         return []
 
-def get_existing_movie_titles(movies: List[Dict]) -> Set[str]:
-    """Extract all existing movie titles from the current dataset"""
-    existing_titles = set()
-    for movie in movies:
-        title = movie.get('Title', '').lower().strip()
-        if title:
-            existing_titles.add(title)
-    return existing_titles
+# IMDB CSV column -> key of the movie dicts built from it
+CSV_COLUMNS = {
+    'Title': 'title',
+    'Year': 'year',
+    'Rating': 'rating',
+    'Genre': 'genre',
+    'Director': 'director',
+    'Actors': 'actors',
+    'Runtime (Minutes)': 'runtime',
+    'Description': 'description',
+    'Votes': 'votes',
+    'Revenue (Millions)': 'revenue',
+    'Metascore': 'metascore'
+}
+# Free-text columns are read as strings as-is; numeric ones keep pandas' inferred types
+TEXT_COLUMNS = {'Title': str, 'Genre': str, 'Director': str, 'Actors': str, 'Description': str}
+
+def as_text(column: pd.Series) -> pd.Series:
+    """Whole column formatted the way ``str(value)`` formats each cell, missing values as 'nan'"""
+    return column.astype(str).fillna('nan')
 
 def read_imdb_csv(csv_file: str) -> List[Dict]:
     """Read movies from the new IMDB CSV file"""
-    csv_movies = []
-    
     try:
-        df = pd.read_csv(csv_file)
+        df = pd.read_csv(csv_file, usecols=lambda column: column in CSV_COLUMNS, dtype=TEXT_COLUMNS)
         print(f"📊 CSV contains {len(df)} movies")
         
-        for _, row in df.iterrows():
-            title = str(row.get('Title', '')).strip()
-            if title and title != 'nan':
-                csv_movies.append({
-                    'title': title,
-                    'year': str(row.get('Year', '')),
-                    'rating': str(row.get('Rating', '')),
-                    'genre': str(row.get('Genre', '')),
-                    'director': str(row.get('Director', '')),
-                    'actors': str(row.get('Actors', '')),
-                    'runtime': str(row.get('Runtime (Minutes)', '')),
-                    'description': str(row.get('Description', '')),
-                    'votes': str(row.get('Votes', '')),
-                    'revenue': str(row.get('Revenue (Millions)', '')),
-                    'metascore': str(row.get('Metascore', ''))
-                })
+        # Column-wise conversion instead of building a Series per row with iterrows()
+        movies = pd.DataFrame(
+            {key: as_text(df[column]) if column in df else '' for column, key in CSV_COLUMNS.items()},
+            index=df.index
+        )
+        movies['title'] = movies['title'].str.strip()
+        movies = movies[(movies['title'] != '') & (movies['title'] != 'nan')]
+        # Zipping plain column lists is several times faster than to_dict('records'),
+        # which goes through pandas for every cell
+        keys = list(movies.columns)
+        return [dict(zip(keys, row)) for row in zip(*(movies[key].tolist() for key in keys))]
                 
     except Exception as e:
         print(f"Error reading CSV file: {e}")
         return []
-    
-    return csv_movies
-
-def fetch_movie_from_omdb(title: str, year: str = None, api_key: str = '984b4107') -> Dict:
-    """Fetch movie details from OMDB API"""
-    url = f"http://www.omdbapi.com/?t={title}&apikey={api_key}"
-    if year and year != 'nan':
-        url += f"&y={year}"
-    
-    try:
-        response = requests.get(url, timeout=10)
-        data = response.json()
-        if data.get("Response") == "True":
-            return data
-        else:
-            # Try without year if it failed with year
-            if year:
-                url_no_year = f"http://www.omdbapi.com/?t={title}&apikey={api_key}"
-                response = requests.get(url_no_year, timeout=10)
-                data = response.json()
-                if data.get("Response") == "True":
-                    return data
-            print(f"❌ OMDB API error for '{title}': {data.get('Error', 'Unknown error')}")
-            return None
-    except Exception as e:
-        print(f"❌ Request error for '{title}': {e}")
-        return None
 
 def convert_csv_to_omdb_format(csv_movie: Dict) -> Dict:
     """Convert CSV format movie to OMDB format using available data"""
@@ -131,9 +115,9 @@ def main():
     existing_movies = load_existing_movies(existing_movies_file)
     print(f"📊 Found {len(existing_movies)} existing movies")
     
-    # Get existing movie titles
-    existing_titles = get_existing_movie_titles(existing_movies)
-    print(f"📝 Extracted {len(existing_titles)} unique movie titles")
+    # Index existing titles for exact and fuzzy duplicate checks
+    title_index = build_catalog_index(existing_movies)
+    print(f"📝 Indexed {len(title_index)} movie titles")
     
     print("\n📁 Reading CSV file...")
     csv_movies = read_imdb_csv(csv_file)
@@ -145,53 +129,54 @@ def main():
     # Find movies not in existing database
     new_movies_to_fetch = []
     for csv_movie in csv_movies:
-        title_lower = csv_movie['title'].lower().strip()
-        if title_lower not in existing_titles:
+        added, _ = title_index.add_if_new(csv_movie['title'], csv_movie['year'])
+        if added:
             new_movies_to_fetch.append(csv_movie)
     
+    if title_index.matches:
+        matches_file = os.path.join(os.path.dirname(existing_movies_file), "fuzzy_matches.csv")
+        title_index.write_report(matches_file)
+        print(f"🔎 {len(title_index.matches)} fuzzy title matches written to {matches_file} for review")
+    
     print(f"🔍 Found {len(new_movies_to_fetch)} new movies to add")
     
     if not new_movies_to_fetch:
         print("✅ All CSV movies are already in the database!")
         return
     
-    # Ask user how many to add
-    print(f"\nOptions:")
-    print(f"1. Add all {len(new_movies_to_fetch)} movies using OMDB API (slower, more complete data)")
-    print(f"2. Add all {len(new_movies_to_fetch)} movies using CSV data only (faster, less complete)")
-    print(f"3. Add a limited number using OMDB API")
-    
-    choice = input("Enter choice (1/2/3): ").strip()
+    # An interrupted run over the same files resumes with the choices it was started with
+    checkpoint_file = os.path.join(os.path.dirname(existing_movies_file), "import_imdb_top1000.checkpoint.jsonl")
+    fingerprint = file_fingerprint(csv_file)
+    fingerprint["catalog"] = catalog_version(existing_movies_file)
+    checkpoint = ImportCheckpoint(checkpoint_file, fingerprint)
     
-    if choice == "1":
-        movies_to_process = new_movies_to_fetch
-        use_omdb = True
-    elif choice == "2":
-        movies_to_process = new_movies_to_fetch
-        use_omdb = False
-    elif choice == "3":
-        try:
-            limit = int(input(f"How many movies to add (max {len(new_movies_to_fetch)}): "))
-            movies_to_process = new_movies_to_fetch[:limit]
-            use_omdb = True
-        except ValueError:
-            print("❌ Invalid input. Exiting.")
-            return
+    if checkpoint.resume():
+        choice = checkpoint.options.get("choice")
+        limit = checkpoint.options.get("limit")
+        print(f"\n⏯️ Resuming the interrupted import ({checkpoint.item_count} movies already processed)")
     else:
-        print("❌ Invalid choice. Exiting.")
-        return
-    
-    # Create backup
-    backup_file = existing_movies_file.replace('.json', '_backup.json')
-    print(f"\n💾 Creating backup: {backup_file}")
+        # Ask user how many to add
+        print(f"\nOptions:")
+        print(f"1. Add all {len(new_movies_to_fetch)} movies using OMDB API (more complete data)")
+        print(f"2. Add all {len(new_movies_to_fetch)} movies using CSV data only (faster, less complete)")
+        print(f"3. Add a limited number using OMDB API")
+        
+        choice = input("Enter choice (1/2/3): ").strip()
+        limit = None
+        
+        if choice == "3":
+            try:
+                limit = int(input(f"How many movies to add (max {len(new_movies_to_fetch)}): "))
+            except ValueError:
+                print("❌ Invalid input. Exiting.")
+                return
+        elif choice not in ("1", "2"):
+            print("❌ Invalid choice. Exiting.")
+            return
+        checkpoint.start({"choice": choice, "limit": limit})
     
-    try:
-        with open(backup_file, 'w', encoding='utf-8') as f:
-            json.dump(existing_movies, f, ensure_ascii=False, indent=2)
-        print("✅ Backup created successfully")
-    except Exception as e:
-        print(f"❌ Error creating backup: {e}")
-        return
+    movies_to_process = new_movies_to_fetch[:limit] if limit is not None else new_movies_to_fetch
+    use_omdb = choice != "2"
     
     # Process movies
     successfully_added = []
@@ -199,53 +184,56 @@ def main():
     
     print(f"\n🌐 Processing {len(movies_to_process)} movies...")
     
-    for i, csv_movie in enumerate(movies_to_process, 1):
-        title = csv_movie['title']
-        year = csv_movie['year']
-        
-        print(f"[{i}/{len(movies_to_process)}] Processing: {title} ({year})")
-        
+    # Movies finished before an interruption come back from the checkpoint
+    processed = {item['index']: item for item in checkpoint.items()}
+    remaining = [i for i in range(len(movies_to_process)) if i not in processed]
+    
+    def record(index: int, omdb_movie: Dict = None):
+        if omdb_movie:
+            item = {"index": index, "source": "OMDB", "movie": omdb_movie}
+        else:
+            # Fallback to CSV data
+            item = {"index": index, "source": "CSV", "movie": convert_csv_to_omdb_format(movies_to_process[index])}
+        processed[index] = item
+        checkpoint.add(item)
+        checkpoint.mark(len(processed))
+    
+    try:
         if use_omdb:
-            # Try to get complete data from OMDB
-            omdb_movie = fetch_movie_from_omdb(title, year)
-            if omdb_movie:
-                successfully_added.append(omdb_movie)
-                print(f"✅ Added from OMDB: {omdb_movie['Title']} ({omdb_movie['Year']}) - Rating: {omdb_movie.get('imdbRating', 'N/A')}")
-            else:
-                # Fallback to CSV data
-                csv_based_movie = convert_csv_to_omdb_format(csv_movie)
-                successfully_added.append(csv_based_movie)
-                print(f"✅ Added from CSV: {csv_based_movie['Title']} ({csv_based_movie['Year']}) - Rating: {csv_based_movie.get('imdbRating', 'N/A')}")
-            
-            # Rate limiting for OMDB API
-            time.sleep(0.2)
+            # All lookups run concurrently; each result is checkpointed as it arrives
+            lookups = [(movies_to_process[i]['title'], movies_to_process[i]['year']) for i in remaining]
+            enrich_titles(lookups, on_result=lambda j, omdb_movie: record(remaining[j], omdb_movie))
         else:
-            # Use only CSV data
-            csv_based_movie = convert_csv_to_omdb_format(csv_movie)
-            successfully_added.append(csv_based_movie)
-            print(f"✅ Added from CSV: {csv_based_movie['Title']} ({csv_based_movie['Year']}) - Rating: {csv_based_movie.get('imdbRating', 'N/A')}")
+            for i in remaining:
+                record(i)
+    except KeyboardInterrupt:
+        checkpoint.mark(len(processed), force=True)
+        checkpoint.close()
+        print(f"\n⏸️ Interrupted after {len(processed)} of {len(movies_to_process)} movies, run again to resume")
+        return
+    checkpoint.mark(len(processed), force=True)
     
-    # Save updated movies
+    for i, csv_movie in enumerate(movies_to_process, 1):
+        print(f"[{i}/{len(movies_to_process)}] Processing: {csv_movie['title']} ({csv_movie['year']})")
+        item = processed[i - 1]
+        movie = item['movie']
+        successfully_added.append(movie)
+        print(f"✅ Added from {item['source']}: {movie['Title']} ({movie['Year']}) - Rating: {movie.get('imdbRating', 'N/A')}")
+    
+    # Save the new movies as catalog changes; the existing catalog file is not rewritten,
+    # so a failed save leaves it untouched and needs no backup
     if successfully_added:
-        updated_movies = existing_movies + successfully_added
-        
         try:
-            with open(existing_movies_file, 'w', encoding='utf-8') as f:
-                json.dump(updated_movies, f, ensure_ascii=False, indent=2)
+            CatalogStore(existing_movies_file).append(upserts=successfully_added)
             print(f"\n✅ Successfully updated movie database!")
-            print(f"📊 Total movies: {len(updated_movies)} (added {len(successfully_added)})")
+            print(f"📊 Total movies: {len(existing_movies) + len(successfully_added)} (added {len(successfully_added)})")
+            checkpoint.complete()
             
         except Exception as e:
+            checkpoint.close()
             print(f"❌ Error saving updated movies: {e}")
-            print("🔄 Restoring from backup...")
-            try:
-                with open(backup_file, 'r', encoding='utf-8') as f:
-                    backup_data = json.load(f)
-                with open(existing_movies_file, 'w', encoding='utf-8') as f:
-                    json.dump(backup_data, f, ensure_ascii=False, indent=2)
-                print("✅ Restored from backup")
-            except Exception as restore_error:
-                print(f"❌ Error restoring backup: {restore_error}")
+    else:
+        checkpoint.complete()
     
     # Final statistics
     print(f"\n📊 Final Statistics:")
@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+"""
+Staged Movie Import Pipeline
+One entry point for every import source. Records stream through
+source -> normalize -> dedupe -> enrich -> validate -> sink, each stage a
+task connected to the next by a bounded queue, so the OMDB lookups overlap
+with reading, converting and writing instead of running as separate passes.
+Every stage reports its throughput, busy time and input queue depth.
+
+    python scripts/data_import/import_pipeline.py tmdb "data/get movies/TMDB_movie_dataset_v11.csv"
+    python scripts/data_import/import_pipeline.py csv "data/get movies/imdb_clean.csv" --limit 200
+    python scripts/data_import/import_pipeline.py imdb IMDB-Movie-Data.csv --enrich --dry-run
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+from app.catalog_store import CatalogStore
+from app.json_codec import dumps
+from app.posters import normalize_poster
+from fuzzy_dedup import build_catalog_index, parse_year
+from merge_tmdb_movies import MovieMerger, serialize_movie
+from omdb_client import DEFAULT_CONCURRENCY, DEFAULT_RATE, OmdbClient
+
+DATA_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "get movies"
+DEFAULT_CATALOG = DATA_DIR / "all_10000_movies.json"
+DEFAULT_QUEUE_SIZE = 256
+DEFAULT_PROGRESS_INTERVAL = 5.0
+WRITE_BUFFER_BYTES = 1 << 20
+
+# Fields every catalog movie carries; missing ones are filled with "N/A" during validation
+REQUIRED_FIELDS = ("Title", "Year", "Genre", "Plot", "Poster", "imdbRating", "imdbID", "Type")
+
+# End-of-stream marker passed down the queues
+DONE = object()
+
+class ImportRecord:
+    """One movie on its way through the pipeline"""
+    __slots__ = ("title", "year", "movie")
+
+    def __init__(self, title: str, year: str, movie: Optional[Dict]):
+        self.title = title
+        self.year = year
+        # Catalog-format movie; None until enrichment for sources that only carry titles
+        self.movie = movie
+
+# ---------------------------------------------------------------------------
+# Sources: a reader yielding raw rows and a converter to (title, year, movie).
+# The per-format helpers live in the older scripts and are imported on use,
+# so e.g. a TMDB import does not pull in pandas.
+# ---------------------------------------------------------------------------
+
+def read_tmdb_rows(path: str) -> Iterator[Dict]:
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        yield from csv.DictReader(f)
+
+TMDB_CONVERTER = MovieMerger()
+
+def convert_tmdb_row(row: Dict):
+    movie = TMDB_CONVERTER.convert_tmdb_to_movie_format(row)
+    return (movie['Title'], movie['Year'], movie) if movie else None
+
+def read_imdb_rows(path: str) -> List[Dict]:
+    from import_imdb_top1000 import read_imdb_csv
+    return read_imdb_csv(path)
+
+def convert_imdb_row(row: Dict):
+    from import_imdb_top1000 import convert_csv_to_omdb_format
+    return row['title'], row['year'], convert_csv_to_omdb_format(row)
+
+def read_title_csv_rows(path: str) -> List[Dict]:
+    from import_csv_movies import read_csv_movies
+    return read_csv_movies(path)
+
+def convert_title_csv_row(row: Dict):
+    # Title/year only; the movie itself comes from OMDB
+    return row['title'], row['release_year'], None
+
+def read_popular_rows(path: str = None) -> List[Dict]:
+    from add_popular_movies import fetch_popular_movies_from_tmdb
+    return fetch_popular_movies_from_tmdb()
+
+def convert_popular_row(row: Dict):
+    from add_popular_movies import convert_tmdb_to_omdb_format
+    movie = convert_tmdb_to_omdb_format(row)
+    return movie['Title'], movie['Year'], movie
+
+SOURCES = {
+    # name: (reader, converter, needs OMDB enrichment)
+    "tmdb": (read_tmdb_rows, convert_tmdb_row, False),
+    "imdb": (read_imdb_rows, convert_imdb_row, False),
+    "csv": (read_title_csv_rows, convert_title_csv_row, True),
+    "popular": (read_popular_rows, convert_popular_row, False),
+}
+
+# ---------------------------------------------------------------------------
+# Stage plumbing
+# ---------------------------------------------------------------------------
+
+class StageStats:
+    """Counters for one stage. Busy time excludes waiting on the neighbouring queues."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.records_in = 0
+        self.records_out = 0
+        self.elapsed = 0.0
+        self.blocked = 0.0
+        self.depth_total = 0
+        self.depth_samples = 0
+        self.depth_max = 0
+
+    def sample_depth(self, depth: int):
+        self.depth_total += depth
+        self.depth_samples += 1
+        self.depth_max = max(self.depth_max, depth)
+
+    def summary(self) -> Dict:
+        busy = max(self.elapsed - self.blocked, 0.0)
+        handled = self.records_in or self.records_out
+        return {
+            "stage": self.name,
+            "records_in": self.records_in,
+            "records_out": self.records_out,
+            "dropped": self.records_in - self.records_out if self.records_in else 0,
+            "busy_seconds": round(busy, 3),
+            "records_per_second": round(handled / busy, 1) if busy else None,
+            "queue_depth_avg": round(self.depth_total / self.depth_samples, 1) if self.depth_samples else 0,
+            "queue_depth_max": self.depth_max,
+        }
+
+async def run_source(rows: Iterable, out: asyncio.Queue, stats: StageStats):
+    started = time.perf_counter()
+    for row in rows:
+        stats.records_out += 1
+        waited = time.perf_counter()
+        await out.put(row)
+        stats.blocked += time.perf_counter() - waited
+    await out.put(DONE)
+    stats.elapsed = time.perf_counter() - started
+
+async def run_stage(func: Callable, inbox: asyncio.Queue, out: Optional[asyncio.Queue], stats: StageStats, concurrency: int = 1):
+    """Apply ``func`` to every record; a None result drops the record.
+
+    Async functions may run ``concurrency`` records at a time. Results are
+    still passed on in input order, so the output does not depend on which
+    lookup happens to finish first.
+    """
+    started = time.perf_counter()
+    is_async = asyncio.iscoroutinefunction(func)
+    pending = deque()
+
+    async def emit(result):
+        if result is None:
+            return
+        stats.records_out += 1
+        if out is not None:
+            waited = time.perf_counter()
+            await out.put(result)
+            stats.blocked += time.perf_counter() - waited
+
+    while True:
+        stats.sample_depth(inbox.qsize())
+        waited = time.perf_counter()
+        item = await inbox.get()
+        stats.blocked += time.perf_counter() - waited
+        if item is DONE:
+            break
+        stats.records_in += 1
+        if not is_async:
+            await emit(func(item))
+        elif concurrency == 1:
+            await emit(await func(item))
+        else:
+            pending.append(asyncio.ensure_future(func(item)))
+            if len(pending) >= concurrency:
+                await emit(await pending.popleft())
+    while pending:
+        await emit(await pending.popleft())
+    if out is not None:
+        await out.put(DONE)
+    stats.elapsed = time.perf_counter() - started
+
+# ---------------------------------------------------------------------------
+# The pipeline
+# ---------------------------------------------------------------------------
+
+class ImportPipeline:
+    STAGES = ("source", "normalize", "dedupe", "enrich", "validate", "sink")
+
+    def __init__(
+        self,
+        source: str,
+        path: str = None,
+        catalog_file: Path = DEFAULT_CATALOG,
+        output_file: Path = None,
+        enrich: bool = False,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        rate: float = DEFAULT_RATE,
+        limit: int = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        progress_interval: float = DEFAULT_PROGRESS_INTERVAL,
+        dry_run: bool = False
+    ):
+        self.source = source
+        self.path = path
+        self.reader, self.converter, needs_enrich = SOURCES[source]
+        self.catalog_file = Path(catalog_file)
+        self.output_file = Path(output_file or catalog_file)
+        self.enrich_enabled = enrich or needs_enrich
+        self.concurrency = concurrency
+        self.rate = rate
+        self.limit = limit
+        self.queue_size = queue_size
+        self.progress_interval = progress_interval
+        self.dry_run = dry_run
+
+        self.existing_movies: List[Dict] = []
+        self.index = None
+        self.known_ids = set()
+        self.client = None
+        self.writer = None
+        self.stats = {name: StageStats(name) for name in self.STAGES}
+        self.counts = {"unconvertible": 0, "duplicates": 0, "fuzzy_duplicates": 0, "review_matches": 0,
+                       "enriched": 0, "not_enriched": 0, "duplicate_ids": 0, "invalid": 0}
+        self.elapsed = 0.0
+
+    # -- stages ---------------------------------------------------------------
+
+    def iter_source(self) -> Iterator:
+        rows = self.reader(self.path)
+        for count, row in enumerate(rows):
+            if self.limit is not None and count >= self.limit:
+                break
+            yield row
+
+    def normalize(self, row: Dict) -> Optional[ImportRecord]:
+        converted = self.converter(row)
+        if not converted:
+            self.counts["unconvertible"] += 1
+            return None
+        title, year, movie = converted
+        title = " ".join(str(title or "").split())
+        if not title or title == "nan":
+            self.counts["unconvertible"] += 1
+            return None
+        year = parse_year(year)
+        return ImportRecord(title, str(year) if year else "", movie)
+
+    def dedupe(self, record: ImportRecord) -> Optional[ImportRecord]:
+        imdb_id = (record.movie or {}).get("imdbID")
+        if imdb_id and imdb_id in self.known_ids:
+            self.counts["duplicate_ids"] += 1
+            return None
+        added, status = self.index.add_if_new(record.title, record.year)
+        if not added:
+            self.counts["duplicates"] += 1
+            if status == "fuzzy":
+                self.counts["fuzzy_duplicates"] += 1
+            return None
+        if status == "review":
+            self.counts["review_matches"] += 1
+        return record
+
+    async def enrich(self, record: ImportRecord) -> ImportRecord:
+        if not self.enrich_enabled:
+            return record
+        omdb_movie = await self.client.fetch(record.title, record.year)
+        if omdb_movie:
+            self.counts["enriched"] += 1
+            record.movie = omdb_movie
+        else:
+            self.counts["not_enriched"] += 1
+        return record
+
+    def validate(self, record: ImportRecord) -> Optional[Dict]:
+        movie = record.movie
+        if not movie or not str(movie.get("Title", "")).strip() or movie.get("Response", "True") != "True":
+            self.counts["invalid"] += 1
+            return None
+        # Catalog changes are keyed by imdbID, so sources without one get a local id
+        # (prefixed like the csv_ ids of import_imdb_top1000.py)
+        if movie.get("imdbID") in (None, "", "N/A"):
+            movie["imdbID"] = f"{self.source}_{record.title.replace(' ', '_').lower()}_{record.year}"
+        # Enrichment can resolve a title to a movie the catalog already has under another name
+        imdb_id = movie["imdbID"]
+        if imdb_id in self.known_ids:
+            self.counts["duplicate_ids"] += 1
+            return None
+        self.known_ids.add(imdb_id)
+        for field in REQUIRED_FIELDS:
+            if movie.get(field) in (None, ""):
+                movie[field] = "N/A"
+        return normalize_poster(movie)
+
+    def sink(self, movie: Dict) -> Dict:
+        if self.writer:
+            self.writer.write(movie)
+        return movie
+
+    # -- running --------------------------------------------------------------
+
+    def load_catalog(self):
+        # Base snapshot plus any changes logged since it was written
+        self.existing_movies = CatalogStore(self.catalog_file).load()
+        self.index = build_catalog_index(self.existing_movies)
+        self.known_ids = {movie["imdbID"] for movie in self.existing_movies if movie.get("imdbID")}
+
+    async def report_progress(self, queues: Dict[str, asyncio.Queue]):
+        started = time.perf_counter()
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            parts = []
+            for name in self.STAGES:
+                stage = self.stats[name]
+                depth = f" (q {queues[name].qsize()})" if name in queues else ""
+                parts.append(f"{name} {stage.records_out:,}{depth}")
+            print(f"⏱️ {time.perf_counter() - started:6.1f}s | " + " | ".join(parts))
+
+    async def run_stages(self):
+        # Each stage reads from the queue named after it
+        queues = {name: asyncio.Queue(self.queue_size) for name in self.STAGES[1:]}
+        stats = self.stats
+        tasks = [
+            asyncio.ensure_future(run_source(self.iter_source(), queues["normalize"], stats["source"])),
+            asyncio.ensure_future(run_stage(self.normalize, queues["normalize"], queues["dedupe"], stats["normalize"])),
+            asyncio.ensure_future(run_stage(self.dedupe, queues["dedupe"], queues["enrich"], stats["dedupe"])),
+            asyncio.ensure_future(run_stage(self.enrich, queues["enrich"], queues["validate"], stats["enrich"], self.concurrency if self.enrich_enabled else 1)),
+            asyncio.ensure_future(run_stage(self.validate, queues["validate"], queues["sink"], stats["validate"])),
+            asyncio.ensure_future(run_stage(self.sink, queues["sink"], None, stats["sink"])),
+        ]
+        monitor = asyncio.ensure_future(self.report_progress(queues)) if self.progress_interval else None
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        finally:
+            if monitor:
+                monitor.cancel()
+
+    async def run_async(self):
+        if self.enrich_enabled:
+            async with OmdbClient(concurrency=self.concurrency, rate=self.rate) as client:
+                self.client = client
+                await self.run_stages()
+        else:
+            await self.run_stages()
+
+    def run(self) -> bool:
+        print(f"🎬 Importing '{self.source}'{f' from {self.path}' if self.path else ''}")
+        try:
+            self.load_catalog()
+        except (OSError, ValueError) as e:
+            print(f"❌ Could not load the catalog {self.catalog_file}: {e}")
+            return False
+        print(f"📊 Catalog has {len(self.existing_movies):,} movies")
+        if self.enrich_enabled:
+            print(f"🌐 Enriching from OMDB, {self.concurrency} lookups at a time")
+
+        if self.dry_run:
+            self.writer = None
+        elif self.output_file == self.catalog_file:
+            # Only the new movies are written, as changes to the catalog
+            self.writer = DeltaWriter(self.catalog_file)
+        else:
+            self.writer = CatalogWriter(self.output_file)
+            for movie in self.existing_movies:
+                self.writer.write(movie)
+
+        started = time.perf_counter()
+        try:
+            asyncio.run(self.run_async())
+        except KeyboardInterrupt:
+            if self.writer:
+                self.writer.abort()
+            print("\n⏸️ Import interrupted, the catalog was not changed")
+            return False
+        except Exception as e:
+            if self.writer:
+                self.writer.abort()
+            print(f"❌ Import failed: {type(e).__name__}: {e}")
+            return False
+        self.elapsed = time.perf_counter() - started
+
+        if self.writer:
+            self.writer.commit()
+        self.print_report()
+        if self.index.matches and self.dry_run:
+            print(f"🔎 {len(self.index.matches)} fuzzy title matches (dry run, no report written)")
+        elif self.index.matches:
+            matches_file = self.output_file.parent / "fuzzy_matches.csv"
+            self.index.write_report(matches_file)
+            print(f"🔎 {len(self.index.matches)} fuzzy title matches written to {matches_file} for review")
+        return True
+
+    def metrics(self) -> Dict:
+        return {
+            "source": self.source,
+            "path": str(self.path) if self.path else None,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "stages": [self.stats[name].summary() for name in self.STAGES],
+            "counts": self.counts,
+        }
+
+    def print_report(self):
+        added = self.stats["sink"].records_out
+        print(f"\n📊 Pipeline finished in {self.elapsed:.1f}s")
+        print(f"   {'stage':<10} {'in':>9} {'out':>9} {'rec/s':>10} {'busy s':>8} {'queue avg/max':>14}")
+        for name in self.STAGES:
+            s = self.stats[name].summary()
+            rate = f"{s['records_per_second']:,.0f}" if s['records_per_second'] else "-"
+            queue = f"{s['queue_depth_avg']}/{s['queue_depth_max']}" if name != "source" else "-"
+            print(f"   {name:<10} {s['records_in']:>9,} {s['records_out']:>9,} {rate:>10} {s['busy_seconds']:>8.2f} {queue:>14}")
+        counts = self.counts
+        print(f"\n   ➕ New movies: {added:,}")
+        print(f"   ⏭️ Duplicates: {counts['duplicates']:,} ({counts['fuzzy_duplicates']:,} fuzzy), "
+              f"{counts['duplicate_ids']:,} by IMDb ID")
+        print(f"   🔎 Kept for review: {counts['review_matches']:,}")
+        if self.enrich_enabled:
+            print(f"   🌐 Enriched: {counts['enriched']:,}, not found on OMDB: {counts['not_enriched']:,}")
+        print(f"   ❌ Unconvertible: {counts['unconvertible']:,}, invalid: {counts['invalid']:,}")
+        if self.dry_run:
+            print("   🧪 Dry run, nothing was written")
+        else:
+            print(f"   💾 Saved {len(self.existing_movies) + added:,} movies to {self.output_file}")
+
+class DeltaWriter:
+    """Stages new movies as catalog change-log entries, appended to the log on commit"""
+
+    def __init__(self, catalog_file: Path):
+        self.store = CatalogStore(catalog_file)
+        self.tmp_path = Path(self.store.delta_path + '.staged')
+        self.file = open(self.tmp_path, 'wb', buffering=WRITE_BUFFER_BYTES)
+
+    def write(self, movie: Dict):
+        self.file.write(dumps({"op": "upsert", "movie": movie}))
+        self.file.write(b'\n')
+
+    def commit(self):
+        self.file.close()
+        try:
+            self.store.append_log(self.tmp_path)
+        finally:
+            self.tmp_path.unlink()
+
+    def abort(self):
+        self.file.close()
+        if self.tmp_path.exists():
+            self.tmp_path.unlink()
+
+class CatalogWriter:
+    """Streams movies into a compact JSON array, one movie per line, swapped in on commit"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(self.path.name + '.tmp')
+        self.file = open(self.tmp_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_BYTES)
+        self.file.write('[')
+        self.count = 0
+
+    def write(self, movie: Dict):
+        self.file.write(',\n' if self.count else '\n')
+        self.file.write(serialize_movie(movie))
+        self.count += 1
+
+    def commit(self):
+        self.file.write('\n]' if self.count else ']')
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        self.file.close()
+        if self.tmp_path.exists():
+            self.tmp_path.unlink()
+
+def main():
+    parser = argparse.ArgumentParser(description="Import movies into the catalog through one staged pipeline")
+    parser.add_argument("source", choices=sorted(SOURCES), help="kind of input")
+    parser.add_argument("path", nargs="?", help="input file (not needed for 'popular')")
+    parser.add_argument("--catalog", default=str(DEFAULT_CATALOG), help="catalog JSON to merge into")
+    parser.add_argument("--output", help="where to write the merged catalog (default: the catalog itself)")
+    parser.add_argument("--enrich", action="store_true", help="look every new movie up on OMDB ('csv' always does)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="OMDB lookups in flight")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="OMDB requests per second")
+    parser.add_argument("--limit", type=int, help="read at most this many source records")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE, help="records buffered between stages")
+    parser.add_argument("--progress", type=float, default=DEFAULT_PROGRESS_INTERVAL, help="seconds between progress lines (0 = off)")
+    parser.add_argument("--metrics", help="write per-stage metrics to this JSON file")
+    parser.add_argument("--dry-run", action="store_true", help="run every stage but leave the catalog untouched")
+    args = parser.parse_args()
+
+    if args.source != "popular" and not args.path:
+        parser.error(f"source '{args.source}' needs an input file")
+
+    pipeline = ImportPipeline(
+        args.source, args.path, args.catalog, args.output,
+        enrich=args.enrich, concurrency=args.concurrency, rate=args.rate, limit=args.limit,
+        queue_size=args.queue_size, progress_interval=args.progress, dry_run=args.dry_run
+    )
+    success = pipeline.run()
+    if success and args.metrics:
+        with open(args.metrics, 'w', encoding='utf-8') as f:
+            json.dump(pipeline.metrics(), f, indent=2)
+        print(f"📈 Metrics written to {args.metrics}")
+    sys.exit(0 if success else 1)
+
+if __name__ == "__main__":
+    main()
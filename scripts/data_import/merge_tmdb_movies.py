@@ -2,42 +2,65 @@
 """
 TMDB Movie Dataset Integration Script
 Adds unique movies from TMDB dataset to the existing all_10000_movies.json
-Avoids duplicates by checking title and year matches
+Avoids duplicates with a fuzzy title index blocked by year (fuzzy_dedup.py)
+The CSV is streamed row by row, so memory is bounded by the existing catalog
+rather than by the size of the dataset
+Progress is checkpointed as it goes, so an interrupted merge resumes where it
+stopped when run again (--restart to start over)
 """
 
-import json
+import argparse
 import csv
+import itertools
 import os
 import re
+import sys
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Set, Tuple
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+from app.catalog_store import CatalogStore, catalog_version
+from app.json_codec import dumps_str
+from app.posters import normalize_poster
+from csv_chunks import DEFAULT_CHUNK_BYTES, iter_parallel_chunks, read_chunk_rows, read_header
+from fuzzy_dedup import build_catalog_index, normalize_title
+from import_checkpoint import ImportCheckpoint, file_fingerprint
 
 # File paths
-BASE_DIR = Path(__file__).parent / "data" / "get movies"
+BASE_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "get movies"
 EXISTING_MOVIES_FILE = BASE_DIR / "all_10000_movies.json"
 TMDB_CSV_FILE = BASE_DIR / "TMDB_movie_dataset_v11.csv"
 BACKUP_FILE = BASE_DIR / "all_10000_movies_backup.json"
 OUTPUT_FILE = BASE_DIR / "all_10000_movies.json"
+CHECKPOINT_FILE = BASE_DIR / "merge_tmdb_movies.checkpoint.jsonl"
+WRITE_BUFFER_BYTES = 1 << 20
+
+# Counters saved with every checkpoint, so a resumed run reports the whole merge
+PROGRESS_FIELDS = ("tmdb_processed", "duplicates_found", "fuzzy_duplicates", "review_matches", "movies_added")
+
+YEAR_RE = re.compile(r'\b(19|20)\d{2}\b')
 
 class MovieMerger:
-    def __init__(self):
+    def __init__(self, workers: int = 1, chunk_bytes: int = DEFAULT_CHUNK_BYTES, restart: bool = False):
+        self.workers = workers
+        self.chunk_bytes = chunk_bytes
+        self.restart = restart
+        self.store = CatalogStore(EXISTING_MOVIES_FILE)
         self.existing_movies = []
-        self.tmdb_movies = []
+        # Fuzzy title/year index of every movie kept so far, existing and newly added
+        self.index = None
+        self.checkpoint = None
+        self.tmdb_processed = 0
         self.duplicates_found = 0
+        self.fuzzy_duplicates = 0
+        self.review_matches = 0
         self.movies_added = 0
         
     def normalize_title(self, title: str) -> str:
         """Normalize title for comparison"""
-        if not title:
-            return ""
-        
-        # Remove articles, special characters, convert to lowercase
-        title = title.lower().strip()
-        title = re.sub(r'^(the|a|an)\s+', '', title)
-        title = re.sub(r'[^\w\s]', '', title)
-        title = re.sub(r'\s+', ' ', title).strip()
-        return title
+        return normalize_title(title)
     
     def extract_year(self, date_str: str) -> str:
         """Extract year from various date formats"""
@@ -45,7 +68,7 @@ class MovieMerger:
             return ""
         
         # Try to extract 4-digit year
-        year_match = re.search(r'\b(19|20)\d{2}\b', str(date_str))
+        year_match = YEAR_RE.search(str(date_str))
         return year_match.group(0) if year_match else ""
     
     def load_existing_movies(self):
@@ -57,8 +80,8 @@ class MovieMerger:
             return False
         
         try:
-            with open(EXISTING_MOVIES_FILE, 'r', encoding='utf-8') as f:
-                self.existing_movies = json.load(f)
+            # Base snapshot plus any changes logged since it was written
+            self.existing_movies = self.store.load()
             
             print(f"✅ Loaded {len(self.existing_movies)} existing movies")
             return True
@@ -66,27 +89,55 @@ class MovieMerger:
             print(f"❌ Error loading existing movies: {e}")
             return False
     
-    def load_tmdb_movies(self):
-        """Load and parse TMDB CSV dataset"""
-        print("📁 Loading TMDB dataset...")
-        
-        if not TMDB_CSV_FILE.exists():
-            print("❌ TMDB dataset file not found!")
-            return False
-        
-        try:
-            with open(TMDB_CSV_FILE, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    movie = self.convert_tmdb_to_movie_format(row)
-                    if movie:
-                        self.tmdb_movies.append(movie)
+    def save_progress(self, position: int, force: bool = False):
+        """Checkpoint the merge as done up to byte ``position`` of the CSV"""
+        stats = {name: getattr(self, name) for name in PROGRESS_FIELDS}
+        self.checkpoint.mark(position, stats, force)
+    
+    def iter_tmdb_rows(self, start: int = None) -> Iterator[Dict]:
+        """Stream raw rows from the TMDB CSV one at a time, from byte ``start`` when resuming"""
+        fieldnames, position = read_header(TMDB_CSV_FILE)
+        if start is not None:
+            position = start
+        with open(TMDB_CSV_FILE, 'rb') as f:
+            f.seek(position)
             
-            print(f"✅ Loaded {len(self.tmdb_movies)} TMDB movies")
-            return True
-        except Exception as e:
-            print(f"❌ Error loading TMDB dataset: {e}")
-            return False
+            def lines():
+                # Track the byte offset; the csv reader never reads past the record it returns
+                nonlocal position
+                for line in f:
+                    position += len(line)
+                    yield line.decode('utf-8')
+            
+            for row in csv.DictReader(lines(), fieldnames=fieldnames):
+                self.tmdb_processed += 1
+                yield row
+                # Resumed only once the row has been handled all the way to the output
+                self.save_progress(position)
+        self.save_progress(position, force=True)
+    
+    def iter_tmdb_movies(self, rows: Iterable[Dict]) -> Iterator[Tuple[str, str, str]]:
+        """Convert TMDB rows to ``(title, year, serialized movie)``, dropping rows that can't be converted"""
+        for row in rows:
+            movie = self.convert_tmdb_to_movie_format(row)
+            if movie:
+                yield movie['Title'], movie['Year'], serialize_movie(movie)
+    
+    def iter_tmdb_movies_parallel(self, start: int = None) -> Iterator[Tuple[str, str, str]]:
+        """Convert the CSV in record-aligned chunks across a process pool.
+        
+        Workers also serialize each movie, which leaves the parent only the
+        duplicate checks and writes. Chunks come back in
+        file order, so the output matches a single-process run exactly.
+        """
+        chunks = iter_parallel_chunks(convert_tmdb_chunk, str(TMDB_CSV_FILE), self.chunk_bytes, self.workers, start=start)
+        end = start
+        for end, rows, converted in chunks:
+            self.tmdb_processed += rows
+            yield from converted
+            self.save_progress(end)
+        if end is not None:
+            self.save_progress(end, force=True)
     
     def convert_tmdb_to_movie_format(self, tmdb_row: Dict) -> Dict:
         """Convert TMDB CSV row to our movie format"""
@@ -156,7 +207,7 @@ class MovieMerger:
                 "tmdb_tagline": tmdb_row.get('tagline', '')
             }
             
-            return movie
+            return normalize_poster(movie)
             
         except Exception as e:
             print(f"⚠️ Error converting TMDB row: {e}")
@@ -198,44 +249,101 @@ class MovieMerger:
         company_list = [c.strip() for c in companies.split(',')]
         return ', '.join(company_list[:3]) if company_list else "N/A"
     
-    def create_movie_key(self, movie: Dict) -> str:
-        """Create a unique key for movie comparison"""
-        title = self.normalize_title(movie.get('Title', ''))
-        year = movie.get('Year', '')
-        return f"{title}|{year}"
+    def iter_unique_movies(self, entries: Iterable[Tuple[str, str, str]]) -> Iterator[str]:
+        """Pass through entries that are neither exact nor fuzzy duplicates of a kept movie"""
+        for title, year, movie in entries:
+            added, status = self.index.add_if_new(title, year)
+            if not added:
+                self.duplicates_found += 1
+                if status == "fuzzy":
+                    self.fuzzy_duplicates += 1
+                continue
+            if status == "review":
+                self.review_matches += 1
+            self.movies_added += 1
+            self.checkpoint.add([title, year, movie])
+            yield movie
     
-    def find_duplicates_and_merge(self):
-        """Find unique movies and merge datasets"""
-        print("🔍 Checking for duplicates and merging datasets...")
+    def write_movies(self, f, elements: Iterable[str]) -> int:
+        """Write serialized movies as a JSON array, one element at a time.
         
-        # Create set of existing movie keys
-        existing_keys = set()
-        for movie in self.existing_movies:
-            key = self.create_movie_key(movie)
-            existing_keys.add(key)
+        One compact movie per line, without holding the whole array in memory.
+        """
+        count = 0
+        f.write('[')
+        for element in elements:
+            f.write(',\n' if count else '\n')
+            f.write(element)
+            count += 1
+        f.write('\n]' if count else ']')
+        return count
+    
+    def resume_checkpoint(self):
+        """Continue an interrupted merge of the same files, or start a fresh checkpoint.
         
-        # Track what we add
-        new_movies = []
+        Returns the CSV byte offset to continue from and the movies the
+        interrupted run had already accepted.
+        """
+        fingerprint = file_fingerprint(TMDB_CSV_FILE)
+        fingerprint["catalog"] = catalog_version(str(EXISTING_MOVIES_FILE))
+        self.checkpoint = ImportCheckpoint(CHECKPOINT_FILE, fingerprint)
+        if self.restart or not self.checkpoint.resume():
+            self.checkpoint.start()
+            return None, iter(())
         
-        # Check each TMDB movie
-        for tmdb_movie in self.tmdb_movies:
-            key = self.create_movie_key(tmdb_movie)
-            
-            if key in existing_keys:
-                self.duplicates_found += 1
-            else:
-                new_movies.append(tmdb_movie)
-                existing_keys.add(key)
-                self.movies_added += 1
+        for name, value in self.checkpoint.stats.items():
+            setattr(self, name, value)
+        # Accepted movies go back into the index so the rest of the CSV is checked against them
+        for title, year, _ in self.checkpoint.items():
+            self.index.add(title, year)
+        print(f"⏯️ Resuming from checkpoint: {self.tmdb_processed:,} rows done, {self.movies_added:,} movies accepted")
+        return self.checkpoint.position, (movie for _, _, movie in self.checkpoint.items())
+    
+    def merge_streaming(self) -> bool:
+        """Stream TMDB rows through conversion and dedup straight into the output file"""
+        print("🔍 Streaming TMDB dataset, checking for duplicates and merging...")
+        
+        self.index = build_catalog_index(self.existing_movies)
+        start, resumed_movies = self.resume_checkpoint()
+        if self.workers > 1:
+            print(f"⚙️ Converting in {self.chunk_bytes >> 20} MB chunks on {self.workers} workers")
+            new_movies = self.iter_unique_movies(self.iter_tmdb_movies_parallel(start))
+        else:
+            new_movies = self.iter_unique_movies(self.iter_tmdb_movies(self.iter_tmdb_rows(start)))
+        existing = map(serialize_movie, self.existing_movies)
         
-        # Combine all movies
-        all_movies = self.existing_movies + new_movies
+        # The output replaces the input file, so write next to it and swap at the end
+        tmp_file = OUTPUT_FILE.with_name(OUTPUT_FILE.name + '.tmp')
+        try:
+            with open(tmp_file, 'w', encoding='utf-8', buffering=WRITE_BUFFER_BYTES) as f:
+                total = self.write_movies(f, itertools.chain(existing, resumed_movies, new_movies))
+            if OUTPUT_FILE == EXISTING_MOVIES_FILE:
+                # The new base includes the change log as loaded; anything logged since is kept
+                self.store.install_base(str(tmp_file), self.store.loaded_delta_bytes)
+            else:
+                os.replace(tmp_file, OUTPUT_FILE)
+        except KeyboardInterrupt:
+            print(f"\n⏸️ Interrupted after {self.tmdb_processed:,} rows, run again to resume from {CHECKPOINT_FILE.name}")
+            return False
+        except Exception as e:
+            print(f"❌ Error merging movies: {e}")
+            return False
+        finally:
+            self.checkpoint.close()
+            if tmp_file.exists():
+                tmp_file.unlink()
+        self.checkpoint.complete()
         
-        print(f"✅ Found {self.duplicates_found} duplicates")
+        print(f"✅ Processed {self.tmdb_processed:,} TMDB rows")
+        print(f"✅ Found {self.duplicates_found} duplicates ({self.fuzzy_duplicates} fuzzy)")
         print(f"✅ Adding {self.movies_added} new unique movies")
-        print(f"✅ Total movies after merge: {len(all_movies)}")
+        print(f"✅ Saved {total} movies to {OUTPUT_FILE}")
         
-        return all_movies
+        if self.index.matches:
+            matches_file = BASE_DIR / f"fuzzy_matches_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            self.index.write_report(matches_file)
+            print(f"🔎 {len(self.index.matches)} fuzzy matches written to {matches_file} for review")
+        return True
     
     def create_backup(self):
         """Create backup of existing movies file"""
@@ -250,20 +358,6 @@ class MovieMerger:
             print(f"❌ Error creating backup: {e}")
             return False
     
-    def save_merged_movies(self, movies: List[Dict]):
-        """Save merged movies to JSON file"""
-        print("💾 Saving merged movie collection...")
-        
-        try:
-            with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-                json.dump(movies, f, indent=2, ensure_ascii=False)
-            
-            print(f"✅ Saved {len(movies)} movies to {OUTPUT_FILE}")
-            return True
-        except Exception as e:
-            print(f"❌ Error saving movies: {e}")
-            return False
-    
     def generate_report(self):
         """Generate a summary report"""
         report = f"""
@@ -273,8 +367,10 @@ class MovieMerger:
 
 📊 Statistics:
 • Existing movies: {len(self.existing_movies):,}
-• TMDB movies processed: {len(self.tmdb_movies):,}
+• TMDB rows processed: {self.tmdb_processed:,}
 • Duplicates found: {self.duplicates_found:,}
+• Fuzzy duplicates merged: {self.fuzzy_duplicates:,}
+• Possible duplicates kept for review: {self.review_matches:,}
 • New movies added: {self.movies_added:,}
 • Total movies after merge: {len(self.existing_movies) + self.movies_added:,}
 
@@ -305,29 +401,52 @@ class MovieMerger:
         if not self.load_existing_movies():
             return False
         
-        # Step 2: Load TMDB movies
-        if not self.load_tmdb_movies():
+        # Step 2: Check the TMDB dataset is there
+        if not TMDB_CSV_FILE.exists():
+            print("❌ TMDB dataset file not found!")
             return False
         
         # Step 3: Create backup
         if not self.create_backup():
             return False
         
-        # Step 4: Find duplicates and merge
-        merged_movies = self.find_duplicates_and_merge()
-        
-        # Step 5: Save merged collection
-        if not self.save_merged_movies(merged_movies):
+        # Step 4: Stream, convert, de-duplicate and save
+        if not self.merge_streaming():
             return False
         
-        # Step 6: Generate report
+        # Step 5: Generate report
         self.generate_report()
         
         return True
 
+def serialize_movie(movie: Dict) -> str:
+    """One movie as it appears in the compact catalog snapshot"""
+    return dumps_str(movie)
+
+def convert_tmdb_chunk(path: str, start: int, end: int, fieldnames: List[str]) -> Tuple[int, int, List[Tuple[str, str, str]]]:
+    """Pool worker: convert one byte range of the CSV to ``(title, year, serialized movie)`` entries.
+    
+    Returns the range's end offset, its row count and the entries.
+    """
+    merger = MovieMerger()
+    rows = 0
+    converted = []
+    for row in read_chunk_rows(path, start, end, fieldnames):
+        rows += 1
+        movie = merger.convert_tmdb_to_movie_format(row)
+        if movie:
+            converted.append((movie['Title'], movie['Year'], serialize_movie(movie)))
+    return end, rows, converted
+
 def main():
     """Main function"""
-    merger = MovieMerger()
+    parser = argparse.ArgumentParser(description="Merge the TMDB dataset into the movie catalog")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="conversion processes (1 = stream in-process)")
+    parser.add_argument("--chunk-mb", type=int, default=DEFAULT_CHUNK_BYTES >> 20, help="CSV bytes per worker task, in MB")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint of an interrupted merge and start over")
+    args = parser.parse_args()
+    
+    merger = MovieMerger(workers=args.workers, chunk_bytes=args.chunk_mb << 20, restart=args.restart)
     success = merger.run()
     
     if success:
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Poster Normalization
+Rewrites the catalog with every movie's poster resolved into the canonical
+PosterSource / PosterPath / PosterSizes fields (see app/posters.py). New
+movies get them on import; this brings an existing catalog up to date in one
+pass, so the app does not resolve them on every start.
+"""
+
+import argparse
+import sys
+from collections import Counter
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+from app.catalog_store import CatalogStore
+from app.config import MOVIES_FILE
+from app.posters import normalize_poster
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve every catalog poster into canonical fields")
+    parser.add_argument("--catalog", default=MOVIES_FILE, help="catalog JSON to rewrite")
+    args = parser.parse_args()
+
+    store = CatalogStore(args.catalog)
+    print(f"🎬 Loading {args.catalog}...")
+    movies = [normalize_poster(dict(movie)) for movie in store.load()]
+    sources = Counter(movie["PosterSource"] for movie in movies)
+    print(f"🖼️ Posters: " + ", ".join(f"{source} {count:,}" for source, count in sources.most_common()))
+
+    store.replace(movies)
+    print(f"✅ Saved {len(movies):,} movies with resolved posters")
+
+if __name__ == "__main__":
+    main()
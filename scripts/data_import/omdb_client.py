@@ -0,0 +1,212 @@
+"""
+Concurrent OMDB Enrichment Client
+Looks titles up on OMDB over a pooled httpx.AsyncClient, many at a time,
+under a token-bucket rate limit with retry and exponential backoff.
+Answers are cached on disk (response_cache.py); OMDB_OFFLINE=1 serves from
+the cache only. Point OMDB_API_URL at a local stub
+(scripts/testing/omdb_stub_server.py) to exercise it without spending API quota.
+"""
+
+import asyncio
+import os
+import random
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from response_cache import DEFAULT_CACHE_FILE, MISS, ResponseCache
+
+OMDB_API_URL = os.environ.get("OMDB_API_URL", "http://www.omdbapi.com/")
+OMDB_API_KEY = os.environ.get("OMDB_API_KEY", "984b4107")
+OMDB_OFFLINE = os.environ.get("OMDB_OFFLINE") == "1"
+
+DEFAULT_CONCURRENCY = 32
+DEFAULT_RATE = 100.0  # requests per second
+DEFAULT_RETRIES = 3
+DEFAULT_TIMEOUT = 10.0
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 10.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+NOT_FOUND_ERRORS = {"Movie not found!", "Incorrect IMDb ID."}
+
+class TokenBucket:
+    """Async token bucket: ``rate`` tokens per second, bursts of up to ``capacity``"""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        # Waiters queue on the lock, so tokens are handed out first come, first served
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class OmdbClient:
+    """Pooled, rate-limited OMDB lookups. Use as ``async with OmdbClient() as client``."""
+
+    def __init__(
+        self,
+        api_key: str = OMDB_API_KEY,
+        base_url: str = OMDB_API_URL,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        rate: float = DEFAULT_RATE,
+        retries: int = DEFAULT_RETRIES,
+        timeout: float = DEFAULT_TIMEOUT,
+        cache_path: Optional[str] = DEFAULT_CACHE_FILE,
+        offline: bool = OMDB_OFFLINE
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.retries = retries
+        self.timeout = timeout
+        self.bucket = TokenBucket(rate)
+        self.cache_path = cache_path
+        self.offline = offline
+        self.cache = None
+        self.client = None
+        self.stats = {"requests": 0, "retries": 0, "found": 0, "not_found": 0, "errors": 0, "cached": 0, "offline_misses": 0}
+
+    async def __aenter__(self):
+        if self.cache_path:
+            self.cache = ResponseCache(self.cache_path)
+        # One keep-alive connection per concurrent lookup, reused for the whole run
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        self.client = httpx.AsyncClient(limits=limits, timeout=self.timeout)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+        if self.cache:
+            self.cache.close()
+
+    async def request(self, params: Dict[str, str]) -> Optional[Dict]:
+        """One OMDB call with rate limiting and retries; None once retries are exhausted"""
+        params = {**params, "apikey": self.api_key}
+        for attempt in range(self.retries + 1):
+            await self.bucket.acquire()
+            self.stats["requests"] += 1
+            retry_after = None
+            try:
+                response = await self.client.get(self.base_url, params=params)
+                if response.status_code not in RETRY_STATUSES:
+                    return response.json()
+                retry_after = response.headers.get("Retry-After")
+                problem = f"HTTP {response.status_code}"
+            except (httpx.TransportError, ValueError) as e:
+                problem = f"{type(e).__name__}: {e}"
+
+            if attempt == self.retries:
+                print(f"❌ Giving up on '{params.get('t') or params.get('i')}' after {attempt + 1} attempts ({problem})")
+                return None
+            self.stats["retries"] += 1
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+        return None
+
+    @staticmethod
+    def _backoff(attempt: int, retry_after: str = None) -> float:
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), BACKOFF_MAX)
+        # Full jitter keeps a burst of failed lookups from retrying in lockstep
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+    async def fetch(self, title: str, year: str = None) -> Optional[Dict]:
+        """OMDB record for a title, retrying without the year when the year-qualified lookup misses"""
+        year = str(year).strip() if year else ""
+        if year in ("nan", "N/A"):
+            year = ""
+        if self.cache:
+            cached = self.cache.get("omdb", title, year)
+            if cached is not MISS:
+                self.stats["cached"] += 1
+                self.stats["found" if cached else "not_found"] += 1
+                return cached
+        if self.offline:
+            self.stats["offline_misses"] += 1
+            return None
+
+        params = {"t": title}
+        if year:
+            params["y"] = year
+        data = await self.request(params)
+        if data and data.get("Response") != "True" and year and data.get("Error") in NOT_FOUND_ERRORS:
+            data = await self.request({"t": title})
+
+        if data is None:
+            self.stats["errors"] += 1
+            return None
+        if data.get("Response") == "True":
+            self.stats["found"] += 1
+            if self.cache:
+                self.cache.put("omdb", title, year, data)
+            return data
+        if data.get("Error") in NOT_FOUND_ERRORS:
+            self.stats["not_found"] += 1
+            if self.cache:
+                self.cache.put("omdb", title, year, None)
+        else:
+            self.stats["errors"] += 1
+            print(f"❌ OMDB API error for '{title}': {data.get('Error', 'Unknown error')}")
+        return None
+
+    async def fetch_many(
+        self,
+        lookups: Sequence[Tuple[str, Optional[str]]],
+        on_result: Callable[[int, Optional[Dict]], None] = None
+    ) -> List[Optional[Dict]]:
+        """Fetch ``(title, year)`` lookups concurrently, returning results in input order"""
+        results = [None] * len(lookups)
+        next_index = iter(range(len(lookups)))
+
+        async def worker():
+            # A fixed set of workers pulling indexes keeps the task count small for huge inputs
+            for i in next_index:
+                title, year = lookups[i]
+                results[i] = await self.fetch(title, year)
+                if on_result:
+                    on_result(i, results[i])
+
+        await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(lookups)))))
+        return results
+
+def enrich_titles(
+    lookups: Sequence[Tuple[str, Optional[str]]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    rate: float = DEFAULT_RATE,
+    on_result: Callable[[int, Optional[Dict]], None] = None,
+    **client_options
+) -> List[Optional[Dict]]:
+    """Blocking entry point for the import scripts: OMDB records (or None) in input order"""
+    async def run():
+        async with OmdbClient(concurrency=concurrency, rate=rate, **client_options) as client:
+            started = time.perf_counter()
+            results = await client.fetch_many(lookups, on_result)
+            elapsed = time.perf_counter() - started
+            stats = client.stats
+            print(
+                f"🌐 {len(lookups)} lookups in {elapsed:.1f}s: {stats['found']} found, "
+                f"{stats['not_found']} not found, {stats['errors']} errors "
+                f"({stats['cached']} from cache, {stats['requests']} requests, {stats['retries']} retries)"
+            )
+            if stats["offline_misses"]:
+                print(f"📴 Offline: {stats['offline_misses']} titles were not in the cache")
+            return results
+    return asyncio.run(run())
+
+def fetch_movie_from_omdb(title: str, year: str = None, api_key: str = OMDB_API_KEY) -> Optional[Dict]:
+    """Single blocking lookup, for one-off use"""
+    async def run():
+        async with OmdbClient(api_key=api_key, concurrency=1) as client:
+            return await client.fetch(title, year)
+    return asyncio.run(run())
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Recommendation Precompute Job
+Loads the catalog once, derives a preference profile for every user from their
+watch-later list and writes per-user top-N recommendation feeds.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from app.config import PRECOMPUTED_RECOMMENDATIONS_FILE
+from app.precomputed import DEFAULT_TOP_N, CatalogFeatures, precompute_all, save_precomputed
+from app.utils import load_movies, load_likes, load_watch_later, get_all_unique_movies
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute personalized recommendation feeds for every user")
+    parser.add_argument("--top-n", type=int, default=DEFAULT_TOP_N, help="recommendations stored per user")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--batch-size", type=int, default=64, help="users per worker task")
+    parser.add_argument("--output", default=PRECOMPUTED_RECOMMENDATIONS_FILE)
+    args = parser.parse_args()
+
+    print("🎬 Recommendation Precompute")
+    print("=" * 50)
+
+    start = time.perf_counter()
+    movies = get_all_unique_movies(load_movies())
+    features = CatalogFeatures(movies, load_likes())
+    print(f"📚 Catalog: {len(movies):,} movies prepared in {time.perf_counter() - start:.2f}s")
+
+    watch_later = load_watch_later()
+    scoring_start = time.perf_counter()
+    feeds = precompute_all(watch_later, features, args.top_n, args.workers, args.batch_size)
+    elapsed = time.perf_counter() - scoring_start
+    rate = len(feeds) / elapsed if elapsed else 0
+    print(f"✅ Scored {len(feeds):,} users on {args.workers} worker(s) in {elapsed:.2f}s ({rate:,.0f} users/s)")
+
+    save_precomputed(feeds, {
+        "users": len(feeds),
+        "movies": len(movies),
+        "top_n": args.top_n,
+        "workers": args.workers,
+        "seconds": round(elapsed, 2)
+    }, args.output)
+    print(f"💾 Saved feeds to {args.output}")
+
+if __name__ == "__main__":
+    main()
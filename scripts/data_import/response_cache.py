@@ -0,0 +1,106 @@
+"""
+Persistent API Response Cache
+SQLite store of OMDB/TMDB lookup results keyed by API, normalized title and
+year, so re-running an import only goes to the network for titles it has not
+seen (or whose cached answer has expired).
+"""
+
+import json
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+DEFAULT_CACHE_FILE = os.environ.get(
+    "API_CACHE_FILE",
+    str(Path(__file__).resolve().parent.parent.parent / "data" / "get movies" / "api_cache.sqlite3")
+)
+DEFAULT_TTL = 30 * 24 * 3600           # found records
+DEFAULT_NEGATIVE_TTL = 7 * 24 * 3600   # "Movie not found!" answers
+COMMIT_EVERY = 100
+
+SPACES_RE = re.compile(r'\s+')
+
+# Returned by get() when nothing usable is cached, distinct from a cached miss (None)
+MISS = object()
+
+def normalize_key(title: str, year: str = None) -> Tuple[str, str]:
+    """Case- and whitespace-insensitive title, plus the year or '' when it is unknown"""
+    title = SPACES_RE.sub(' ', str(title or '')).strip().lower()
+    year = str(year or '').strip()
+    return title, year if year.isdigit() else ''
+
+class ResponseCache:
+    """Lookup results with per-entry expiry; negative answers are cached for a shorter time"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_FILE, ttl: float = DEFAULT_TTL, negative_ttl: float = DEFAULT_NEGATIVE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.pending_writes = 0
+        self.stats = {"hits": 0, "negative_hits": 0, "misses": 0, "writes": 0}
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                api TEXT NOT NULL,
+                title TEXT NOT NULL,
+                year TEXT NOT NULL,
+                found INTEGER NOT NULL,
+                body TEXT,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (api, title, year)
+            ) WITHOUT ROWID"""
+        )
+        self.conn.commit()
+
+    def get(self, api: str, title: str, year: str = None):
+        """The cached record, None for a cached "not found", or MISS"""
+        row = self.conn.execute(
+            "SELECT found, body, fetched_at FROM responses WHERE api = ? AND title = ? AND year = ?",
+            (api, *normalize_key(title, year))
+        ).fetchone()
+        if row is not None:
+            found, body, fetched_at = row
+            if time.time() - fetched_at < (self.ttl if found else self.negative_ttl):
+                if found:
+                    self.stats["hits"] += 1
+                    return json.loads(body)
+                self.stats["negative_hits"] += 1
+                return None
+        self.stats["misses"] += 1
+        return MISS
+
+    def put(self, api: str, title: str, year: str, data: Optional[Dict]):
+        """Store a record, or ``None`` to remember that the title was not found"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses (api, title, year, found, body, fetched_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (api, *normalize_key(title, year), int(data is not None),
+             json.dumps(data, ensure_ascii=False, separators=(',', ':')) if data is not None else None, time.time())
+        )
+        self.stats["writes"] += 1
+        self.pending_writes += 1
+        if self.pending_writes >= COMMIT_EVERY:
+            self.commit()
+
+    def purge_expired(self) -> int:
+        """Delete entries past their TTL, returning how many were removed"""
+        now = time.time()
+        cursor = self.conn.execute(
+            "DELETE FROM responses WHERE (found = 1 AND fetched_at < ?) OR (found = 0 AND fetched_at < ?)",
+            (now - self.ttl, now - self.negative_ttl)
+        )
+        self.commit()
+        return cursor.rowcount
+
+    def commit(self):
+        self.conn.commit()
+        self.pending_writes = 0
+
+    def close(self):
+        self.commit()
+        self.conn.close()
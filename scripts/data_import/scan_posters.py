@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Poster Availability Scan
+HEAD-checks every poster in the catalog, many at a time with a cap per host,
+and writes what each origin answered (status, size, content type) to a
+report. Posters that are gone are marked ``PosterStatus: "dead"`` in the
+catalog, so pages show the placeholder straight away instead of making the
+browser wait on a failing image; posters that come back are unmarked.
+
+    python scripts/data_import/scan_posters.py --dry-run
+    python scripts/data_import/scan_posters.py --source amazon --per-host 4
+
+Point TMDB_IMAGE_BASE_URL at scripts/testing/poster_origin_stub.py to try it
+without touching TMDB.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+from app.catalog_store import CatalogStore
+from app.config import MOVIES_FILE
+from app.json_codec import dump_file
+from app.posters import POSTER_DEAD, poster_origin_url
+
+DEFAULT_REPORT_FILE = os.path.join(os.path.dirname(MOVIES_FILE), "poster_scan_report.json")
+DEFAULT_CONCURRENCY = 64
+DEFAULT_PER_HOST = 8
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_RETRIES = 2
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Answers that mean the image is gone for good, not just unreachable right now
+DEAD_STATUSES = {403, 404, 410}
+# Some hosts refuse HEAD; a one-byte GET tells us the same
+HEAD_REFUSED_STATUSES = {405, 501}
+
+class PosterScanner:
+    """Checks poster URLs concurrently: ``concurrency`` in flight overall, ``per_host`` per host"""
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, per_host: int = DEFAULT_PER_HOST,
+                 timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.hosts: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(self.per_host))
+        self.stats = Counter()
+
+    async def scan(self, urls: List[str], on_result=None) -> Dict[str, Dict]:
+        """Result per URL: ``{"state": "ok"|"dead"|"error", "status", "bytes", "type", "ms"}``"""
+        results = {}
+        next_url = iter(urls)
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        async with httpx.AsyncClient(limits=limits, timeout=self.timeout, follow_redirects=True) as client:
+            async def worker():
+                # Workers pulling from one iterator keep the task count fixed for any catalog size
+                for url in next_url:
+                    results[url] = await self.check(client, url)
+                    self.stats[results[url]["state"]] += 1
+                    if on_result:
+                        on_result(len(results))
+
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(urls)))))
+        return results
+
+    async def check(self, client: httpx.AsyncClient, url: str) -> Dict:
+        async with self.hosts[urlsplit(url).netloc]:
+            started = time.perf_counter()
+            for attempt in range(self.retries + 1):
+                problem = None
+                try:
+                    response = await client.head(url)
+                    if response.status_code in HEAD_REFUSED_STATUSES:
+                        response = await client.get(url, headers={"Range": "bytes=0-0"})
+                    if response.status_code not in RETRY_STATUSES:
+                        break
+                    problem = f"HTTP {response.status_code}"
+                except httpx.HTTPError as e:
+                    problem = f"{type(e).__name__}: {e}"
+                if attempt < self.retries:
+                    self.stats["retries"] += 1
+                    await asyncio.sleep(0.5 * 2 ** attempt)
+            elapsed_ms = round((time.perf_counter() - started) * 1000)
+
+        if problem:
+            # Timeouts and server errors say nothing about the image itself; leave it be
+            return {"state": "error", "status": None, "bytes": None, "type": None, "ms": elapsed_ms, "error": problem}
+        media_type = response.headers.get("content-type", "").split(";")[0].strip()
+        size = _content_size(response)
+        if response.status_code in DEAD_STATUSES:
+            state = "dead"
+        elif response.status_code in (200, 206):
+            # Hosts that drop an image often answer with an HTML page instead
+            state = "ok" if media_type.startswith("image/") and size != 0 else "dead"
+        else:
+            state = "error"
+        return {"state": state, "status": response.status_code, "bytes": size, "type": media_type or None, "ms": elapsed_ms}
+
+def _content_size(response: httpx.Response) -> Optional[int]:
+    # For a ranged GET the full size is after the slash in Content-Range
+    content_range = response.headers.get("content-range", "")
+    if "/" in content_range and content_range.rsplit("/", 1)[1].isdigit():
+        return int(content_range.rsplit("/", 1)[1])
+    length = response.headers.get("content-length")
+    return int(length) if length and length.isdigit() else None
+
+def status_changes(movies: List[Dict], results: Dict[str, Dict]) -> List[Dict]:
+    """Movies whose PosterStatus the scan changes: newly dead, or back from the dead"""
+    changed = []
+    for movie in movies:
+        result = results.get(poster_origin_url(movie, include_dead=True))
+        if not result or result["state"] == "error":
+            continue
+        was_dead = movie.get("PosterStatus") == POSTER_DEAD
+        if result["state"] == "dead" and not was_dead:
+            changed.append({**movie, "PosterStatus": POSTER_DEAD})
+        elif result["state"] == "ok" and was_dead:
+            movie = dict(movie)
+            del movie["PosterStatus"]
+            changed.append(movie)
+    return changed
+
+def main():
+    parser = argparse.ArgumentParser(description="Check every catalog poster and mark the dead ones")
+    parser.add_argument("--catalog", default=MOVIES_FILE, help="catalog JSON to scan")
+    parser.add_argument("--report", default=DEFAULT_REPORT_FILE, help="where to write the per-poster report")
+    parser.add_argument("--source", choices=["tmdb", "amazon", "url"], help="only scan posters from this source")
+    parser.add_argument("--limit", type=int, help="scan at most this many posters")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="requests in flight at once")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST, help="requests in flight per host")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds per request")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="retries on timeouts and 5xx answers")
+    parser.add_argument("--dry-run", action="store_true", help="write the report but leave the catalog alone")
+    args = parser.parse_args()
+
+    store = CatalogStore(args.catalog)
+    movies = [m for m in store.load() if not args.source or m.get("PosterSource") == args.source]
+    # Movies sharing an image are checked once
+    movie_ids = defaultdict(list)
+    for movie in movies:
+        url = poster_origin_url(movie, include_dead=True)
+        if url:
+            movie_ids[url].append(movie.get("imdbID"))
+    urls = list(movie_ids)[:args.limit] if args.limit else list(movie_ids)
+    if not urls:
+        print("📭 No posters to check")
+        return
+    print(f"🔍 Checking {len(urls):,} posters for {len(movies):,} movies "
+          f"({args.concurrency} at a time, {args.per_host} per host)...")
+
+    def progress(done: int):
+        if done % 500 == 0:
+            print(f"   ... {done:,}/{len(urls):,}")
+
+    scanner = PosterScanner(args.concurrency, args.per_host, args.timeout, args.retries)
+    started = time.perf_counter()
+    results = asyncio.run(scanner.scan(urls, progress))
+    elapsed = time.perf_counter() - started
+
+    hosts = defaultdict(Counter)
+    for url, result in results.items():
+        hosts[urlsplit(url).netloc][result["state"]] += 1
+    report = {
+        "scanned_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "catalog": args.catalog,
+        "seconds": round(elapsed, 2),
+        "summary": {state: scanner.stats[state] for state in ("ok", "dead", "error")},
+        "hosts": {host: dict(counts) for host, counts in sorted(hosts.items())},
+        "posters": [{"url": url, "movies": movie_ids[url], **result} for url, result in results.items()],
+    }
+    dump_file(args.report, report)
+
+    stats = scanner.stats
+    print(f"✅ {len(urls):,} posters in {elapsed:.1f}s ({len(urls) / max(elapsed, 1e-9):.0f}/s): "
+          f"{stats['ok']:,} ok, {stats['dead']:,} dead, {stats['error']:,} unreachable ({stats['retries']:,} retries)")
+    for host, counts in report["hosts"].items():
+        print(f"   {host}: " + ", ".join(f"{state} {count:,}" for state, count in sorted(counts.items())))
+    print(f"📝 Report saved to {args.report}")
+
+    changed = status_changes(movies, results)
+    if args.dry_run:
+        print(f"🧪 Dry run: {len(changed):,} movies would change poster status")
+    elif changed:
+        store.append(upserts=changed)
+        dead = sum(1 for movie in changed if movie.get("PosterStatus") == POSTER_DEAD)
+        print(f"💾 Marked {dead:,} posters dead and {len(changed) - dead:,} back up")
+    else:
+        print("💾 Catalog already up to date")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Static Assets Build Script
+Writes content-hashed, precompressed copies of everything in static/ to
+static/build/ (see app/static_assets.py). The app does this on startup when an
+asset changed; run it as a deploy step so no worker has to.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+from app.config import STATIC_DIR
+from app.static_assets import BUILD_DIRNAME, brotli, build_static
+
+def main():
+    parser = argparse.ArgumentParser(description="Build hashed, precompressed static assets")
+    parser.add_argument("--static-dir", default=STATIC_DIR, help="directory holding the source assets")
+    args = parser.parse_args()
+
+    if brotli is None:
+        print("⚠️  brotli is not installed, writing gzip variants only (pip install brotli)")
+    manifest = build_static(args.static_dir)
+    build_dir = os.path.join(args.static_dir, BUILD_DIRNAME)
+    for name, hashed in manifest["files"].items():
+        sizes = [f"{os.path.getsize(os.path.join(args.static_dir, name)):,} B"]
+        for suffix in (".gz", ".br"):
+            variant = os.path.join(build_dir, hashed + suffix)
+            if os.path.exists(variant):
+                sizes.append(f"{suffix[1:]} {os.path.getsize(variant):,} B")
+        print(f"   {name} → {hashed} ({', '.join(sizes)})")
+    print(f"✅ {len(manifest['files'])} assets, {manifest['written']} new, in {build_dir}")
+
+if __name__ == "__main__":
+    main()
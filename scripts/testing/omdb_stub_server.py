@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+"""
+OMDB Stub Server
+Serves OMDB-shaped answers locally with configurable latency, misses and
+transient failures, so the import scripts' enrichment client can be tested
+without the real API.
+
+    python scripts/testing/omdb_stub_server.py --port 8765 --latency 0.05
+    OMDB_API_URL=http://127.0.0.1:8765/ python scripts/data_import/import_imdb_top1000.py
+"""
+
+import argparse
+import asyncio
+import random
+import zlib
+
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+app = FastAPI()
+settings = {"latency": 0.05, "missing_rate": 0.1, "error_rate": 0.02}
+stats = {"requests": 0, "errors": 0}
+
+def _fraction(text: str) -> float:
+    """Stable 0-1 value per title, so a title is always found or always missing"""
+    return zlib.crc32(text.lower().encode("utf-8")) / 0xFFFFFFFF
+
+@app.get("/")
+async def omdb(t: str = "", y: str = "", apikey: str = ""):
+    stats["requests"] += 1
+    await asyncio.sleep(settings["latency"])
+
+    if random.random() < settings["error_rate"]:
+        stats["errors"] += 1
+        return JSONResponse({"Response": "False", "Error": "Service unavailable"}, status_code=503)
+    if not apikey:
+        return JSONResponse({"Response": "False", "Error": "No API key provided."}, status_code=401)
+
+    fraction = _fraction(t)
+    if fraction < settings["missing_rate"]:
+        return {"Response": "False", "Error": "Movie not found!"}
+    year = str(1950 + int(fraction * 70))
+    # Some lookups carry the wrong year, which exercises the client's retry without it
+    if y and y != year and fraction < settings["missing_rate"] * 2:
+        return {"Response": "False", "Error": "Movie not found!"}
+
+    return {
+        "Title": t,
+        "Year": year,
+        "Rated": "PG-13",
+        "Released": f"01 Jan {year}",
+        "Runtime": f"{90 + int(fraction * 60)} min",
+        "Genre": "Drama",
+        "Director": "Stub Director",
+        "Writer": "Stub Writer",
+        "Actors": "Stub Actor, Stub Actress",
+        "Plot": f"A stubbed plot for {t}.",
+        "Language": "English",
+        "Country": "United States",
+        "Awards": "N/A",
+        "Poster": "N/A",
+        "Ratings": [{"Source": "Internet Movie Database", "Value": f"{5 + fraction * 4:.1f}/10"}],
+        "Metascore": "N/A",
+        "imdbRating": f"{5 + fraction * 4:.1f}",
+        "imdbVotes": f"{int(fraction * 500000):,}",
+        "imdbID": f"tt{zlib.crc32(t.encode('utf-8')) % 10000000:07d}",
+        "Type": "movie",
+        "Response": "True"
+    }
+
+@app.get("/stats")
+async def get_stats():
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the OMDB API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=settings["latency"], help="seconds added to every response")
+    parser.add_argument("--missing-rate", type=float, default=settings["missing_rate"], help="share of titles answered with 'Movie not found!'")
+    parser.add_argument("--error-rate", type=float, default=settings["error_rate"], help="share of requests failing with HTTP 503")
+    args = parser.parse_args()
+    settings.update(latency=args.latency, missing_rate=args.missing_rate, error_rate=args.error_rate)
+
+    print(f"🎭 OMDB stub listening on http://127.0.0.1:{args.port}/")
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+"""
+Poster Origin Stub
+Serves generated poster images locally with configurable latency and missing
+posters, so the /poster caching proxy can be tried without TMDB or Amazon.
+TMDB posters resolve against it when the app runs with TMDB_IMAGE_BASE_URL
+pointing here.
+
+    python scripts/testing/poster_origin_stub.py --port 8766
+    TMDB_IMAGE_BASE_URL=http://127.0.0.1:8766/t/p uvicorn main:app
+    curl -sI "http://127.0.0.1:8000/poster/tt0111161?size=w185"
+    curl -s http://127.0.0.1:8766/stats
+
+It answers HEAD too, for scripts/data_import/scan_posters.py.
+"""
+
+import argparse
+import asyncio
+import struct
+import zlib
+
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import Response
+
+app = FastAPI()
+settings = {"latency": 0.1, "missing_rate": 0.1, "width": 500, "height": 750}
+stats = {"requests": 0, "missing": 0, "bytes": 0}
+
+def _fraction(text: str) -> float:
+    """Stable 0-1 value per path, so a poster is always there or always missing"""
+    return zlib.crc32(text.encode("utf-8")) / 0xFFFFFFFF
+
+def _png(width: int, height: int, seed: int) -> bytes:
+    """A vertical gradient PNG in colours derived from the path, so every poster differs"""
+    red, green, blue = seed & 0xFF, (seed >> 8) & 0xFF, (seed >> 16) & 0xFF
+    rows = bytearray()
+    for y in range(height):
+        shade = y * 255 // max(1, height - 1)
+        rows.append(0)  # no filter
+        rows.extend(bytes(((red + shade) & 0xFF, green, (blue - shade) & 0xFF)) * width)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(bytes(rows), 6)) + chunk(b"IEND", b"")
+
+@app.get("/stats")
+async def get_stats():
+    return stats
+
+@app.api_route("/{path:path}", methods=["GET", "HEAD"])
+async def poster(path: str):
+    stats["requests"] += 1
+    await asyncio.sleep(settings["latency"])
+    fraction = _fraction(path)
+    if fraction < settings["missing_rate"]:
+        stats["missing"] += 1
+        return Response("Not Found", status_code=404, media_type="text/plain")
+    data = _png(settings["width"], settings["height"], zlib.crc32(path.encode("utf-8")))
+    stats["bytes"] += len(data)
+    return Response(data, media_type="image/png")
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the TMDB/Amazon poster hosts")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=settings["latency"], help="seconds added to every response")
+    parser.add_argument("--missing-rate", type=float, default=settings["missing_rate"], help="share of posters answered with 404")
+    parser.add_argument("--width", type=int, default=settings["width"], help="width of the generated posters")
+    parser.add_argument("--height", type=int, default=settings["height"], help="height of the generated posters")
+    args = parser.parse_args()
+    settings.update(latency=args.latency, missing_rate=args.missing_rate, width=args.width, height=args.height)
+
+    print(f"🖼️ Poster origin stub listening on http://127.0.0.1:{args.port}/")
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()